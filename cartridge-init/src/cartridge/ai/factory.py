@@ -1,6 +1,7 @@
 """Factory for creating AI providers."""
 
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple
 
 from cartridge.ai.base import AIProvider
 from cartridge.ai.openai_provider import OpenAIProvider
@@ -60,15 +61,17 @@ class AIProviderFactory:
         return provider_type(config)
     
     @classmethod
-    def get_supported_models(cls) -> List[str]:
-        """Get list of supported AI models."""
-        return list(cls._providers.keys())
+    @lru_cache(maxsize=1)
+    def get_supported_models(cls) -> Tuple[str, ...]:
+        """Get supported AI models; cached until another provider is registered."""
+        return tuple(cls._providers)
     
     @classmethod
     def register_provider(cls, model_names: List[str], provider_class: type) -> None:
         """Register a new AI provider for specific models."""
         for model_name in model_names:
             cls._providers[model_name.lower()] = provider_class
+            cls.get_supported_models.cache_clear()
             # Only log registration if not in CLI mode or if verbose is enabled
             import os
             if not os.environ.get('CARTRIDGE_CLI_MODE') or os.environ.get('CARTRIDGE_VERBOSE'):
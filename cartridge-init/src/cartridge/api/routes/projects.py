@@ -195,7 +195,7 @@ async def generate_models(
             raise HTTPException(
                 status_code=400,
                 detail=f"Unsupported AI model: {request.ai_model}. "
-                      f"Supported models: {supported_models}"
+                      f"Supported models: {list(supported_models)}"
             )
         
         # Convert schema data to table mappings
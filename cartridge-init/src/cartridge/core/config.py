@@ -89,6 +89,11 @@ class AppConfig(BaseSettings):
     output_dir: str = Field(default="./output", description="Output directory for generated projects")
     temp_dir: str = Field(default="./temp", description="Temporary directory")
     
+    # Background task settings
+    simulate_task_delays: bool = Field(
+        default=True, description="Sleep in placeholder dbt tasks to simulate their run time"
+    )
+    
     class Config:
         env_prefix = "CARTRIDGE_"
     
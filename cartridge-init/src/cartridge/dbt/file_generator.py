@@ -1,7 +1,11 @@
 """File generator for dbt project files."""
 
+import hashlib
+import json
 import os
-from typing import List, Dict, Any
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Iterator, Optional, Union
 import yaml
 
 from cartridge.ai.base import GeneratedModel, GeneratedTest
@@ -9,6 +13,28 @@ from cartridge.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# libyaml's C emitter when PyYAML was built with it; same output as yaml.Dumper
+YAML_DUMPER = getattr(yaml, "CDumper", yaml.Dumper)
+
+# Most buffers a single writev call accepts
+_IOV_MAX = os.sysconf("SC_IOV_MAX") if hasattr(os, "sysconf") else 1024
+
+# Per-project record of generated file hashes, used to skip unchanged writes
+MANIFEST_FILENAME = ".cartridge_manifest.json"
+
+
+@dataclass(slots=True)
+class FileManifest:
+    """File hashes for one project generation.
+    
+    Entries are [blake2b digest, size, mtime_ns] keyed by path relative to
+    the project root.
+    """
+    
+    root: str
+    previous: Dict[str, List[Any]]  # As saved by the last generation
+    written: Dict[str, List[Any]] = field(default_factory=dict)  # Files of this generation
+
 
 class DBTFileGenerator:
     """Generator for individual dbt files."""
@@ -17,26 +43,121 @@ class DBTFileGenerator:
         """Initialize file generator."""
         self.logger = get_logger(__name__)
     
-    def generate_model_file(self, model: GeneratedModel, output_dir: str) -> str:
+    @contextmanager
+    def manifest(self, project_root: str) -> Iterator[FileManifest]:
+        """Skip rewriting files whose content is unchanged since the last generation.
+        
+        Yields the manifest to pass to the write methods called in the block;
+        each block gets its own, so generations may overlap. The manifest is
+        only saved if the block completes without error.
+        
+        A file counts as unchanged when its content hash matches and its size
+        and mtime_ns are still those recorded when it was written. As with
+        make, an edit that keeps both (e.g. one restored with its original
+        timestamp) goes unnoticed and the file is not rewritten.
+        """
+        
+        manifest_path = os.path.join(project_root, MANIFEST_FILENAME)
+        try:
+            with open(manifest_path, 'rb') as f:
+                previous = json.load(f)
+        except (FileNotFoundError, ValueError):
+            previous = {}
+        
+        manifest = FileManifest(root=project_root, previous=previous)
+        yield manifest
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest.written, f, sort_keys=True)
+    
+    def write_file(
+        self, file_path: str, content: Union[str, bytes, memoryview], manifest: Optional[FileManifest] = None
+    ) -> None:
+        """Write file content with unbuffered OS-level writes."""
+        
+        self.write_chunks(file_path, [content], manifest)
+    
+    def write_chunks(
+        self,
+        file_path: str,
+        chunks: List[Union[str, bytes, memoryview]],
+        manifest: Optional[FileManifest] = None
+    ) -> None:
+        """Write file content given as fragments with scatter-gather writes.
+        
+        The fragments are handed to the kernel as-is instead of being
+        concatenated into an intermediate buffer first. With a manifest,
+        unchanged files are skipped and the write is recorded in it.
+        """
+        
+        buffers = [chunk.encode("utf-8") if isinstance(chunk, str) else chunk for chunk in chunks]
+        
+        if manifest is None:
+            self._write_buffers(file_path, buffers)
+            return
+        
+        key = os.path.relpath(file_path, manifest.root)
+        hasher = hashlib.blake2b(digest_size=16)
+        for buffer in buffers:
+            hasher.update(buffer)
+        digest = hasher.hexdigest()
+        
+        previous = manifest.previous.get(key)
+        if previous and previous[0] == digest:
+            # Only trust the manifest if the file was not touched since we wrote it
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                stat = None
+            if stat and [stat.st_size, stat.st_mtime_ns] == previous[1:]:
+                manifest.written[key] = previous
+                return
+        
+        stat = self._write_buffers(file_path, buffers)
+        manifest.written[key] = [digest, stat.st_size, stat.st_mtime_ns]
+    
+    def _write_buffers(self, file_path: str, buffers: List[Union[bytes, memoryview]]) -> os.stat_result:
+        """Write buffers to a file with writev and return its stat after writing."""
+        
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            for start in range(0, len(buffers), _IOV_MAX):
+                batch = buffers[start:start + _IOV_MAX]
+                written = os.writev(fd, batch)
+                if written < sum(map(len, batch)):
+                    # Short write; finish the rest of this batch with plain writes
+                    view = memoryview(b"".join(batch))[written:]
+                    while view:
+                        view = view[os.write(fd, view):]
+            return os.fstat(fd)
+        finally:
+            os.close(fd)
+    
+    def generate_model_file(
+        self, model: GeneratedModel, output_dir: str, manifest: Optional[FileManifest] = None
+    ) -> str:
         """Generate a SQL file for a dbt model."""
         
         file_path = os.path.join(output_dir, f"{model.name}.sql")
         
         # Create model file with header comment and SQL
-        content = self._generate_model_header(model)
-        content += "\n" + model.sql
+        chunks = [self._generate_model_header(model), "\n", model.sql]
         
         # Ensure the SQL ends with a newline
-        if not content.endswith('\n'):
-            content += '\n'
+        if model.sql and not model.sql.endswith('\n'):
+            chunks.append('\n')
         
-        with open(file_path, 'w') as f:
-            f.write(content)
+        self.write_chunks(file_path, chunks, manifest)
         
         self.logger.debug(f"Generated model file: {file_path}")
         return file_path
     
-    def generate_schema_file(self, models: List[GeneratedModel], output_dir: str, filename: str = "schema.yml") -> str:
+    def generate_schema_file(
+        self,
+        models: List[GeneratedModel],
+        output_dir: str,
+        filename: str = "schema.yml",
+        manifest: Optional[FileManifest] = None
+    ) -> str:
         """Generate a schema.yml file with model documentation and tests."""
         
         file_path = os.path.join(output_dir, filename)
@@ -87,8 +208,13 @@ class DBTFileGenerator:
             schema_config["models"].append(model_config)
         
         # Write schema file
-        with open(file_path, 'w') as f:
-            yaml.dump(schema_config, f, default_flow_style=False, sort_keys=False, indent=2)
+        self.write_file(
+            file_path,
+            yaml.dump(
+                schema_config, Dumper=YAML_DUMPER, default_flow_style=False, sort_keys=False, indent=2
+            ),
+            manifest
+        )
         
         self.logger.debug(f"Generated schema file: {file_path}")
         return file_path
@@ -98,8 +224,7 @@ class DBTFileGenerator:
         
         file_path = os.path.join(output_dir, f"{macro_name}.sql")
         
-        with open(file_path, 'w') as f:
-            f.write(macro_content)
+        self.write_file(file_path, macro_content)
         
         self.logger.debug(f"Generated macro file: {file_path}")
         return file_path
@@ -116,8 +241,7 @@ class DBTFileGenerator:
         if not content.endswith('\n'):
             content += '\n'
         
-        with open(file_path, 'w') as f:
-            f.write(content)
+        self.write_file(file_path, content)
         
         self.logger.debug(f"Generated test file: {file_path}")
         return file_path
@@ -135,8 +259,7 @@ class DBTFileGenerator:
         if not content.endswith('\n'):
             content += '\n'
         
-        with open(file_path, 'w') as f:
-            f.write(content)
+        self.write_file(file_path, content)
         
         self.logger.debug(f"Generated analysis file: {file_path}")
         return file_path
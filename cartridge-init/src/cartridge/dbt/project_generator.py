@@ -1,21 +1,158 @@
 """DBT project generator for creating complete dbt projects."""
 
 import os
+import re
 import shutil
+import subprocess
 import tarfile
 import tempfile
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import yaml
+from jinja2 import Environment, FileSystemBytecodeCache, PackageLoader
 
 from cartridge.ai.base import GeneratedModel, ModelGenerationResult
-from cartridge.dbt.file_generator import DBTFileGenerator
+from cartridge.dbt.file_generator import DBTFileGenerator, FileManifest, MANIFEST_FILENAME, YAML_DUMPER
 from cartridge.dbt.templates import DBTTemplates
 from cartridge.core.config import settings
 from cartridge.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Worker threads used to write independent project files concurrently
+_GENERATION_WORKERS = 8
+
+# Jinja environment for file templates shipped with the package; compiled
+# template bytecode is cached on disk and reused across processes
+_JINJA_ENV = Environment(
+    loader=PackageLoader("cartridge.dbt", "jinja_templates"),
+    bytecode_cache=FileSystemBytecodeCache(),
+    autoescape=False,
+    keep_trailing_newline=True,
+    auto_reload=False,
+)
+
+# dbt project directories; only leaves are listed, parents are implied
+_PROJECT_LEAF_DIRECTORIES = [
+    ("models", "staging"),
+    ("models", "intermediate"),
+    ("models", "marts", "core"),
+    ("macros",),
+    ("tests",),
+    ("analysis",),
+    ("snapshots",),
+    ("seeds",),
+    ("docs",),
+    ("logs",),
+    ("target",),
+    ("dbt_packages",),
+]
+
+# Project subdirectory for each model type; other types go in models/
+_MODEL_SUBDIRS = {
+    "staging": ("models", "staging"),
+    "intermediate": ("models", "intermediate"),
+    "marts": ("models", "marts", "core"),
+}
+_DEFAULT_MODEL_SUBDIR = ("models",)
+
+# Static packages.yml content
+_PACKAGES_YML_BYTES = b"""packages:
+- package: dbt-labs/dbt_utils
+  version:
+  - '>=1.0.0'
+  - <2.0.0
+- package: calogica/dbt_expectations
+  version:
+  - '>=0.8.0'
+  - <1.0.0
+- package: dbt-labs/codegen
+  version:
+  - '>=0.9.0'
+  - <1.0.0
+"""
+
+# Source names that can be emitted as plain YAML scalars without quoting:
+# identifiers that YAML would not resolve to a bool/null, short enough
+# that the description lines are never wrapped
+_PLAIN_YAML_NAME = re.compile(
+    r"(?!(?:yes|Yes|YES|no|No|NO|true|True|TRUE|false|False|FALSE|"
+    r"on|On|ON|off|Off|OFF|null|Null|NULL)$)[A-Za-z_][A-Za-z0-9_]{0,39}$"
+)
+
+# gzip level used with pigz, and the tar stream buffer size piped into it
+_PIGZ_COMPRESS_LEVEL = 1
+_ARCHIVE_BUFSIZE = 1024 * 1024
+
+# Static .gitignore content, encoded once at import time
+_GITIGNORE_BYTES = """
+# dbt
+target/
+dbt_packages/
+logs/
+*.log
+
+# OS
+.DS_Store
+Thumbs.db
+
+# IDE
+.vscode/
+.idea/
+*.swp
+*.swo
+
+# Python
+__pycache__/
+*.py[cod]
+*$py.class
+*.so
+.Python
+env/
+venv/
+.env
+.venv
+
+# Jupyter
+.ipynb_checkpoints
+
+# Local configuration
+profiles.yml
+
+# Cartridge generation manifest
+.cartridge_manifest.json
+""".strip().encode("utf-8")
+
+
+@dataclass(slots=True)
+class _ProjectPaths:
+    """Directories of a dbt project, joined once per generation."""
+    
+    root: str
+    models: str
+    macros: str
+    analysis: str
+    docs: str
+    model_dirs: Dict[str, str]  # Model type -> directory holding its files
+    
+    @classmethod
+    def for_root(cls, root: str) -> "_ProjectPaths":
+        """Build the project paths under a project root directory."""
+        return cls(
+            root=root,
+            models=os.path.join(root, *_DEFAULT_MODEL_SUBDIR),
+            macros=os.path.join(root, "macros"),
+            analysis=os.path.join(root, "analysis"),
+            docs=os.path.join(root, "docs"),
+            model_dirs={
+                model_type: os.path.join(root, *parts)
+                for model_type, parts in _MODEL_SUBDIRS.items()
+            },
+        )
+
 
 class DBTProjectGenerator:
     """Generator for complete dbt projects."""
@@ -44,31 +181,47 @@ class DBTProjectGenerator:
         try:
             # Create project directory structure
             self._create_project_structure(output_dir)
+            paths = _ProjectPaths.for_root(output_dir)
             
-            # Generate core project files
-            self._generate_dbt_project_yml(output_dir, generation_result)
-            self._generate_profiles_yml(output_dir, connection_config)
-            self._generate_packages_yml(output_dir)
-            self._generate_gitignore(output_dir)
-            self._generate_readme(output_dir, generation_result)
-            
-            # Generate source definitions
-            self._generate_sources_yml(output_dir, generation_result)
-            
-            # Generate model files
-            model_files = self._generate_model_files(output_dir, generation_result.models)
-            
-            # Generate schema files (tests and documentation)
-            schema_files = self._generate_schema_files(output_dir, generation_result.models)
-            
-            # Generate macros
-            macro_files = self._generate_macros(output_dir)
-            
-            # Generate analysis files
-            analysis_files = self._generate_analysis_files(output_dir, generation_result)
-            
-            # Generate documentation
-            docs_files = self._generate_docs_files(output_dir, generation_result)
+            # Every step below writes its own files, so they run concurrently;
+            # files unchanged since the last generation are not rewritten
+            with self.file_generator.manifest(output_dir) as manifest, \
+                    ThreadPoolExecutor(max_workers=_GENERATION_WORKERS) as executor:
+                # Generate core project files and source definitions
+                core_futures = [
+                    executor.submit(self._generate_dbt_project_yml, paths, generation_result, manifest),
+                    executor.submit(self._generate_profiles_yml, paths, connection_config, manifest),
+                    executor.submit(self._generate_packages_yml, paths, manifest),
+                    executor.submit(self._generate_gitignore, paths, manifest),
+                    executor.submit(self._generate_readme, paths, generation_result, manifest),
+                    executor.submit(self._generate_sources_yml, paths, generation_result, manifest),
+                ]
+                
+                # Generate model files, schema files (tests and documentation),
+                # macros, analysis files and documentation
+                model_files_future = executor.submit(
+                    self._generate_model_files, paths, generation_result.models, manifest
+                )
+                schema_files_future = executor.submit(
+                    self._generate_schema_files, paths, generation_result.models, manifest
+                )
+                macro_files_future = executor.submit(self._generate_macros, paths, manifest)
+                analysis_files_future = executor.submit(
+                    self._generate_analysis_files, paths, generation_result, manifest
+                )
+                docs_files_future = executor.submit(
+                    self._generate_docs_files, paths, generation_result, manifest
+                )
+                
+                # Surface the first failure, if any
+                for future in core_futures:
+                    future.result()
+                
+                model_files = model_files_future.result()
+                schema_files = schema_files_future.result()
+                macro_files = macro_files_future.result()
+                analysis_files = analysis_files_future.result()
+                docs_files = docs_files_future.result()
             
             project_info = {
                 "project_name": self.project_name,
@@ -102,8 +255,12 @@ class DBTProjectGenerator:
         self.logger.info(f"Creating project archive: {archive_path}")
         
         try:
-            with tarfile.open(archive_path, "w:gz") as tar:
-                tar.add(project_path, arcname=self.project_name)
+            pigz_path = shutil.which("pigz")
+            if pigz_path:
+                self._create_archive_with_pigz(pigz_path, project_path, archive_path)
+            else:
+                with tarfile.open(archive_path, "w:gz") as tar:
+                    tar.add(project_path, arcname=self.project_name, filter=self._archive_filter)
             
             archive_size = os.path.getsize(archive_path)
             self.logger.info(f"Archive created successfully: {archive_size} bytes")
@@ -114,43 +271,48 @@ class DBTProjectGenerator:
             self.logger.error(f"Failed to create project archive: {e}")
             raise
     
+    def _create_archive_with_pigz(self, pigz_path: str, project_path: str, archive_path: str) -> None:
+        """Stream an uncompressed tar through pigz for multi-threaded gzip."""
+        
+        # stderr goes to a file rather than a pipe nobody reads while the tar
+        # is streamed in, so pigz can never block on a full stderr pipe
+        with open(archive_path, "wb") as archive_file, tempfile.TemporaryFile() as stderr_file:
+            proc = subprocess.Popen(
+                [pigz_path, f"-{_PIGZ_COMPRESS_LEVEL}", "-c"],
+                stdin=subprocess.PIPE,
+                stdout=archive_file,
+                stderr=stderr_file,
+            )
+            try:
+                with tarfile.open(fileobj=proc.stdin, mode="w|", bufsize=_ARCHIVE_BUFSIZE) as tar:
+                    tar.add(project_path, arcname=self.project_name, filter=self._archive_filter)
+            finally:
+                proc.stdin.close()
+                proc.wait()
+            
+            if proc.returncode != 0:
+                stderr_file.seek(0)
+                stderr = stderr_file.read().decode(errors="replace").strip()
+                raise RuntimeError(f"pigz exited with status {proc.returncode}: {stderr}")
+    
+    def _archive_filter(self, tarinfo: tarfile.TarInfo) -> Optional[tarfile.TarInfo]:
+        """Exclude the local generation manifest from project archives."""
+        
+        if os.path.basename(tarinfo.name) == MANIFEST_FILENAME:
+            return None
+        return tarinfo
+    
     def _create_project_structure(self, output_dir: str) -> None:
         """Create the dbt project directory structure."""
         
-        directories = [
-            output_dir,
-            os.path.join(output_dir, "models"),
-            os.path.join(output_dir, "models", "staging"),
-            os.path.join(output_dir, "models", "intermediate"),
-            os.path.join(output_dir, "models", "marts"),
-            os.path.join(output_dir, "models", "marts", "core"),
-            os.path.join(output_dir, "macros"),
-            os.path.join(output_dir, "tests"),
-            os.path.join(output_dir, "analysis"),
-            os.path.join(output_dir, "snapshots"),
-            os.path.join(output_dir, "seeds"),
-            os.path.join(output_dir, "docs"),
-            os.path.join(output_dir, "logs"),
-            os.path.join(output_dir, "target"),
-            os.path.join(output_dir, "dbt_packages"),
-        ]
-        
-        for directory in directories:
-            os.makedirs(directory, exist_ok=True)
+        for parts in _PROJECT_LEAF_DIRECTORIES:
+            os.makedirs(os.path.join(output_dir, *parts), exist_ok=True)
     
-    def _generate_dbt_project_yml(self, output_dir: str, generation_result: ModelGenerationResult) -> None:
+    def _generate_dbt_project_yml(
+        self, paths: _ProjectPaths, generation_result: ModelGenerationResult, manifest: Optional[FileManifest] = None
+    ) -> None:
         """Generate dbt_project.yml file."""
         
-        # Determine model configurations based on generated models
-        model_config = {}
-        
-        for model in generation_result.models:
-            model_type = model.model_type.value
-            if model_type not in model_config:
-                model_config[model_type] = {}
-            
-            model_config[model_type][model.materialization] = True
-        
         project_config = {
             "name": self.project_name,
             "version": "1.0.0",
@@ -202,11 +364,15 @@ class DBTProjectGenerator:
             }
         }
         
-        file_path = os.path.join(output_dir, "dbt_project.yml")
-        with open(file_path, 'w') as f:
-            yaml.dump(project_config, f, default_flow_style=False, sort_keys=False)
+        file_path = os.path.join(paths.root, "dbt_project.yml")
+        self.file_generator.write_file(
+            file_path, yaml.dump(project_config, Dumper=YAML_DUMPER, default_flow_style=False, sort_keys=False),
+            manifest
+        )
     
-    def _generate_profiles_yml(self, output_dir: str, connection_config: Optional[Dict[str, Any]]) -> None:
+    def _generate_profiles_yml(
+        self, paths: _ProjectPaths, connection_config: Optional[Dict[str, Any]], manifest: Optional[FileManifest] = None
+    ) -> None:
         """Generate profiles.yml file."""
         
         if not connection_config:
@@ -261,189 +427,87 @@ class DBTProjectGenerator:
                 }
             }
         
-        file_path = os.path.join(output_dir, "profiles.yml")
-        with open(file_path, 'w') as f:
-            yaml.dump(profiles_config, f, default_flow_style=False, sort_keys=False)
+        file_path = os.path.join(paths.root, "profiles.yml")
+        self.file_generator.write_file(
+            file_path, yaml.dump(profiles_config, Dumper=YAML_DUMPER, default_flow_style=False, sort_keys=False),
+            manifest
+        )
     
-    def _generate_packages_yml(self, output_dir: str) -> None:
+    def _generate_packages_yml(self, paths: _ProjectPaths, manifest: Optional[FileManifest] = None) -> None:
         """Generate packages.yml file with useful dbt packages."""
         
-        packages_config = {
-            "packages": [
-                {
-                    "package": "dbt-labs/dbt_utils",
-                    "version": [">=1.0.0", "<2.0.0"]
-                },
-                {
-                    "package": "calogica/dbt_expectations",
-                    "version": [">=0.8.0", "<1.0.0"]
-                },
-                {
-                    "package": "dbt-labs/codegen",
-                    "version": [">=0.9.0", "<1.0.0"]
-                }
-            ]
-        }
-        
-        file_path = os.path.join(output_dir, "packages.yml")
-        with open(file_path, 'w') as f:
-            yaml.dump(packages_config, f, default_flow_style=False, sort_keys=False)
+        file_path = os.path.join(paths.root, "packages.yml")
+        self.file_generator.write_file(file_path, _PACKAGES_YML_BYTES, manifest)
     
-    def _generate_gitignore(self, output_dir: str) -> None:
+    def _generate_gitignore(self, paths: _ProjectPaths, manifest: Optional[FileManifest] = None) -> None:
         """Generate .gitignore file."""
         
-        gitignore_content = """
-# dbt
-target/
-dbt_packages/
-logs/
-*.log
-
-# OS
-.DS_Store
-Thumbs.db
-
-# IDE
-.vscode/
-.idea/
-*.swp
-*.swo
-
-# Python
-__pycache__/
-*.py[cod]
-*$py.class
-*.so
-.Python
-env/
-venv/
-.env
-.venv
-
-# Jupyter
-.ipynb_checkpoints
-
-# Local configuration
-profiles.yml
-""".strip()
-        
-        file_path = os.path.join(output_dir, ".gitignore")
-        with open(file_path, 'w') as f:
-            f.write(gitignore_content)
+        file_path = os.path.join(paths.root, ".gitignore")
+        self.file_generator.write_file(file_path, _GITIGNORE_BYTES, manifest)
     
-    def _generate_readme(self, output_dir: str, generation_result: ModelGenerationResult) -> None:
+    def _generate_readme(
+        self, paths: _ProjectPaths, generation_result: ModelGenerationResult, manifest: Optional[FileManifest] = None
+    ) -> None:
         """Generate README.md file."""
         
-        readme_content = f"""# {self.project_name}
-
-This dbt project was automatically generated by Cartridge.
-
-## Project Overview
-
-- **Models Generated**: {len(generation_result.models)}
-- **Target Warehouse**: {self.target_warehouse}
-- **Generated By**: {generation_result.generation_metadata.get('ai_provider', 'Unknown')}
-- **AI Model Used**: {generation_result.generation_metadata.get('model_used', 'Unknown')}
-
-## Project Structure
-
-```
-{self.project_name}/
-├── models/
-│   ├── staging/          # Raw data transformations
-│   ├── intermediate/     # Business logic transformations
-│   └── marts/           # Final analytical models
-│       └── core/        # Core business entities
-├── macros/              # Reusable SQL functions
-├── tests/               # Custom data tests
-├── analysis/            # Analytical queries
-├── snapshots/           # Slowly changing dimensions
-└── seeds/               # Static reference data
-```
-
-## Model Types
-
-### Staging Models
-Clean and standardize raw data from sources.
-
-### Intermediate Models  
-Apply business logic and combine staging models.
-
-### Mart Models
-Final analytical models optimized for consumption.
-
-## Getting Started
-
-1. **Install dbt**:
-   ```bash
-   pip install dbt-{self.target_warehouse}
-   ```
-
-2. **Install dependencies**:
-   ```bash
-   dbt deps
-   ```
-
-3. **Configure your connection**:
-   Update `profiles.yml` with your database credentials.
-
-4. **Test your connection**:
-   ```bash
-   dbt debug
-   ```
-
-5. **Run the models**:
-   ```bash
-   dbt run
-   ```
-
-6. **Test the models**:
-   ```bash
-   dbt test
-   ```
-
-7. **Generate documentation**:
-   ```bash
-   dbt docs generate
-   dbt docs serve
-   ```
-
-## Model Documentation
-
-{self._generate_model_documentation_section(generation_result.models)}
-
-## Resources
-
-- [dbt Documentation](https://docs.getdbt.com/)
-- [dbt Best Practices](https://docs.getdbt.com/guides/best-practices)
-- [dbt Style Guide](https://github.com/dbt-labs/corp/blob/main/dbt_style_guide.md)
-
----
-
-*Generated by Cartridge - AI-powered dbt model generator*
-"""
+        models = generation_result.models
+        metadata = generation_result.generation_metadata
+        
+        readme_content = _JINJA_ENV.get_template("README.md.j2").render(
+            project_name=self.project_name,
+            models_generated=len(models),
+            target_warehouse=self.target_warehouse,
+            ai_provider=metadata.get('ai_provider', 'Unknown'),
+            model_used=metadata.get('model_used', 'Unknown'),
+            model_documentation=self._generate_model_documentation_section(models),
+        )
         
-        file_path = os.path.join(output_dir, "README.md")
-        with open(file_path, 'w') as f:
-            f.write(readme_content)
+        file_path = os.path.join(paths.root, "README.md")
+        self.file_generator.write_file(file_path, readme_content, manifest)
     
-    def _generate_sources_yml(self, output_dir: str, generation_result: ModelGenerationResult) -> None:
+    def _generate_sources_yml(
+        self, paths: _ProjectPaths, generation_result: ModelGenerationResult, manifest: Optional[FileManifest] = None
+    ) -> None:
         """Generate sources.yml file."""
         
         # Extract unique source schemas and tables from models
-        sources = {}
+        source_tables: Dict[str, set] = {}
         
         for model in generation_result.models:
-            if hasattr(model, 'meta') and model.meta and 'source_table' in model.meta:
-                source_table = model.meta['source_table']
-                if '.' in source_table:
-                    schema, table = source_table.split('.', 1)
-                    if schema not in sources:
-                        sources[schema] = []
-                    if table not in sources[schema]:
-                        sources[schema].append(table)
+            meta = getattr(model, 'meta', None)
+            if not meta:
+                continue
+            source_table = meta.get('source_table')
+            if not source_table:
+                continue
+            schema, sep, table = source_table.partition('.')
+            if sep:
+                source_tables.setdefault(schema, set()).add(table)
+        
+        sources = {schema: sorted(tables) for schema, tables in source_tables.items()}
         
         if sources:
+            file_path = os.path.join(paths.model_dirs["staging"], "sources.yml")
+            
+            if all(
+                _PLAIN_YAML_NAME.match(schema) and all(_PLAIN_YAML_NAME.match(table) for table in tables)
+                for schema, tables in sources.items()
+            ):
+                # Names are safe plain scalars, so skip the YAML emitter
+                lines = ["version: 2\nsources:\n"]
+                for schema, tables in sources.items():
+                    lines.append(
+                        f"- name: {schema}\n"
+                        f"  description: Raw data from {schema} schema\n"
+                        f"  tables:\n"
+                    )
+                    lines.extend(
+                        f"  - name: {table}\n    description: Raw {table} data\n"
+                        for table in tables
+                    )
+                self.file_generator.write_chunks(file_path, lines, manifest)
+                return
+            
             sources_config = {
                 "version": 2,
                 "sources": []
@@ -463,139 +527,117 @@ Final analytical models optimized for consumption.
                 }
                 sources_config["sources"].append(source_config)
             
-            file_path = os.path.join(output_dir, "models", "staging", "sources.yml")
-            with open(file_path, 'w') as f:
-                yaml.dump(sources_config, f, default_flow_style=False, sort_keys=False)
+            self.file_generator.write_file(
+                file_path,
+                yaml.dump(sources_config, Dumper=YAML_DUMPER, default_flow_style=False, sort_keys=False),
+                manifest
+            )
     
-    def _generate_model_files(self, output_dir: str, models: List[GeneratedModel]) -> List[str]:
+    def _generate_model_files(
+        self, paths: _ProjectPaths, models: List[GeneratedModel], manifest: Optional[FileManifest] = None
+    ) -> List[str]:
         """Generate SQL files for all models."""
         
         generated_files = []
         
         for model in models:
             # Determine subdirectory based on model type
-            if model.model_type.value == "staging":
-                model_dir = os.path.join(output_dir, "models", "staging")
-            elif model.model_type.value == "intermediate":
-                model_dir = os.path.join(output_dir, "models", "intermediate")
-            elif model.model_type.value == "marts":
-                model_dir = os.path.join(output_dir, "models", "marts", "core")
-            else:
-                model_dir = os.path.join(output_dir, "models")
+            model_dir = paths.model_dirs.get(model.model_type.value, paths.models)
             
             # Generate SQL file
-            file_path = self.file_generator.generate_model_file(model, model_dir)
+            file_path = self.file_generator.generate_model_file(model, model_dir, manifest)
             generated_files.append(file_path)
         
         return generated_files
     
-    def _generate_schema_files(self, output_dir: str, models: List[GeneratedModel]) -> List[str]:
+    def _generate_schema_files(
+        self, paths: _ProjectPaths, models: List[GeneratedModel], manifest: Optional[FileManifest] = None
+    ) -> List[str]:
         """Generate schema.yml files with tests and documentation."""
         
         generated_files = []
         
         # Group models by directory for schema files
-        model_groups = {}
+        model_groups = defaultdict(list)
         
         for model in models:
-            if model.model_type.value == "staging":
-                group_key = "staging"
-                schema_dir = os.path.join(output_dir, "models", "staging")
-            elif model.model_type.value == "intermediate":
-                group_key = "intermediate"
-                schema_dir = os.path.join(output_dir, "models", "intermediate")
-            elif model.model_type.value == "marts":
-                group_key = "marts"
-                schema_dir = os.path.join(output_dir, "models", "marts", "core")
-            else:
-                group_key = "other"
-                schema_dir = os.path.join(output_dir, "models")
-            
-            if group_key not in model_groups:
-                model_groups[group_key] = {"models": [], "dir": schema_dir}
-            
-            model_groups[group_key]["models"].append(model)
+            model_type = model.model_type.value
+            model_groups[model_type if model_type in _MODEL_SUBDIRS else "other"].append(model)
         
         # Generate schema files for each group
-        for group_key, group_data in model_groups.items():
+        for group_key, group_models in model_groups.items():
+            schema_dir = paths.model_dirs.get(group_key, paths.models)
             file_path = self.file_generator.generate_schema_file(
-                group_data["models"], 
-                group_data["dir"], 
-                f"schema.yml"
+                group_models, 
+                schema_dir, 
+                f"schema.yml",
+                manifest
             )
             generated_files.append(file_path)
         
         return generated_files
     
-    def _generate_macros(self, output_dir: str) -> List[str]:
+    def _generate_macros(self, paths: _ProjectPaths, manifest: Optional[FileManifest] = None) -> List[str]:
         """Generate macro files."""
         
         generated_files = []
-        macros_dir = os.path.join(output_dir, "macros")
         
         # Generate common utility macros
         utility_macros = self.templates.get_utility_macros()
         
         for macro_name, macro_content in utility_macros.items():
-            file_path = os.path.join(macros_dir, f"{macro_name}.sql")
-            with open(file_path, 'w') as f:
-                f.write(macro_content)
+            file_path = os.path.join(paths.macros, f"{macro_name}.sql")
+            self.file_generator.write_file(file_path, macro_content, manifest)
             generated_files.append(file_path)
         
         return generated_files
     
-    def _generate_analysis_files(self, output_dir: str, generation_result: ModelGenerationResult) -> List[str]:
+    def _generate_analysis_files(
+        self, paths: _ProjectPaths, generation_result: ModelGenerationResult, manifest: Optional[FileManifest] = None
+    ) -> List[str]:
         """Generate analysis files."""
         
         generated_files = []
-        analysis_dir = os.path.join(output_dir, "analysis")
         
         # Generate basic analysis queries
         analysis_queries = self.templates.get_analysis_templates(generation_result.models)
         
         for query_name, query_content in analysis_queries.items():
-            file_path = os.path.join(analysis_dir, f"{query_name}.sql")
-            with open(file_path, 'w') as f:
-                f.write(query_content)
+            file_path = os.path.join(paths.analysis, f"{query_name}.sql")
+            self.file_generator.write_file(file_path, query_content, manifest)
             generated_files.append(file_path)
         
         return generated_files
     
-    def _generate_docs_files(self, output_dir: str, generation_result: ModelGenerationResult) -> List[str]:
+    def _generate_docs_files(
+        self, paths: _ProjectPaths, generation_result: ModelGenerationResult, manifest: Optional[FileManifest] = None
+    ) -> List[str]:
         """Generate documentation files."""
         
         generated_files = []
-        docs_dir = os.path.join(output_dir, "docs")
         
         # Generate model documentation
         docs_content = self.templates.get_documentation_template(generation_result)
         
-        file_path = os.path.join(docs_dir, "models.md")
-        with open(file_path, 'w') as f:
-            f.write(docs_content)
+        file_path = os.path.join(paths.docs, "models.md")
+        self.file_generator.write_file(file_path, docs_content, manifest)
         generated_files.append(file_path)
         
         return generated_files
     
     def _get_project_structure(self, output_dir: str) -> Dict[str, Any]:
-        """Get the project directory structure."""
+        """Get the project directory structure, leaving out the generation manifest."""
         
         structure = {}
         
-        for root, dirs, files in os.walk(output_dir):
-            rel_path = os.path.relpath(root, output_dir)
-            if rel_path == ".":
-                rel_path = ""
-            
-            current_level = structure
-            if rel_path:
-                for part in rel_path.split(os.sep):
-                    if part not in current_level:
-                        current_level[part] = {}
-                    current_level = current_level[part]
-            
-            for file in files:
-                current_level[file] = "file"
+        with os.scandir(output_dir) as entries:
+            for entry in entries:
+                if entry.name == MANIFEST_FILENAME:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    structure[entry.name] = self._get_project_structure(entry.path)
+                elif not entry.is_dir():
+                    structure[entry.name] = "file"
         
         return structure
     
@@ -606,21 +648,14 @@ Final analytical models optimized for consumption.
             return "No models generated."
         
         # Group models by type
-        model_groups = {}
+        model_groups = defaultdict(list)
         for model in models:
-            model_type = model.model_type.value
-            if model_type not in model_groups:
-                model_groups[model_type] = []
-            model_groups[model_type].append(model)
+            model_groups[model.model_type.value].append(model)
         
-        sections = []
+        parts = []
         
         for model_type, type_models in model_groups.items():
-            section = f"\n### {model_type.title()} Models\n\n"
-            
-            for model in type_models:
-                section += f"- **{model.name}**: {model.description}\n"
-            
-            sections.append(section)
+            parts.append(f"\n### {model_type.title()} Models\n\n")
+            parts.extend(f"- **{model.name}**: {model.description}\n" for model in type_models)
         
-        return "".join(sections)
\ No newline at end of file
+        return "".join(parts)
@@ -89,7 +89,11 @@ class DBTTemplates:
         
         # Model row counts analysis
         if models:
-            model_refs = [f"ref('{model.name}')" for model in models]
+            # Built once; the same row-count union appears twice in the query
+            model_counts = " union all ".join(
+                f"select '{model.name}' as model_name, count(*) as row_count from {{{{ ref('{model.name}') }}}}"
+                for model in models
+            )
             
             analyses["model_row_counts"] = f'''
 -- Analysis: Row counts for all models
@@ -97,12 +101,12 @@ class DBTTemplates:
 
 select 'Summary' as analysis_type, count(*) as total_models
 from (
-    {" union all ".join([f"select '{model.name}' as model_name, count(*) as row_count from {{{{ {ref} }}}}" for model, ref in zip(models, model_refs)])}
+    {model_counts}
 ) model_counts
 
 union all
 
-{" union all ".join([f"select '{model.name}' as model_name, count(*) as row_count from {{{{ {ref} }}}}" for model, ref in zip(models, model_refs)])}
+{model_counts}
 
 order by 
     case when analysis_type = 'Summary' then 0 else 1 end,
@@ -159,6 +163,8 @@ select
     def get_documentation_template(self, generation_result: ModelGenerationResult) -> str:
         """Get documentation template."""
         
+        metadata = generation_result.generation_metadata
+        
         doc_content = f"""# dbt Model Documentation
 
 Generated by Cartridge AI
@@ -166,8 +172,8 @@ Generated by Cartridge AI
 ## Generation Summary
 
 - **Total Models**: {len(generation_result.models)}
-- **AI Provider**: {generation_result.generation_metadata.get('ai_provider', 'Unknown')}
-- **Model Used**: {generation_result.generation_metadata.get('model_used', 'Unknown')}
+- **AI Provider**: {metadata.get('ai_provider', 'Unknown')}
+- **Model Used**: {metadata.get('model_used', 'Unknown')}
 
 ## Model Breakdown
 
@@ -1,7 +1,9 @@
 """Base classes for database schema scanning."""
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional, Tuple
+from functools import cached_property
+from typing import AsyncIterator, Dict, List, Any, Optional, Sequence, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -55,7 +57,7 @@ class DataType(str, Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class ColumnInfo:
     """Information about a database column."""
     
@@ -81,10 +83,10 @@ class ColumnInfo:
     min_value: Optional[Any] = None
     max_value: Optional[Any] = None
     avg_value: Optional[float] = None
-    sample_values: Optional[List[Any]] = None
+    sample_values: Optional[Sequence[Any]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ConstraintInfo:
     """Information about database constraints."""
     
@@ -96,7 +98,7 @@ class ConstraintInfo:
     definition: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class IndexInfo:
     """Information about database indexes."""
     
@@ -126,7 +128,35 @@ class TableInfo:
     sample_data: Optional[List[Dict[str, Any]]] = None
     
     def get_primary_key_columns(self) -> List[str]:
-        """Get primary key column names."""
+        """Get primary key column names.
+        
+        Computed once per table; scanned tables are not modified afterwards.
+        """
+        return self._primary_key_columns
+    
+    def get_foreign_key_relationships(self) -> List[Tuple[str, str, str]]:
+        """Get foreign key relationships as (column, referenced_table, referenced_column).
+        
+        Computed once per table; scanned tables are not modified afterwards.
+        """
+        return self._foreign_key_relationships
+    
+    def get_relationships(self) -> List[Dict[str, Any]]:
+        """Get this table's foreign key relationships as from/to dictionaries."""
+        return [
+            {
+                "from_table": f"{self.schema}.{self.name}",
+                "from_column": col,
+                "to_table": ref_table,
+                "to_column": ref_col
+            }
+            for col, ref_table, ref_col in self.get_foreign_key_relationships()
+        ]
+    
+    # cached_property keeps the values out of the dataclass fields, so they
+    # are not part of asdict(), repr() or equality
+    @cached_property
+    def _primary_key_columns(self) -> List[str]:
         pk_columns = [col.name for col in self.columns if col.is_primary_key]
         if pk_columns:
             return pk_columns
@@ -138,8 +168,8 @@ class TableInfo:
         
         return []
     
-    def get_foreign_key_relationships(self) -> List[Tuple[str, str, str]]:
-        """Get foreign key relationships as (column, referenced_table, referenced_column)."""
+    @cached_property
+    def _foreign_key_relationships(self) -> List[Tuple[str, str, str]]:
         relationships = []
         
         # From column metadata
@@ -157,7 +187,7 @@ class TableInfo:
         return relationships
 
 
-@dataclass
+@dataclass(slots=True)
 class DatabaseInfo:
     """Information about the database."""
     
@@ -195,20 +225,28 @@ class ScanResult:
         relationships = []
         
         for table in self.tables:
-            for col, ref_table, ref_col in table.get_foreign_key_relationships():
-                relationships.append({
-                    "from_table": f"{table.schema}.{table.name}",
-                    "from_column": col,
-                    "to_table": ref_table,
-                    "to_column": ref_col
-                })
+            relationships.extend(table.get_relationships())
         
         return relationships
 
 
+@dataclass
+class ScanBatch:
+    """A slice of scanned tables yielded by DatabaseConnector.scan_schema_batched()."""
+    
+    database_info: DatabaseInfo
+    tables: List[TableInfo]
+    errors: List[str]
+    tables_scanned: int
+    tables_total: int
+
+
 class DatabaseConnector(ABC):
     """Abstract base class for database connectors."""
     
+    # Number of tables scan_schema introspects concurrently
+    max_concurrency: int = 1
+    
     def __init__(self, connection_config: Dict[str, Any]):
         """Initialize connector with connection configuration."""
         self.config = connection_config
@@ -255,6 +293,10 @@ class DatabaseConnector(ABC):
         """Convert database-specific type to standard DataType."""
         pass
     
+    def clear_metadata_cache(self) -> None:
+        """Drop catalog metadata cached on the connection, so the next lookup reads it afresh."""
+        pass
+    
     async def scan_schema(
         self, 
         tables: Optional[List[str]] = None,
@@ -265,10 +307,52 @@ class DatabaseConnector(ABC):
         import time
         
         start_time = time.time()
+        db_info = None
+        table_infos = []
         errors = []
         
+        async for batch in self.scan_schema_batched(
+            tables=tables, include_sample_data=include_sample_data, sample_size=sample_size
+        ):
+            db_info = batch.database_info
+            table_infos.extend(batch.tables)
+            errors.extend(batch.errors)
+        
+        # Update database info with actual counts
+        db_info.total_tables = len([t for t in table_infos if t.table_type == "table"])
+        db_info.total_views = len([t for t in table_infos if t.table_type in ["view", "materialized_view"]])
+        
+        scan_duration = time.time() - start_time
+        
+        return ScanResult(
+            database_info=db_info,
+            tables=table_infos,
+            scan_duration_seconds=scan_duration,
+            scan_timestamp=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            errors=errors if errors else None
+        )
+    
+    async def scan_schema_batched(
+        self,
+        tables: Optional[List[str]] = None,
+        include_sample_data: bool = True,
+        sample_size: int = 100,
+        batch_size: int = 16,
+        keep_open: bool = False
+    ) -> AsyncIterator[ScanBatch]:
+        """Scan the schema and yield tables in batches of up to batch_size.
+        
+        Lets callers serialize and analyze each batch as it arrives instead of
+        holding every TableInfo until the whole scan finishes. At least one
+        batch is always yielded, so database_info is available even when the
+        schema has no tables. The connection is closed once iteration ends,
+        unless keep_open is set by a caller that manages it (such as a cached
+        connector reused across scans).
+        """
         try:
             await self.connect()
+            # A connection kept open by the caller may hold an earlier scan's metadata
+            self.clear_metadata_cache()
             
             # Get database info
             db_info = await self.get_database_info()
@@ -277,128 +361,157 @@ class DatabaseConnector(ABC):
             if tables is None:
                 tables = await self.get_tables(schema=db_info.schema_name)
             
-            # Scan each table
-            table_infos = []
-            for table_name in tables:
-                try:
-                    self.logger.info(f"Scanning table: {table_name}")
-                    table_info = await self.get_table_info(table_name, schema=db_info.schema_name)
-                    
-                    # Get sample data if requested
-                    if include_sample_data:
-                        try:
-                            sample_data = await self.get_sample_data(table_name, schema=db_info.schema_name, limit=sample_size)
-                            table_info.sample_data = sample_data
-                        except Exception as e:
-                            self.logger.warning(f"Failed to get sample data for {table_name}: {e}")
-                            errors.append(f"Sample data error for {table_name}: {str(e)}")
-                    
-                    table_infos.append(table_info)
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to scan table {table_name}: {e}")
-                    errors.append(f"Table scan error for {table_name}: {str(e)}")
-            
-            # Update database info with actual counts
-            db_info.total_tables = len([t for t in table_infos if t.table_type == "table"])
-            db_info.total_views = len([t for t in table_infos if t.table_type in ["view", "materialized_view"]])
+            # Scan tables, up to max_concurrency at a time
+            semaphore = asyncio.Semaphore(self.max_concurrency)
             
-            scan_duration = time.time() - start_time
+            async def scan_table(table_name: str) -> Tuple[Optional[TableInfo], List[str]]:
+                table_errors = []
+                async with semaphore:
+                    try:
+                        self.logger.info(f"Scanning table: {table_name}")
+                        table_info = await self.get_table_info(table_name, schema=db_info.schema_name)
+                        
+                        # Get sample data if requested
+                        if include_sample_data:
+                            try:
+                                sample_data = await self.get_sample_data(table_name, schema=db_info.schema_name, limit=sample_size)
+                                table_info.sample_data = sample_data
+                            except Exception as e:
+                                self.logger.warning(f"Failed to get sample data for {table_name}: {e}")
+                                table_errors.append(f"Sample data error for {table_name}: {str(e)}")
+                        
+                        return table_info, table_errors
+                        
+                    except Exception as e:
+                        self.logger.error(f"Failed to scan table {table_name}: {e}")
+                        table_errors.append(f"Table scan error for {table_name}: {str(e)}")
+                        return None, table_errors
             
-            return ScanResult(
-                database_info=db_info,
-                tables=table_infos,
-                scan_duration_seconds=scan_duration,
-                scan_timestamp=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-                errors=errors if errors else None
-            )
+            for start in range(0, max(len(tables), 1), batch_size):
+                batch_names = tables[start:start + batch_size]
+                batch_tables = []
+                batch_errors = []
+                for table_info, table_errors in await asyncio.gather(*(scan_table(name) for name in batch_names)):
+                    if table_info is not None:
+                        batch_tables.append(table_info)
+                    batch_errors.extend(table_errors)
+                
+                yield ScanBatch(
+                    database_info=db_info,
+                    tables=batch_tables,
+                    errors=batch_errors,
+                    tables_scanned=start + len(batch_names),
+                    tables_total=len(tables),
+                )
             
         finally:
-            await self.disconnect()
+            if not keep_open:
+                await self.disconnect()
+
+
+@dataclass
+class AnalyzerResults:
+    """Every SchemaAnalyzer detection and suggestion, from one pass over the tables."""
+    
+    fact_tables: List[str]
+    dimension_tables: List[str]
+    bridge_tables: List[str]
+    staging_models: List[Dict[str, Any]]
+    mart_models: List[Dict[str, Any]]
 
 
 class SchemaAnalyzer:
-    """Analyzes database schema and provides insights."""
+    """Analyzes database schema and provides insights.
     
-    def __init__(self, scan_result: ScanResult):
-        """Initialize analyzer with scan result."""
+    Works entirely from a finished ScanResult: row counts, keys and
+    relationships were already collected by the connector's catalog queries,
+    so analysis never goes back to the database.
+    """
+    
+    def __init__(self, scan_result: Optional[ScanResult] = None):
+        """Initialize analyzer with scan result.
+        
+        scan_result may be omitted when tables are fed in batches with feed()
+        and finalize(); the detect_* and suggest_* methods need it.
+        """
         self.scan_result = scan_result
         self.logger = get_logger(__name__)
+        self._reset_analysis()
     
-    def detect_fact_tables(self) -> List[str]:
-        """Detect potential fact tables based on naming and structure."""
-        fact_tables = []
+    def analyze_all(self) -> AnalyzerResults:
+        """Run every detection and suggestion in a single traversal of the tables.
         
-        for table in self.scan_result.tables:
-            # Check naming patterns
-            if any(pattern in table.name.lower() for pattern in ['fact', 'sales', 'order', 'transaction', 'event']):
-                fact_tables.append(table.name)
-                continue
-            
-            # Check structure - many foreign keys, numeric measures
-            fk_count = len(table.get_foreign_key_relationships())
-            numeric_cols = len([col for col in table.columns if col.data_type in [
-                DataType.INTEGER, DataType.BIGINT, DataType.DECIMAL, DataType.FLOAT, DataType.DOUBLE
-            ]])
+        Equivalent to calling the detect_* and suggest_* methods one by one,
+        but each table's keys and relationships are looked at only once.
+        """
+        self.feed(self.scan_result.tables)
+        return self.finalize()
+    
+    def feed(self, tables: List[TableInfo]) -> None:
+        """Analyze a batch of tables, accumulating results until finalize()."""
+        for table in tables:
+            fk_relationships = table.get_foreign_key_relationships()
+            pk_cols = table.get_primary_key_columns()
             
-            if fk_count >= 2 and numeric_cols >= 2:
-                fact_tables.append(table.name)
-        
-        return fact_tables
+            if self._is_fact_table(table, fk_relationships):
+                self._fact_tables.append(table.name)
+                self._fact_marts.append(self._fact_mart_model(table))
+            if self._is_dimension_table(table, pk_cols):
+                self._dimension_tables.append(table.name)
+                self._dimension_marts.append(self._dimension_mart_model(table))
+            if self._is_bridge_table(table, fk_relationships):
+                self._bridge_tables.append(table.name)
+            if table.table_type == "table":  # Only create staging for actual tables
+                self._staging_models.append(self._staging_model(table))
+    
+    def finalize(self) -> AnalyzerResults:
+        """Return the results for every table fed so far and start over."""
+        results = AnalyzerResults(
+            fact_tables=self._fact_tables,
+            dimension_tables=self._dimension_tables,
+            bridge_tables=self._bridge_tables,
+            staging_models=self._staging_models,
+            mart_models=self._fact_marts + self._dimension_marts,
+        )
+        self._reset_analysis()
+        return results
+    
+    def _reset_analysis(self) -> None:
+        """Clear the results accumulated by feed()."""
+        self._fact_tables: List[str] = []
+        self._dimension_tables: List[str] = []
+        self._bridge_tables: List[str] = []
+        self._staging_models: List[Dict[str, Any]] = []
+        self._fact_marts: List[Dict[str, Any]] = []
+        self._dimension_marts: List[Dict[str, Any]] = []
+    
+    def detect_fact_tables(self) -> List[str]:
+        """Detect potential fact tables based on naming and structure."""
+        return [
+            table.name for table in self.scan_result.tables
+            if self._is_fact_table(table, table.get_foreign_key_relationships())
+        ]
     
     def detect_dimension_tables(self) -> List[str]:
         """Detect potential dimension tables."""
-        dimension_tables = []
-        
-        for table in self.scan_result.tables:
-            # Check naming patterns
-            if any(pattern in table.name.lower() for pattern in ['dim', 'customer', 'product', 'user', 'category']):
-                dimension_tables.append(table.name)
-                continue
-            
-            # Check structure - primary key, descriptive columns
-            pk_cols = table.get_primary_key_columns()
-            text_cols = len([col for col in table.columns if col.data_type in [
-                DataType.VARCHAR, DataType.CHAR, DataType.TEXT
-            ]])
-            
-            if len(pk_cols) == 1 and text_cols >= 2:
-                dimension_tables.append(table.name)
-        
-        return dimension_tables
+        return [
+            table.name for table in self.scan_result.tables
+            if self._is_dimension_table(table, table.get_primary_key_columns())
+        ]
     
     def detect_bridge_tables(self) -> List[str]:
         """Detect bridge/junction tables for many-to-many relationships."""
-        bridge_tables = []
-        
-        for table in self.scan_result.tables:
-            fk_relationships = table.get_foreign_key_relationships()
-            
-            # Bridge tables typically have 2+ foreign keys and few other columns
-            if len(fk_relationships) >= 2 and len(table.columns) <= len(fk_relationships) + 2:
-                bridge_tables.append(table.name)
-        
-        return bridge_tables
+        return [
+            table.name for table in self.scan_result.tables
+            if self._is_bridge_table(table, table.get_foreign_key_relationships())
+        ]
     
     def suggest_staging_models(self) -> List[Dict[str, Any]]:
         """Suggest staging models for each table."""
-        staging_models = []
-        
-        for table in self.scan_result.tables:
-            if table.table_type == "table":  # Only create staging for actual tables
-                model_name = f"stg_{table.name}"
-                
-                staging_models.append({
-                    "name": model_name,
-                    "source_table": table.name,
-                    "source_schema": table.schema,
-                    "description": f"Staging model for {table.schema}.{table.name}",
-                    "columns": [col.name for col in table.columns],
-                    "primary_key": table.get_primary_key_columns(),
-                    "tests": self._suggest_column_tests(table)
-                })
-        
-        return staging_models
+        return [
+            self._staging_model(table) for table in self.scan_result.tables
+            if table.table_type == "table"  # Only create staging for actual tables
+        ]
     
     def suggest_mart_models(self) -> List[Dict[str, Any]]:
         """Suggest mart models based on detected patterns."""
@@ -411,36 +524,83 @@ class SchemaAnalyzer:
         for fact_table in fact_tables:
             table_info = self.scan_result.get_table_by_name(fact_table)
             if table_info:
-                model_name = f"fct_{fact_table}"
-                
-                mart_models.append({
-                    "name": model_name,
-                    "type": "fact",
-                    "base_table": fact_table,
-                    "description": f"Fact table for {fact_table}",
-                    "joins": self._suggest_joins(table_info),
-                    "measures": self._suggest_measures(table_info),
-                    "tests": ["not_null", "unique"] if table_info.get_primary_key_columns() else ["not_null"]
-                })
+                mart_models.append(self._fact_mart_model(table_info))
         
         # Create dimension marts
         for dim_table in dimension_tables:
             table_info = self.scan_result.get_table_by_name(dim_table)
             if table_info:
-                model_name = f"dim_{dim_table}"
-                
-                mart_models.append({
-                    "name": model_name,
-                    "type": "dimension",
-                    "base_table": dim_table,
-                    "description": f"Dimension table for {dim_table}",
-                    "natural_key": table_info.get_primary_key_columns(),
-                    "attributes": [col.name for col in table_info.columns if not col.is_primary_key],
-                    "tests": ["unique", "not_null"] if table_info.get_primary_key_columns() else ["not_null"]
-                })
+                mart_models.append(self._dimension_mart_model(table_info))
         
         return mart_models
     
+    def _is_fact_table(self, table: TableInfo, fk_relationships: List[Tuple[str, str, str]]) -> bool:
+        """Check whether a table looks like a fact table."""
+        # Check naming patterns
+        if any(pattern in table.name.lower() for pattern in ['fact', 'sales', 'order', 'transaction', 'event']):
+            return True
+        
+        # Check structure - many foreign keys, numeric measures
+        numeric_cols = len([col for col in table.columns if col.data_type in [
+            DataType.INTEGER, DataType.BIGINT, DataType.DECIMAL, DataType.FLOAT, DataType.DOUBLE
+        ]])
+        
+        return len(fk_relationships) >= 2 and numeric_cols >= 2
+    
+    def _is_dimension_table(self, table: TableInfo, pk_cols: List[str]) -> bool:
+        """Check whether a table looks like a dimension table."""
+        # Check naming patterns
+        if any(pattern in table.name.lower() for pattern in ['dim', 'customer', 'product', 'user', 'category']):
+            return True
+        
+        # Check structure - primary key, descriptive columns
+        text_cols = len([col for col in table.columns if col.data_type in [
+            DataType.VARCHAR, DataType.CHAR, DataType.TEXT
+        ]])
+        
+        return len(pk_cols) == 1 and text_cols >= 2
+    
+    def _is_bridge_table(self, table: TableInfo, fk_relationships: List[Tuple[str, str, str]]) -> bool:
+        """Check whether a table looks like a bridge/junction table."""
+        # Bridge tables typically have 2+ foreign keys and few other columns
+        return len(fk_relationships) >= 2 and len(table.columns) <= len(fk_relationships) + 2
+    
+    def _staging_model(self, table: TableInfo) -> Dict[str, Any]:
+        """Build the staging model suggestion for a table."""
+        return {
+            "name": f"stg_{table.name}",
+            "source_table": table.name,
+            "source_schema": table.schema,
+            "description": f"Staging model for {table.schema}.{table.name}",
+            "columns": [col.name for col in table.columns],
+            "primary_key": table.get_primary_key_columns(),
+            "tests": self._suggest_column_tests(table)
+        }
+    
+    def _fact_mart_model(self, table: TableInfo) -> Dict[str, Any]:
+        """Build the fact mart suggestion for a fact table."""
+        return {
+            "name": f"fct_{table.name}",
+            "type": "fact",
+            "base_table": table.name,
+            "description": f"Fact table for {table.name}",
+            "joins": self._suggest_joins(table),
+            "measures": self._suggest_measures(table),
+            "tests": ["not_null", "unique"] if table.get_primary_key_columns() else ["not_null"]
+        }
+    
+    def _dimension_mart_model(self, table: TableInfo) -> Dict[str, Any]:
+        """Build the dimension mart suggestion for a dimension table."""
+        return {
+            "name": f"dim_{table.name}",
+            "type": "dimension",
+            "base_table": table.name,
+            "description": f"Dimension table for {table.name}",
+            "natural_key": table.get_primary_key_columns(),
+            "attributes": [col.name for col in table.columns if not col.is_primary_key],
+            "tests": ["unique", "not_null"] if table.get_primary_key_columns() else ["not_null"]
+        }
+    
     def _suggest_column_tests(self, table: TableInfo) -> List[Dict[str, Any]]:
         """Suggest dbt tests for table columns."""
         tests = []
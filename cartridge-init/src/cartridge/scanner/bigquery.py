@@ -56,7 +56,11 @@ class BigQueryConnector(DatabaseConnector):
             2. credentials_json (service account JSON string/dict)
             3. credentials_path (service account file)
             4. ADC (Application Default Credentials)
+        An already open client is kept, so repeated scans share it.
         """
+        if self.client is not None:
+            return
+        
         try:
             credentials = None
 
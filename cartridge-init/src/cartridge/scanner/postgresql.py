@@ -1,9 +1,15 @@
 """PostgreSQL database connector for schema scanning."""
 
 import asyncio
-from typing import Dict, List, Any, Optional
+import json
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import AsyncGenerator, Callable, Dict, List, Any, Mapping, Optional
 import asyncpg
-from asyncpg import Connection
+from asyncpg import Connection, Pool
+from asyncpg.prepared_stmt import PreparedStatement
 
 from cartridge.scanner.base import (
     DatabaseConnector, DatabaseInfo, TableInfo, ColumnInfo, ConstraintInfo, 
@@ -13,27 +19,230 @@ from cartridge.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Column types that also get MIN/MAX/AVG statistics
+_NUMERIC_STATISTICS_TYPES = frozenset({
+    DataType.INTEGER, DataType.BIGINT, DataType.DECIMAL, DataType.FLOAT, DataType.DOUBLE
+})
+
+# Number of distinct sample values collected per column
+_SAMPLE_VALUES_LIMIT = 10
+
+# Rows read (block-sampled on larger tables) to collect sample values from
+_SAMPLE_SCAN_ROWS = 10_000
+
+# Text-like sample values are truncated to this many characters server-side
+_SAMPLE_VALUE_MAX_CHARS = 256
+
+# Column types sampled as (truncated) text; unmapped types are included so
+# large user-defined values (e.g. geometries) are bounded too. char(n) is left
+# out since it is already bounded and a text cast would strip its padding.
+_TEXT_SAMPLE_TYPES = frozenset({
+    DataType.VARCHAR, DataType.TEXT, DataType.JSON, DataType.JSONB, DataType.UNKNOWN
+})
+
+# Column types sampled as a size and digest instead of the raw bytes
+_BINARY_SAMPLE_TYPES = frozenset({DataType.BINARY, DataType.VARBINARY, DataType.BLOB})
+
+# pg_class.relkind values scanned: tables, views, materialized views,
+# partitioned tables and foreign tables. asyncpg encodes "char" as bytes.
+_TABLE_RELKINDS = (b"r", b"v", b"m", b"p", b"f")
+
+# Tables estimated (pg_class.reltuples) above this size skip column statistics
+_STATISTICS_ROW_LIMIT = 5_000_000
+
+# Tables without a row estimate are only COUNT(*)ed below this many 8kB pages (~1MB)
+_EXACT_COUNT_MAX_PAGES = 128
+
+# Relation kinds whose relpages bound a COUNT(*): plain tables and materialized views
+_EXACT_COUNT_RELKINDS = frozenset({"r", "m"})
+
+# Relation kinds without a size to bound a scan: views and foreign tables
+_UNSIZED_RELKINDS = frozenset({"v", "f"})
+
+# PostgreSQL type names (pg_type.typname) to standard data types
+_TYPE_MAPPING: Mapping[str, DataType] = MappingProxyType({
+    # Integer types
+    "int2": DataType.SMALLINT,
+    "int4": DataType.INTEGER,
+    "int8": DataType.BIGINT,
+    "smallint": DataType.SMALLINT,
+    "integer": DataType.INTEGER,
+    "bigint": DataType.BIGINT,
+    
+    # Numeric types
+    "numeric": DataType.NUMERIC,
+    "decimal": DataType.DECIMAL,
+    "real": DataType.REAL,
+    "float4": DataType.REAL,
+    "float8": DataType.DOUBLE,
+    "double": DataType.DOUBLE,
+    
+    # String types
+    "varchar": DataType.VARCHAR,
+    "char": DataType.CHAR,
+    "text": DataType.TEXT,
+    "bpchar": DataType.CHAR,
+    
+    # Date/time types
+    "date": DataType.DATE,
+    "time": DataType.TIME,
+    "timestamp": DataType.TIMESTAMP,
+    "timestamptz": DataType.TIMESTAMPTZ,
+    "interval": DataType.INTERVAL,
+    
+    # Boolean
+    "bool": DataType.BOOLEAN,
+    "boolean": DataType.BOOLEAN,
+    
+    # Binary
+    "bytea": DataType.BINARY,
+    
+    # JSON
+    "json": DataType.JSON,
+    "jsonb": DataType.JSONB,
+    
+    # UUID
+    "uuid": DataType.UUID,
+    
+    # Array
+    "_int4": DataType.ARRAY,
+    "_text": DataType.ARRAY,
+    "_varchar": DataType.ARRAY,
+})
+
+# Rows buffered per round trip when streaming sample data
+_SAMPLE_DATA_PREFETCH = 64
+
+# Connection pool bounds; tables are scanned concurrently across the pool
+_POOL_MIN_SIZE = 2
+_POOL_MAX_SIZE = 10
+
+# Idle pooled connections are closed after this many seconds
+_POOL_MAX_INACTIVE_LIFETIME = 300.0
+
+# Client-side timeout (seconds) for every query run through the pool
+_COMMAND_TIMEOUT = 60.0
+
+# Timeout (seconds) for the test_connection probe
+_TEST_CONNECTION_TIMEOUT = 5.0
+
+# Session settings for scanner connections: the scanner only reads, its catalog
+# queries are too short to benefit from JIT compilation, and a runaway
+# statistics or sample query must not hold a connection indefinitely
+_SERVER_SETTINGS: Mapping[str, str] = MappingProxyType({
+    "application_name": "cartridge_scanner",
+    "statement_timeout": "60s",
+    "idle_in_transaction_session_timeout": "30s",
+    "work_mem": "64MB",
+    "jit": "off",
+    "default_transaction_read_only": "on",
+})
+
+# Per-connection prepared statement cache used by fetch*() for the catalog
+# queries. Per-table/per-column queries bypass it via _prepare_once().
+_STATEMENT_CACHE_SIZE = 1024
+
+
+def _quote_ident(name: str) -> str:
+    """Quote an identifier for splicing into SQL, escaping embedded double quotes."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _relation(schema: str, table_name: str) -> str:
+    """Quote a schema-qualified relation name."""
+    return f"{_quote_ident(schema)}.{_quote_ident(table_name)}"
+
+
+async def _prepare_once(conn: Connection, query: str) -> PreparedStatement:
+    """Prepare a one-off query without adding it to the connection's statement cache.
+    
+    asyncpg caches every statement run through fetch*() and evicts the least
+    recently used one when full. Statistics and sample queries embed table and
+    column names and are never reused, so caching them would only push the
+    catalog queries (reused for every table) out of the cache.
+    """
+    return await conn.prepare(query)
+
+
+def _isoformat(value: Any) -> str:
+    return value.isoformat()
+
+
+def _describe_binary(value: Any) -> str:
+    return f"<binary data: {len(value)} bytes>"
+
+
+def _unchanged(value: Any) -> Any:
+    return value
+
+
+# Sample value converter per Python type, resolved on first sight of each type
+_SAMPLE_VALUE_CONVERTERS: Dict[type, Callable[[Any], Any]] = {}
+
+
+def _sample_value(value: Any) -> Any:
+    """Convert a sample data cell to a JSON-serializable value."""
+    converter = _SAMPLE_VALUE_CONVERTERS.get(type(value))
+    if converter is None:
+        if hasattr(value, 'isoformat'):  # datetime objects
+            converter = _isoformat
+        elif isinstance(value, (bytes, bytearray)):  # binary data
+            converter = _describe_binary
+        else:
+            converter = _unchanged
+        _SAMPLE_VALUE_CONVERTERS[type(value)] = converter
+    return converter(value)
+
+
+def _json_default(value: Any) -> Any:
+    """Encode a sample data cell the json module cannot serialize natively."""
+    converted = _sample_value(value)
+    # Decimal, UUID and the like pass through unchanged; encode them as text
+    return str(converted) if converted is value else converted
+
+
+@dataclass
+class _SchemaMetadata:
+    """Catalog metadata for every table in a schema, keyed by table name."""
+    
+    tables: Dict[str, asyncpg.Record]
+    columns: Dict[str, List[ColumnInfo]]
+    constraints: Dict[str, List[ConstraintInfo]]
+    indexes: Dict[str, List[IndexInfo]]
+
 
 class PostgreSQLConnector(DatabaseConnector):
     """PostgreSQL database connector."""
     
+    max_concurrency = 8
+    
     def __init__(self, connection_config: Dict[str, Any]):
         """Initialize PostgreSQL connector."""
         super().__init__(connection_config)
-        self.connection: Optional[Connection] = None
+        self.pool: Optional[Pool] = None
+        self._schema_metadata: Dict[str, "asyncio.Future[_SchemaMetadata]"] = {}
     
     async def connect(self) -> None:
-        """Establish PostgreSQL connection."""
+        """Establish PostgreSQL connection pool.
+        
+        An already open pool is kept, so repeated scans share it.
+        """
+        if self.pool is not None:
+            return
+        
         try:
-            self.connection = await asyncpg.connect(
+            self.pool = await asyncpg.create_pool(
+                min_size=_POOL_MIN_SIZE,
+                max_size=_POOL_MAX_SIZE,
+                max_inactive_connection_lifetime=_POOL_MAX_INACTIVE_LIFETIME,
+                command_timeout=_COMMAND_TIMEOUT,
+                statement_cache_size=_STATEMENT_CACHE_SIZE,
                 host=self.config["host"],
                 port=self.config["port"],
                 database=self.config["database"],
                 user=self.config["username"],
                 password=self.config["password"],
-                server_settings={
-                    'application_name': 'cartridge_scanner'
-                }
+                server_settings=dict(_SERVER_SETTINGS)
             )
             self.logger.info("Connected to PostgreSQL database")
             
@@ -42,19 +251,29 @@ class PostgreSQLConnector(DatabaseConnector):
             raise
     
     async def disconnect(self) -> None:
-        """Close PostgreSQL connection."""
-        if self.connection:
-            await self.connection.close()
-            self.connection = None
+        """Close PostgreSQL connection pool."""
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
+            self.clear_metadata_cache()
             self.logger.info("Disconnected from PostgreSQL")
     
+    def clear_metadata_cache(self) -> None:
+        """Drop the cached schema metadata; scans already awaiting a load still get it."""
+        self._schema_metadata.clear()
+    
     async def test_connection(self) -> Dict[str, Any]:
-        """Test PostgreSQL connection."""
+        """Test PostgreSQL connection.
+        
+        Reuses an open pool; otherwise a pool is opened for the test and closed again.
+        """
+        owns_pool = self.pool is None
         try:
-            await self.connect()
+            if owns_pool:
+                await self.connect()
             
             # Test with a simple query
-            result = await self.connection.fetchval("SELECT version()")
+            result = await self.pool.fetchval("SELECT version()", timeout=_TEST_CONNECTION_TIMEOUT)
             
             return {
                 "status": "success",
@@ -70,18 +289,19 @@ class PostgreSQLConnector(DatabaseConnector):
                 "error": str(e)
             }
         finally:
-            await self.disconnect()
+            if owns_pool:
+                await self.disconnect()
     
     async def get_database_info(self) -> DatabaseInfo:
         """Get PostgreSQL database information."""
         # Get version
-        version = await self.connection.fetchval("SELECT version()")
+        version = await self.pool.fetchval("SELECT version()")
         
         # Get database size
         db_size_query = """
             SELECT pg_database_size(current_database())
         """
-        db_size = await self.connection.fetchval(db_size_query)
+        db_size = await self.pool.fetchval(db_size_query)
         
         # Count tables and views
         count_query = """
@@ -91,7 +311,7 @@ class PostgreSQLConnector(DatabaseConnector):
             FROM information_schema.tables 
             WHERE table_schema = $1
         """
-        counts = await self.connection.fetchrow(count_query, self.config["schema"])
+        counts = await self.pool.fetchrow(count_query, self.config["schema"])
         
         return DatabaseInfo(
             database_type="postgresql",
@@ -107,422 +327,640 @@ class PostgreSQLConnector(DatabaseConnector):
     
     async def get_tables(self, schema: Optional[str] = None) -> List[str]:
         """Get list of table names."""
+        return [table_name async for table_name in self.iter_tables(schema)]
+    
+    async def iter_tables(self, schema: Optional[str] = None) -> AsyncGenerator[str, None]:
+        """Yield table names as they arrive from a server-side cursor."""
         schema = schema or self.config["schema"]
         
         query = """
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = $1 
-            AND table_type IN ('BASE TABLE', 'VIEW')
-            ORDER BY table_name
+            SELECT c.relname AS table_name
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = $1
+            AND c.relkind = ANY($2::"char"[])
+            ORDER BY c.relname
         """
         
-        rows = await self.connection.fetch(query, schema)
-        return [row["table_name"] for row in rows]
+        async with self.pool.acquire() as conn:
+            async with conn.transaction(readonly=True):
+                async for (table_name,) in conn.cursor(query, schema, _TABLE_RELKINDS):
+                    yield table_name
     
     async def get_table_info(self, table_name: str, schema: Optional[str] = None) -> TableInfo:
         """Get detailed table information."""
         schema = schema or self.config["schema"]
         
-        # Get basic table info
-        table_info_query = """
-            SELECT 
-                table_type,
-                obj_description(c.oid) as comment
-            FROM information_schema.tables t
-            LEFT JOIN pg_class c ON c.relname = t.table_name
-            LEFT JOIN pg_namespace n ON n.oid = c.relnamespace AND n.nspname = t.table_schema
-            WHERE t.table_name = $1 AND t.table_schema = $2
-        """
-        table_row = await self.connection.fetchrow(table_info_query, table_name, schema)
+        metadata = await self._get_schema_metadata(schema)
+        table_row = metadata.tables.get(table_name)
         
         if not table_row:
             raise ValueError(f"Table {schema}.{table_name} not found")
         
-        table_type = "table" if table_row["table_type"] == "BASE TABLE" else "view"
+        table_type = table_row["table_type"]
+        columns = metadata.columns.get(table_name, [])
         
-        # Get table size and row count for actual tables
+        # Get data quality metrics, and the row count for actual tables
         row_count = None
         size_bytes = None
+        statistics = self._add_table_statistics(
+            columns, table_name, schema, table_row["relkind"], table_row["reltuples"], table_row["relpages"]
+        )
         
-        if table_type == "table":
-            try:
-                # Estimate row count (faster than COUNT(*))
-                row_count_query = """
-                    SELECT n_tup_ins - n_tup_del as estimate
-                    FROM pg_stat_user_tables 
-                    WHERE schemaname = $1 AND relname = $2
-                """
-                row_count_result = await self.connection.fetchval(row_count_query, schema, table_name)
-                row_count = max(0, row_count_result) if row_count_result else None
-                
-                # If estimate is 0 or None, do actual count for small tables
-                if not row_count:
-                    actual_count = await self.connection.fetchval(f'SELECT COUNT(*) FROM "{schema}"."{table_name}"')
-                    row_count = actual_count
-                
-                # Get table size
-                size_query = """
-                    SELECT pg_total_relation_size(c.oid) as size
-                    FROM pg_class c
-                    JOIN pg_namespace n ON n.oid = c.relnamespace
-                    WHERE c.relname = $1 AND n.nspname = $2
-                """
-                size_bytes = await self.connection.fetchval(size_query, table_name, schema)
-                
-            except Exception as e:
-                self.logger.warning(f"Failed to get table stats for {table_name}: {e}")
-        
-        # Get columns
-        columns = await self._get_columns(table_name, schema)
-        
-        # Get constraints
-        constraints = await self._get_constraints(table_name, schema)
-        
-        # Get indexes
-        indexes = await self._get_indexes(table_name, schema)
+        if table_type != "view":
+            size_bytes = table_row["size"]
+            row_count, _ = await asyncio.gather(
+                self._fetch_row_count(
+                    table_name, schema, table_row["relkind"], table_row["reltuples"], table_row["relpages"]
+                ),
+                statistics
+            )
+        else:
+            await statistics
         
         return TableInfo(
             name=table_name,
             schema=schema,
             table_type=table_type,
             columns=columns,
-            constraints=constraints,
-            indexes=indexes,
+            constraints=metadata.constraints.get(table_name, []),
+            indexes=metadata.indexes.get(table_name, []),
             row_count=row_count,
             size_bytes=size_bytes,
             comment=table_row["comment"]
         )
     
-    async def _get_columns(self, table_name: str, schema: str) -> List[ColumnInfo]:
-        """Get column information for a table."""
+    async def _get_schema_metadata(self, schema: str) -> _SchemaMetadata:
+        """Get catalog metadata for a schema, loading it once per scan or connection.
+        
+        Concurrent table scans share a single in-flight load.
+        """
+        load = self._schema_metadata.get(schema)
+        if load is None:
+            load = asyncio.ensure_future(self._load_schema_metadata(schema))
+            self._schema_metadata[schema] = load
+        
+        try:
+            return await asyncio.shield(load)
+        except Exception:
+            # Let the next caller retry rather than re-raising a stale failure
+            if self._schema_metadata.get(schema) is load:
+                del self._schema_metadata[schema]
+            raise
+    
+    async def _load_schema_metadata(self, schema: str) -> _SchemaMetadata:
+        """Fetch tables, columns, constraints and indexes for a whole schema."""
+        tables, columns, constraints, indexes = await asyncio.gather(
+            self._get_all_tables(schema),
+            self._get_all_columns(schema),
+            self._get_all_constraints(schema),
+            self._get_all_indexes(schema)
+        )
+        return _SchemaMetadata(tables=tables, columns=columns, constraints=constraints, indexes=indexes)
+    
+    async def _get_all_tables(self, schema: str) -> Dict[str, asyncpg.Record]:
+        """Get type, comment, size and row estimates for every table in a schema."""
         query = """
             SELECT 
-                c.column_name,
-                c.data_type,
-                c.udt_name,
-                c.is_nullable,
-                c.column_default,
-                c.character_maximum_length,
-                c.numeric_precision,
-                c.numeric_scale,
-                col_description(pgc.oid, c.ordinal_position) as comment,
+                c.relname AS table_name,
+                CASE c.relkind
+                    WHEN 'v' THEN 'view'
+                    WHEN 'm' THEN 'materialized_view'
+                    ELSE 'table'
+                END AS table_type,
+                c.relkind::text AS relkind,
+                obj_description(c.oid, 'pg_class') AS comment,
+                -- Partitioned parents hold no rows, so sum the estimates of their leaf partitions
+                CASE WHEN c.relkind = 'p' THEN (
+                    SELECT COALESCE(NULLIF(sum(GREATEST(p.reltuples, 0)), 0), -1)
+                    FROM pg_partition_tree(c.oid) t
+                    JOIN pg_class p ON p.oid = t.relid
+                    WHERE t.isleaf
+                ) ELSE c.reltuples END AS reltuples,
+                c.relpages,
+                CASE WHEN c.relkind IN ('r', 'p', 'm') THEN pg_total_relation_size(c.oid) END AS size
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = $1
+            AND c.relkind = ANY($2::"char"[])
+        """
+        
+        rows = await self.pool.fetch(query, schema, _TABLE_RELKINDS)
+        return {row["table_name"]: row for row in rows}
+    
+    async def _fetch_row_count(
+        self, table_name: str, schema: str, relkind: str, reltuples: float, relpages: int
+    ) -> Optional[int]:
+        """Get the row count of a table from the planner estimate.
+        
+        Falls back to COUNT(*) only for tiny plain or materialized tables
+        without an estimate (never analyzed, or genuinely empty), unless the
+        ``exact_counts`` config flag is turned off. Partitioned and foreign
+        tables have no pages of their own to bound that scan.
+        """
+        if reltuples > 0:
+            return int(reltuples)
+        
+        if (
+            relkind not in _EXACT_COUNT_RELKINDS
+            or not self.config.get("exact_counts", True)
+            or not 0 <= relpages < _EXACT_COUNT_MAX_PAGES
+        ):
+            return None
+        
+        try:
+            async with self.pool.acquire() as conn:
+                count_query = f"SELECT COUNT(*) FROM {_relation(schema, table_name)}"
+                return await (await _prepare_once(conn, count_query)).fetchval()
+        
+        except Exception as e:
+            self.logger.warning(f"Failed to get row count for {table_name}: {e}")
+            return None
+    
+    async def _get_all_columns(self, schema: str) -> Dict[str, List[ColumnInfo]]:
+        """Get column information for every table in a schema, keyed by table name."""
+        query = """
+            -- Constraint columns of the schema, read from pg_constraint once
+            WITH constraint_columns AS (
+                SELECT 
+                    con.conrelid,
+                    con.conname,
+                    con.contype,
+                    con.confrelid,
+                    k.attnum,
+                    k.foreign_attnum
+                FROM pg_constraint con
+                JOIN pg_namespace cn ON cn.oid = con.connamespace
+                CROSS JOIN LATERAL unnest(con.conkey, con.confkey) AS k(attnum, foreign_attnum)
+                WHERE cn.nspname = $1 AND con.contype IN ('p', 'u', 'f')
+            ),
+            keys AS (
+                SELECT 
+                    conrelid,
+                    attnum,
+                    bool_or(contype = 'p') AS is_primary_key,
+                    bool_or(contype = 'u') AS is_unique
+                FROM constraint_columns
+                WHERE contype IN ('p', 'u')
+                GROUP BY conrelid, attnum
+            ),
+            -- One referenced column per column, even if it is in several foreign keys
+            foreign_keys AS (
+                SELECT DISTINCT ON (cc.conrelid, cc.attnum)
+                    cc.conrelid,
+                    cc.attnum,
+                    fc.relname AS foreign_table_name,
+                    fa.attname AS foreign_column_name
+                FROM constraint_columns cc
+                JOIN pg_class fc ON fc.oid = cc.confrelid
+                JOIN pg_attribute fa ON fa.attrelid = cc.confrelid AND fa.attnum = cc.foreign_attnum
+                WHERE cc.contype = 'f'
+                ORDER BY cc.conrelid, cc.attnum, cc.conname
+            ),
+            indexed AS (
+                SELECT DISTINCT i.indrelid, unnest(i.indkey) AS attnum
+                FROM pg_index i
+                JOIN pg_class ic ON ic.oid = i.indexrelid
+                JOIN pg_namespace inn ON inn.oid = ic.relnamespace
+                WHERE inn.nspname = $1
+            )
+            SELECT 
+                c.relname AS table_name,
+                a.attname AS column_name,
+                format_type(a.atttypid, NULL) AS data_type,
+                ty.udt_name,
+                NOT (a.attnotnull OR (t.typtype = 'd' AND t.typnotnull)) AS nullable,
+                CASE WHEN a.attgenerated = '' THEN pg_get_expr(d.adbin, d.adrelid) END AS column_default,
+                CASE 
+                    WHEN ty.udt_name IN ('varchar', 'bpchar') AND ty.typmod > 0 THEN ty.typmod - 4
+                    WHEN ty.udt_name IN ('bit', 'varbit') AND ty.typmod > 0 THEN ty.typmod
+                END AS character_maximum_length,
+                CASE ty.udt_name
+                    WHEN 'int2' THEN 16
+                    WHEN 'int4' THEN 32
+                    WHEN 'int8' THEN 64
+                    WHEN 'float4' THEN 24
+                    WHEN 'float8' THEN 53
+                    WHEN 'numeric' THEN CASE WHEN ty.typmod > 0 THEN ((ty.typmod - 4) >> 16) & 65535 END
+                END AS numeric_precision,
+                CASE 
+                    WHEN ty.udt_name IN ('int2', 'int4', 'int8') THEN 0
+                    WHEN ty.udt_name = 'numeric' AND ty.typmod > 0 THEN (ty.typmod - 4) & 65535
+                END AS numeric_scale,
+                col_description(c.oid, a.attnum) as comment,
                 
-                -- Check if column is part of primary key
-                CASE WHEN pk.column_name IS NOT NULL THEN true ELSE false END as is_primary_key,
+                -- Check if column is part of a primary key / unique constraint
+                k.is_primary_key IS TRUE AS is_primary_key,
+                k.is_unique IS TRUE AS is_unique,
                 
-                -- Check if column is part of a unique constraint
-                CASE WHEN uk.column_name IS NOT NULL THEN true ELSE false END as is_unique,
+                -- Check if column is covered by an index
+                ix.attnum IS NOT NULL AS is_indexed,
                 
                 -- Foreign key information
                 fk.foreign_table_name,
                 fk.foreign_column_name
                 
-            FROM information_schema.columns c
-            LEFT JOIN pg_class pgc ON pgc.relname = c.table_name
-            LEFT JOIN pg_namespace pgn ON pgn.oid = pgc.relnamespace AND pgn.nspname = c.table_schema
+            FROM pg_attribute a
+            JOIN pg_class c ON c.oid = a.attrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            JOIN pg_type t ON t.oid = a.atttypid
+            -- Domains report the type and modifier of their base type
+            LEFT JOIN pg_type bt ON t.typtype = 'd' AND bt.oid = t.typbasetype
+            LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+            CROSS JOIN LATERAL (
+                SELECT 
+                    COALESCE(bt.typname, t.typname) AS udt_name,
+                    CASE WHEN t.typtype = 'd' THEN t.typtypmod ELSE a.atttypmod END AS typmod
+            ) ty
             
-            -- Primary key check
-            LEFT JOIN (
-                SELECT kcu.column_name
-                FROM information_schema.table_constraints tc
-                JOIN information_schema.key_column_usage kcu ON tc.constraint_name = kcu.constraint_name
-                WHERE tc.table_name = $1 AND tc.table_schema = $2 
-                AND tc.constraint_type = 'PRIMARY KEY'
-            ) pk ON pk.column_name = c.column_name
+            -- Primary key / unique constraint membership
+            LEFT JOIN keys k ON k.conrelid = a.attrelid AND k.attnum = a.attnum
             
-            -- Unique constraint check
-            LEFT JOIN (
-                SELECT kcu.column_name
-                FROM information_schema.table_constraints tc
-                JOIN information_schema.key_column_usage kcu ON tc.constraint_name = kcu.constraint_name
-                WHERE tc.table_name = $1 AND tc.table_schema = $2 
-                AND tc.constraint_type = 'UNIQUE'
-            ) uk ON uk.column_name = c.column_name
+            -- Index check
+            LEFT JOIN indexed ix ON ix.indrelid = a.attrelid AND ix.attnum = a.attnum
             
             -- Foreign key information
-            LEFT JOIN (
-                SELECT 
-                    kcu.column_name,
-                    ccu.table_name AS foreign_table_name,
-                    ccu.column_name AS foreign_column_name
-                FROM information_schema.table_constraints tc
-                JOIN information_schema.key_column_usage kcu ON tc.constraint_name = kcu.constraint_name
-                JOIN information_schema.constraint_column_usage ccu ON ccu.constraint_name = tc.constraint_name
-                WHERE tc.table_name = $1 AND tc.table_schema = $2 
-                AND tc.constraint_type = 'FOREIGN KEY'
-            ) fk ON fk.column_name = c.column_name
+            LEFT JOIN foreign_keys fk ON fk.conrelid = a.attrelid AND fk.attnum = a.attnum
             
-            WHERE c.table_name = $1 AND c.table_schema = $2
-            ORDER BY c.ordinal_position
+            WHERE n.nspname = $1
+            AND c.relkind = ANY($2::"char"[])
+            AND a.attnum > 0 AND NOT a.attisdropped
+            ORDER BY c.relname, a.attnum
         """
         
-        rows = await self.connection.fetch(query, table_name, schema)
-        columns = []
+        rows = await self.pool.fetch(query, schema, _TABLE_RELKINDS)
+        columns = defaultdict(list)
         
-        for row in rows:
-            # Check if column is indexed
-            is_indexed = await self._is_column_indexed(table_name, schema, row["column_name"])
-            
+        # Unpack each record positionally; the order follows the SELECT list.
+        # Type names repeat across thousands of columns, so they are interned
+        # to share one string per type instead of one per row.
+        for (
+            table_name, column_name, data_type, udt_name, nullable, column_default,
+            max_length, precision, scale, comment, is_primary_key, is_unique, is_indexed,
+            foreign_table_name, foreign_column_name,
+        ) in rows:
             column = ColumnInfo(
-                name=row["column_name"],
-                data_type=self.normalize_data_type(row["udt_name"]),
-                raw_type=row["data_type"],
-                nullable=row["is_nullable"] == "YES",
-                default_value=row["column_default"],
-                max_length=row["character_maximum_length"],
-                precision=row["numeric_precision"],
-                scale=row["numeric_scale"],
-                is_primary_key=row["is_primary_key"],
-                is_foreign_key=row["foreign_table_name"] is not None,
-                foreign_key_table=row["foreign_table_name"],
-                foreign_key_column=row["foreign_column_name"],
-                is_unique=row["is_unique"],
+                name=column_name,
+                data_type=self.normalize_data_type(udt_name),
+                raw_type=sys.intern(data_type),
+                nullable=nullable,
+                default_value=column_default,
+                max_length=max_length,
+                precision=precision,
+                scale=scale,
+                is_primary_key=is_primary_key,
+                is_foreign_key=foreign_table_name is not None,
+                foreign_key_table=foreign_table_name,
+                foreign_key_column=foreign_column_name,
+                is_unique=is_unique,
                 is_indexed=is_indexed,
-                comment=row["comment"]
+                comment=comment
             )
             
-            # Get data quality metrics
-            try:
-                await self._add_column_statistics(column, table_name, schema)
-            except Exception as e:
-                self.logger.warning(f"Failed to get statistics for column {column.name}: {e}")
-            
-            columns.append(column)
+            columns[table_name].append(column)
         
         return columns
     
-    async def _is_column_indexed(self, table_name: str, schema: str, column_name: str) -> bool:
-        """Check if a column is indexed."""
-        query = """
-            SELECT COUNT(*) > 0 as is_indexed
-            FROM pg_indexes 
-            WHERE schemaname = $1 AND tablename = $2 
-            AND indexdef LIKE '%' || $3 || '%'
+    async def _add_table_statistics(
+        self,
+        columns: List[ColumnInfo],
+        table_name: str,
+        schema: str,
+        relkind: str,
+        estimate: float,
+        relpages: int
+    ) -> None:
+        """Add data quality statistics to every column of a table in a single scan.
+        
+        Only relations known to be small are scanned: views and foreign tables
+        have no size to check, and a table without a planner estimate is only
+        scanned when its pages show it is tiny.
         """
+        if not columns:
+            return
+        
+        if relkind in _UNSIZED_RELKINDS:
+            self.logger.info(f"Skipping column statistics for {table_name}: views and foreign tables are not scanned")
+            return
+        
+        # Skip tables whose planner estimate (pg_class.reltuples) is too large to scan
+        if estimate > _STATISTICS_ROW_LIMIT:
+            self.logger.info(
+                f"Skipping column statistics for {table_name}: ~{int(estimate)} rows exceeds {_STATISTICS_ROW_LIMIT}"
+            )
+            return
+        
+        if estimate <= 0 and not (relkind in _EXACT_COUNT_RELKINDS and 0 <= relpages < _EXACT_COUNT_MAX_PAGES):
+            self.logger.info(f"Skipping column statistics for {table_name}: no row estimate, run ANALYZE first")
+            return
         
-        result = await self.connection.fetchval(query, schema, table_name, column_name)
-        return bool(result)
-    
-    async def _add_column_statistics(self, column: ColumnInfo, table_name: str, schema: str) -> None:
-        """Add data quality statistics to column info."""
         try:
-            # Get null count and unique count
-            stats_query = f'''
-                SELECT 
-                    COUNT(*) as total_count,
-                    COUNT("{column.name}") as non_null_count,
-                    COUNT(DISTINCT "{column.name}") as unique_count
-                FROM "{schema}"."{table_name}"
-            '''
-            
-            stats = await self.connection.fetchrow(stats_query)
-            
-            if stats:
-                total_count = stats["total_count"]
-                non_null_count = stats["non_null_count"]
-                
-                column.null_count = total_count - non_null_count
-                column.unique_count = stats["unique_count"]
+            async with self.pool.acquire() as conn:
+                relation = _relation(schema, table_name)
+                distinct_estimates = await self._get_distinct_estimates(conn, table_name, schema)
+                select_list = ["COUNT(*) AS total"]
+                for index, column in enumerate(columns):
+                    select_list.extend(self._column_statistics_expressions(
+                        index, column, count_distinct=column.name not in distinct_estimates
+                    ))
                 
-                # Get min/max/avg for numeric columns
-                if column.data_type in [DataType.INTEGER, DataType.BIGINT, DataType.DECIMAL, DataType.FLOAT, DataType.DOUBLE]:
-                    minmax_query = f'''
-                        SELECT 
-                            MIN("{column.name}") as min_val,
-                            MAX("{column.name}") as max_val,
-                            AVG("{column.name}") as avg_val
-                        FROM "{schema}"."{table_name}"
-                        WHERE "{column.name}" IS NOT NULL
-                    '''
-                    
-                    minmax = await self.connection.fetchrow(minmax_query)
-                    if minmax:
-                        column.min_value = minmax["min_val"]
-                        column.max_value = minmax["max_val"]
-                        column.avg_value = float(minmax["avg_val"]) if minmax["avg_val"] else None
+                try:
+                    stats_query = f"SELECT {', '.join(select_list)} FROM {relation}"
+                    stats = await (await _prepare_once(conn, stats_query)).fetchrow()
+                    if stats:
+                        for index, column in enumerate(columns):
+                            self._apply_column_statistics(column, index, stats, distinct_estimates.get(column.name))
+                except Exception as e:
+                    # A single column without equality/ordering support (e.g. json) fails
+                    # the combined query, so fall back to one query per column.
+                    self.logger.warning(f"Batched statistics failed for {table_name}, retrying per column: {e}")
+                    for column in columns:
+                        n_distinct = distinct_estimates.get(column.name)
+                        try:
+                            expressions = ", ".join([
+                                "COUNT(*) AS total",
+                                *self._column_statistics_expressions(0, column, count_distinct=n_distinct is None),
+                            ])
+                            stats = await (await _prepare_once(conn, f"SELECT {expressions} FROM {relation}")).fetchrow()
+                            if stats:
+                                self._apply_column_statistics(column, 0, stats, n_distinct)
+                        except Exception as column_error:
+                            self.logger.warning(f"Failed to get statistics for column {column.name}: {column_error}")
                 
-                # Get sample values
+                sampled = [column for column in columns if column.null_count is not None]
+                if sampled:
+                    await self._add_sample_values(conn, sampled, relation, estimate)
+        
+        except Exception as e:
+            self.logger.warning(f"Failed to get statistics for table {table_name}: {e}")
+    
+    async def _get_distinct_estimates(self, conn: Connection, table_name: str, schema: str) -> Dict[str, float]:
+        """Get ANALYZE's distinct value estimates (pg_stats.n_distinct) per column.
+        
+        Columns never analyzed, or whose estimate is unknown (0, e.g. for types
+        without an equality operator), are left out.
+        """
+        query = """
+            SELECT DISTINCT ON (attname) attname, n_distinct
+            FROM pg_stats
+            WHERE schemaname = $1 AND tablename = $2 AND n_distinct <> 0
+            -- Prefer the statistics covering inheritance children, as scanned
+            ORDER BY attname, inherited DESC
+        """
+        try:
+            return {attname: n_distinct for attname, n_distinct in await conn.fetch(query, schema, table_name)}
+        except Exception as e:
+            self.logger.warning(f"Failed to read pg_stats for {table_name}: {e}")
+            return {}
+    
+    async def _add_sample_values(
+        self, conn: Connection, columns: List[ColumnInfo], relation: str, estimate: Optional[float]
+    ) -> None:
+        """Collect distinct sample values for columns from one bounded scan.
+        
+        Values are aggregated with array_agg over at most ``_SAMPLE_SCAN_ROWS``
+        rows, block-sampled with TABLESAMPLE SYSTEM on larger tables, instead
+        of a full DISTINCT sort per column. Array columns (array_agg cannot
+        mix their dimensions) and a failed batch fall back to one query per
+        column over the same rows.
+        """
+        source = relation
+        if estimate and estimate > 2 * _SAMPLE_SCAN_ROWS:
+            # Expect about twice the rows needed, so the LIMIT is usually reached
+            percent = 100 * 2 * _SAMPLE_SCAN_ROWS / estimate
+            source += f" TABLESAMPLE SYSTEM ({percent:.6f})"
+        source = f"(SELECT * FROM {source} LIMIT {_SAMPLE_SCAN_ROWS}) s"
+        
+        batched = [column for column in columns if column.data_type != DataType.ARRAY]
+        remaining = [column for column in columns if column.data_type == DataType.ARRAY]
+        
+        if batched:
+            select_list = []
+            for index, column in enumerate(batched):
+                expression = self._sample_value_expression(column)
+                select_list.append(
+                    f"array_agg(DISTINCT {expression} ORDER BY {expression}) "
+                    f"FILTER (WHERE {_quote_ident(column.name)} IS NOT NULL) AS sv_{index}"
+                )
+            try:
+                sample_query = f"SELECT {', '.join(select_list)} FROM {source}"
+                samples = await (await _prepare_once(conn, sample_query)).fetchrow()
+                for column, values in zip(batched, samples):
+                    column.sample_values = tuple(values[:_SAMPLE_VALUES_LIMIT]) if values else ()
+            except Exception as e:
+                self.logger.warning(f"Batched sample values failed for {relation}, retrying per column: {e}")
+                remaining = columns
+        
+        for column in remaining:
+            try:
                 sample_query = f'''
-                    SELECT DISTINCT "{column.name}" 
-                    FROM "{schema}"."{table_name}" 
-                    WHERE "{column.name}" IS NOT NULL 
-                    ORDER BY "{column.name}" 
-                    LIMIT 10
+                    SELECT DISTINCT {self._sample_value_expression(column)} 
+                    FROM {source} 
+                    WHERE {_quote_ident(column.name)} IS NOT NULL 
+                    ORDER BY 1 
+                    LIMIT $1
                 '''
-                
-                sample_rows = await self.connection.fetch(sample_query)
-                column.sample_values = [row[0] for row in sample_rows]
-                
-        except Exception as e:
-            self.logger.warning(f"Failed to get column statistics: {e}")
+                sample_rows = await (await _prepare_once(conn, sample_query)).fetch(_SAMPLE_VALUES_LIMIT)
+                column.sample_values = tuple(row[0] for row in sample_rows)
+            except Exception as e:
+                self.logger.warning(f"Failed to get sample values for column {column.name}: {e}")
+    
+    @staticmethod
+    def _column_statistics_expressions(index: int, column: ColumnInfo, count_distinct: bool = True) -> List[str]:
+        """Build the aggregate select expressions for one column's statistics."""
+        quoted = _quote_ident(column.name)
+        expressions = [f"COUNT({quoted}) AS nn_{index}"]
+        if count_distinct:
+            expressions.append(f"COUNT(DISTINCT {quoted}) AS uq_{index}")
+        if column.data_type in _NUMERIC_STATISTICS_TYPES:
+            expressions.extend([
+                f"MIN({quoted}) AS mn_{index}",
+                f"MAX({quoted}) AS mx_{index}",
+                f"AVG({quoted})::float8 AS av_{index}",
+            ])
+        return expressions
     
-    async def _get_constraints(self, table_name: str, schema: str) -> List[ConstraintInfo]:
-        """Get constraint information for a table."""
+    @staticmethod
+    def _sample_value_expression(column: ColumnInfo) -> str:
+        """Build the select expression for a column's sample values.
+        
+        Text-like values are cut to ``_SAMPLE_VALUE_MAX_CHARS`` and binary values
+        are summarised as size and md5, so wide values never leave the server.
+        """
+        quoted = _quote_ident(column.name)
+        if column.data_type in _TEXT_SAMPLE_TYPES:
+            return f"LEFT(CAST({quoted} AS text), {_SAMPLE_VALUE_MAX_CHARS})"
+        if column.data_type in _BINARY_SAMPLE_TYPES:
+            return f"format('<binary data: %s bytes, md5 %s>', octet_length({quoted}), md5({quoted}))"
+        return quoted
+    
+    @staticmethod
+    def _apply_column_statistics(
+        column: ColumnInfo, index: int, stats: asyncpg.Record, n_distinct: Optional[float] = None
+    ) -> None:
+        """Copy one column's aggregates from a statistics row onto the column.
+        
+        With a pg_stats ``n_distinct`` estimate the unique count is derived from
+        it: positive values are absolute counts, negative ones a fraction of rows.
+        """
+        column.null_count = stats["total"] - stats[f"nn_{index}"]
+        if n_distinct is None:
+            column.unique_count = stats[f"uq_{index}"]
+        elif n_distinct > 0:
+            column.unique_count = int(n_distinct)
+        else:
+            column.unique_count = round(-n_distinct * stats["total"])
+        if column.data_type in _NUMERIC_STATISTICS_TYPES:
+            column.min_value = stats[f"mn_{index}"]
+            column.max_value = stats[f"mx_{index}"]
+            column.avg_value = stats[f"av_{index}"]
+    
+    async def _get_all_constraints(self, schema: str) -> Dict[str, List[ConstraintInfo]]:
+        """Get constraint information for every table in a schema, keyed by table name."""
         query = """
             SELECT 
-                tc.constraint_name,
-                tc.constraint_type,
-                array_agg(kcu.column_name ORDER BY kcu.ordinal_position) as columns,
-                ccu.table_name as referenced_table,
-                array_agg(ccu.column_name ORDER BY kcu.ordinal_position) as referenced_columns,
-                rc.check_clause
-            FROM information_schema.table_constraints tc
-            LEFT JOIN information_schema.key_column_usage kcu 
-                ON tc.constraint_name = kcu.constraint_name
-                AND tc.table_schema = kcu.table_schema
-            LEFT JOIN information_schema.constraint_column_usage ccu
-                ON tc.constraint_name = ccu.constraint_name
-                AND tc.table_schema = ccu.table_schema
-            LEFT JOIN information_schema.check_constraints rc
-                ON tc.constraint_name = rc.constraint_name
-                AND tc.table_schema = rc.constraint_schema
-            WHERE tc.table_name = $1 AND tc.table_schema = $2
-            GROUP BY tc.constraint_name, tc.constraint_type, ccu.table_name, rc.check_clause
-            ORDER BY tc.constraint_type, tc.constraint_name
+                c.relname AS table_name,
+                con.conname AS constraint_name,
+                CASE con.contype
+                    WHEN 'p' THEN 'PRIMARY KEY'
+                    WHEN 'f' THEN 'FOREIGN KEY'
+                    WHEN 'u' THEN 'UNIQUE'
+                    ELSE 'CHECK'
+                END AS constraint_type,
+                ARRAY(
+                    SELECT a.attname
+                    FROM unnest(con.conkey) WITH ORDINALITY AS k(attnum, ord)
+                    JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
+                    ORDER BY k.ord
+                ) AS columns,
+                fc.relname AS referenced_table,
+                CASE WHEN con.contype = 'f' THEN ARRAY(
+                    SELECT a.attname
+                    FROM unnest(con.confkey) WITH ORDINALITY AS k(attnum, ord)
+                    JOIN pg_attribute a ON a.attrelid = con.confrelid AND a.attnum = k.attnum
+                    ORDER BY k.ord
+                ) END AS referenced_columns,
+                -- Strip the leading "CHECK " keyword from the definition
+                CASE WHEN con.contype = 'c' THEN substring(pg_get_constraintdef(con.oid) FROM 7) END AS check_clause
+            FROM pg_constraint con
+            JOIN pg_class c ON c.oid = con.conrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            LEFT JOIN pg_class fc ON fc.oid = con.confrelid
+            WHERE n.nspname = $1
+            AND con.contype IN ('p', 'f', 'u', 'c')
+            ORDER BY table_name, constraint_type, constraint_name
         """
         
-        rows = await self.connection.fetch(query, table_name, schema)
-        constraints = []
+        rows = await self.pool.fetch(query, schema)
+        constraints = defaultdict(list)
         
-        for row in rows:
+        for (
+            table_name, constraint_name, constraint_type, constraint_columns,
+            referenced_table, referenced_columns, check_clause,
+        ) in rows:
             constraint = ConstraintInfo(
-                name=row["constraint_name"],
-                type=row["constraint_type"],
-                columns=list(row["columns"]) if row["columns"] else [],
-                referenced_table=row["referenced_table"],
-                referenced_columns=list(row["referenced_columns"]) if row["referenced_columns"] else None,
-                definition=row["check_clause"]
+                name=constraint_name,
+                type=sys.intern(constraint_type),
+                columns=list(constraint_columns) if constraint_columns else [],
+                referenced_table=referenced_table,
+                referenced_columns=list(referenced_columns) if referenced_columns else None,
+                definition=check_clause
             )
-            constraints.append(constraint)
+            constraints[table_name].append(constraint)
         
         return constraints
     
-    async def _get_indexes(self, table_name: str, schema: str) -> List[IndexInfo]:
-        """Get index information for a table."""
+    async def _get_all_indexes(self, schema: str) -> Dict[str, List[IndexInfo]]:
+        """Get index information for every table in a schema, keyed by table name."""
         query = """
             SELECT 
-                indexname as name,
-                indexdef as definition,
-                array_agg(attname ORDER BY attnum) as columns
-            FROM pg_indexes
-            LEFT JOIN pg_class ON pg_class.relname = indexname
-            LEFT JOIN pg_index ON pg_index.indexrelid = pg_class.oid
-            LEFT JOIN pg_attribute ON pg_attribute.attrelid = pg_index.indrelid 
-                AND pg_attribute.attnum = ANY(pg_index.indkey)
-            WHERE schemaname = $1 AND tablename = $2
-            GROUP BY indexname, indexdef
-            ORDER BY indexname
+                t.relname AS table_name,
+                ic.relname AS name,
+                pg_get_indexdef(i.indexrelid) AS definition,
+                am.amname AS index_type,
+                i.indisunique AS is_unique,
+                i.indisprimary AS is_primary,
+                ARRAY(
+                    SELECT a.attname
+                    FROM pg_attribute a
+                    WHERE a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+                    ORDER BY a.attnum
+                ) AS columns
+            FROM pg_index i
+            JOIN pg_class ic ON ic.oid = i.indexrelid
+            JOIN pg_am am ON am.oid = ic.relam
+            JOIN pg_class t ON t.oid = i.indrelid
+            JOIN pg_namespace n ON n.oid = t.relnamespace
+            WHERE n.nspname = $1
+            ORDER BY t.relname, ic.relname
         """
         
-        rows = await self.connection.fetch(query, schema, table_name)
-        indexes = []
+        rows = await self.pool.fetch(query, schema)
+        indexes = defaultdict(list)
         
-        for row in rows:
-            # Parse index properties from definition
-            definition = row["definition"] or ""
-            is_unique = "UNIQUE" in definition
-            is_primary = "PRIMARY KEY" in definition
-            
-            # Determine index type
-            index_type = "btree"  # Default
-            if "USING gin" in definition.lower():
-                index_type = "gin"
-            elif "USING gist" in definition.lower():
-                index_type = "gist"
-            elif "USING hash" in definition.lower():
-                index_type = "hash"
-            
+        for (
+            table_name, index_name, definition, index_type, is_unique, is_primary, index_columns,
+        ) in rows:
             index = IndexInfo(
-                name=row["name"],
-                columns=list(row["columns"]) if row["columns"] else [],
+                name=index_name,
+                columns=list(index_columns) if index_columns else [],
                 is_unique=is_unique,
                 is_primary=is_primary,
-                type=index_type,
+                type=sys.intern(index_type),
                 definition=definition
             )
-            indexes.append(index)
+            indexes[table_name].append(index)
         
         return indexes
     
     async def get_sample_data(self, table_name: str, schema: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
         """Get sample data from a table."""
-        schema = schema or self.config["schema"]
+        return [row async for row in self.iter_sample_data(table_name, schema=schema, limit=limit)]
+    
+    async def iter_sample_data(
+        self, table_name: str, schema: Optional[str] = None, limit: int = 100
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Yield sample rows from a table as they are fetched.
         
-        query = f'SELECT * FROM "{schema}"."{table_name}" LIMIT $1'
+        Rows are streamed through a server-side cursor, so only ``prefetch``
+        rows are buffered in the driver at a time however large ``limit`` is,
+        and callers that stop early never fetch the rest.
+        """
+        async for row in self._iter_sample_records(table_name, schema, limit):
+            # Convert special types to JSON-serializable formats
+            yield {key: _sample_value(value) for key, value in row.items()}
+    
+    async def get_sample_data_json(self, table_name: str, schema: Optional[str] = None, limit: int = 100) -> bytes:
+        """Get sample data from a table serialized as a JSON array of objects.
         
-        rows = await self.connection.fetch(query, limit)
+        Records are encoded directly, so only cells the json module cannot
+        serialize natively (dates, binary data, decimals, ...) are converted.
+        """
+        rows = [dict(row) async for row in self._iter_sample_records(table_name, schema, limit)]
+        return json.dumps(rows, default=_json_default, separators=(",", ":")).encode()
+    
+    async def _iter_sample_records(
+        self, table_name: str, schema: Optional[str], limit: int
+    ) -> AsyncGenerator[asyncpg.Record, None]:
+        """Stream raw sample records from a table through a server-side cursor."""
+        schema = schema or self.config["schema"]
         
-        # Convert rows to dictionaries
-        sample_data = []
-        for row in rows:
-            row_dict = {}
-            for key, value in row.items():
-                # Convert special types to JSON-serializable formats
-                if hasattr(value, 'isoformat'):  # datetime objects
-                    row_dict[key] = value.isoformat()
-                elif isinstance(value, (bytes, bytearray)):  # binary data
-                    row_dict[key] = f"<binary data: {len(value)} bytes>"
-                else:
-                    row_dict[key] = value
-            sample_data.append(row_dict)
+        query = f"SELECT * FROM {_relation(schema, table_name)} LIMIT $1"
         
-        return sample_data
+        async with self.pool.acquire() as conn:
+            statement = await _prepare_once(conn, query)
+            async with conn.transaction(readonly=True):
+                async for row in statement.cursor(limit, prefetch=_SAMPLE_DATA_PREFETCH):
+                    yield row
     
     def normalize_data_type(self, raw_type: str) -> DataType:
-        """Convert PostgreSQL type to standard DataType."""
-        type_mapping = {
-            # Integer types
-            "int2": DataType.SMALLINT,
-            "int4": DataType.INTEGER,
-            "int8": DataType.BIGINT,
-            "smallint": DataType.SMALLINT,
-            "integer": DataType.INTEGER,
-            "bigint": DataType.BIGINT,
-            
-            # Numeric types
-            "numeric": DataType.NUMERIC,
-            "decimal": DataType.DECIMAL,
-            "real": DataType.REAL,
-            "float4": DataType.REAL,
-            "float8": DataType.DOUBLE,
-            "double": DataType.DOUBLE,
-            
-            # String types
-            "varchar": DataType.VARCHAR,
-            "char": DataType.CHAR,
-            "text": DataType.TEXT,
-            "bpchar": DataType.CHAR,
-            
-            # Date/time types
-            "date": DataType.DATE,
-            "time": DataType.TIME,
-            "timestamp": DataType.TIMESTAMP,
-            "timestamptz": DataType.TIMESTAMPTZ,
-            "interval": DataType.INTERVAL,
-            
-            # Boolean
-            "bool": DataType.BOOLEAN,
-            "boolean": DataType.BOOLEAN,
-            
-            # Binary
-            "bytea": DataType.BINARY,
-            
-            # JSON
-            "json": DataType.JSON,
-            "jsonb": DataType.JSONB,
-            
-            # UUID
-            "uuid": DataType.UUID,
-            
-            # Array
-            "_int4": DataType.ARRAY,
-            "_text": DataType.ARRAY,
-            "_varchar": DataType.ARRAY,
-        }
+        """Convert PostgreSQL type to standard DataType.
         
+        ``raw_type`` is a ``pg_type.typname``, which the catalog stores in
+        lower case, so it is looked up as-is.
+        """
         # Handle array types
         if raw_type.startswith("_"):
             return DataType.ARRAY
         
-        return type_mapping.get(raw_type.lower(), DataType.UNKNOWN)
\ No newline at end of file
+        return _TYPE_MAPPING.get(raw_type, DataType.UNKNOWN)
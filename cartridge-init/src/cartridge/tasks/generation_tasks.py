@@ -1,12 +1,12 @@
 """Background tasks for dbt model generation."""
 
-from typing import Dict, Any, List
-import uuid
+from typing import Dict, Any
 import asyncio
 import tempfile
 import os
 
 from cartridge.tasks.celery_app import celery_app
+from cartridge.tasks.progress import ProgressReporter
 from cartridge.ai.factory import AIProviderFactory
 from cartridge.ai.base import ModelGenerationRequest, ModelType, TableMapping, ColumnMapping
 from cartridge.dbt.project_generator import DBTProjectGenerator
@@ -39,10 +39,8 @@ def generate_dbt_models(
     
     try:
         # Update task status
-        self.update_state(
-            state="PROGRESS",
-            meta={"current": 0, "total": 100, "status": "Analyzing schema..."}
-        )
+        progress = ProgressReporter(self)
+        progress.update(0, "Analyzing schema...")
         
         # Convert schema data to AI-friendly format
         tables = []
@@ -97,10 +95,7 @@ def generate_dbt_models(
             relationships=schema_data.get("relationships")
         )
         
-        self.update_state(
-            state="PROGRESS",
-            meta={"current": 20, "total": 100, "status": "Generating models with AI..."}
-        )
+        progress.update(20, "Generating models with AI...")
         
         # Run AI generation in async context
         async def run_generation():
@@ -117,10 +112,7 @@ def generate_dbt_models(
         # Execute AI generation
         generation_result = asyncio.run(run_generation())
         
-        self.update_state(
-            state="PROGRESS",
-            meta={"current": 70, "total": 100, "status": "Creating dbt project..."}
-        )
+        progress.update(70, "Creating dbt project...")
         
         # Generate dbt project
         project_name = generation_config.get("project_name", f"cartridge_project_{project_id[:8]}")
@@ -139,10 +131,7 @@ def generate_dbt_models(
                 connection_config=generation_config.get("connection_config")
             )
             
-            self.update_state(
-                state="PROGRESS",
-                meta={"current": 90, "total": 100, "status": "Creating project archive..."}
-            )
+            progress.update(90, "Creating project archive...")
             
             # Create archive
             archive_path = dbt_generator.create_project_archive(project_path)
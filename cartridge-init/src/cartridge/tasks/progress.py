@@ -0,0 +1,45 @@
+"""Rate-limited progress reporting for background tasks."""
+
+import time
+from typing import Optional
+
+from celery import Task
+
+# Minimum seconds between progress writes to the result backend
+PROGRESS_MIN_INTERVAL_SECONDS = 0.5
+
+
+class ProgressReporter:
+    """Report a task's progress through update_state, at most every half second.
+    
+    Every update is a write to the result backend, so intermediate steps that
+    arrive faster than clients poll are dropped. The first update and the
+    final one (current == total) are always written.
+    
+    The task id is captured up front, so the reporter can also be used from
+    the worker's event loop thread, which does not see the task's request.
+    """
+    
+    def __init__(self, task: Task, total: int = 100):
+        """Initialize reporter for the currently executing task."""
+        self.task = task
+        self.task_id = task.request.id
+        self.total = total
+        self._last_sent: Optional[float] = None
+    
+    def update(self, current: int, status: str) -> None:
+        """Record progress, skipping the write if the last one was too recent."""
+        now = time.monotonic()
+        if (
+            current < self.total
+            and self._last_sent is not None
+            and now - self._last_sent < PROGRESS_MIN_INTERVAL_SECONDS
+        ):
+            return
+        
+        self._last_sent = now
+        self.task.update_state(
+            task_id=self.task_id,
+            state="PROGRESS",
+            meta={"current": current, "total": self.total, "status": status}
+        )
@@ -1,16 +1,263 @@
 """Background tasks for schema scanning."""
 
-from typing import Dict, Any
-import uuid
+from typing import AsyncIterator, Awaitable, Dict, Any, List, Tuple, TypeVar
 import asyncio
+import hashlib
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from operator import attrgetter
+from types import SimpleNamespace
+
+import orjson
+from celery.signals import worker_process_init, worker_process_shutdown
+
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
 
 from cartridge.tasks.celery_app import celery_app
+from cartridge.tasks.progress import ProgressReporter
 from cartridge.scanner.factory import ConnectorFactory
-from cartridge.scanner.base import SchemaAnalyzer
+from cartridge.scanner.base import DatabaseConnector, SchemaAnalyzer, TableInfo
 from cartridge.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
+# Connectors are reused for this long, after which they are closed and
+# recreated so changed credentials are picked up
+_CONNECTOR_TTL_SECONDS = 300.0
+
+# Config fields that identify the database a cached connector talks to; scan
+# options such as tables and sample_size are left out, so scans of the same
+# database share one connector
+_CONNECTION_FIELDS = ("type", "host", "port", "database", "username", "password", "schema")
+
+# Seconds to wait for cached connectors to close when a worker process exits
+_SHUTDOWN_TIMEOUT_SECONDS = 10.0
+
+# Each worker process runs one event loop in a background thread, plus the
+# connectors (and their pools) bound to it, so they outlive individual tasks
+_worker_state = SimpleNamespace(loop=None, pid=None, connectors={})
+
+
+@dataclass(slots=True)
+class _CachedConnector:
+    """A connector in the worker's cache, with the number of tasks using it."""
+    
+    connector: DatabaseConnector
+    created_at: float
+    users: int = 0
+    # Dropped from the cache (expired or discarded); closed by its last user
+    retired: bool = False
+
+_worker_state_lock = threading.Lock()
+
+# Fields copied as-is into the serialized scan result, in output order
+_DATABASE_INFO_FIELDS = (
+    "database_type", "version", "host", "port", "database_name", "schema_name",
+    "total_tables", "total_views", "total_size_bytes",
+)
+_TABLE_FIELDS = ("name", "schema", "table_type", "row_count", "size_bytes", "comment")
+_COLUMN_FIELDS = (
+    "name", "data_type", "raw_type", "nullable", "default_value", "max_length", "precision", "scale",
+    "is_primary_key", "is_foreign_key", "foreign_key_table", "foreign_key_column", "is_unique",
+    "is_indexed", "comment", "null_count", "unique_count", "min_value", "max_value", "avg_value",
+    "sample_values",
+)
+_CONSTRAINT_FIELDS = ("name", "type", "columns", "referenced_table", "referenced_columns", "definition")
+_INDEX_FIELDS = ("name", "columns", "is_unique", "is_primary", "type", "definition")
+
+# Each getter fetches all of an object's fields in one call
+_get_database_info_fields = attrgetter(*_DATABASE_INFO_FIELDS)
+_get_table_fields = attrgetter(*_TABLE_FIELDS)
+_get_column_fields = attrgetter(*_COLUMN_FIELDS)
+_get_constraint_fields = attrgetter(*_CONSTRAINT_FIELDS)
+_get_index_fields = attrgetter(*_INDEX_FIELDS)
+
+
+def _worker_loop() -> asyncio.AbstractEventLoop:
+    """Return this process's event loop, starting it (uvloop when available) on first use.
+    
+    The loop runs forever in a daemon thread, so pool housekeeping such as
+    closing idle connections carries on between tasks. A loop inherited
+    through fork has no thread behind it and is replaced.
+    
+    On Python 3.12+ tasks start eagerly, so coroutines that finish without
+    suspending (cached metadata, warm pool) skip a trip through the loop.
+    """
+    with _worker_state_lock:
+        loop = _worker_state.loop
+        if loop is None or loop.is_closed() or _worker_state.pid != os.getpid():
+            loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+            eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+            if eager_task_factory is not None:
+                loop.set_task_factory(eager_task_factory)
+            threading.Thread(target=_serve_loop, args=(loop,), name="cartridge-event-loop", daemon=True).start()
+            _worker_state.loop = loop
+            _worker_state.pid = os.getpid()
+            _worker_state.connectors = {}
+        return loop
+
+
+def _serve_loop(loop: asyncio.AbstractEventLoop) -> None:
+    """Run a loop until it is stopped, then close it."""
+    try:
+        loop.run_forever()
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+def _run_async(coro: Awaitable[T]) -> T:
+    """Run a coroutine to completion on the worker process's event loop.
+    
+    Blocks the calling thread until the coroutine finishes. Connection pools
+    opened by one task stay open for the next. If the wait is interrupted
+    (soft time limit, revoke, KeyboardInterrupt) the coroutine is cancelled,
+    so it does not keep using the shared loop and connectors after the task.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, _worker_loop())
+    try:
+        return future.result()
+    except BaseException:
+        future.cancel()
+        raise
+
+
+def _stop_worker_loop() -> None:
+    """Close cached connectors and stop this process's event loop, if running."""
+    with _worker_state_lock:
+        loop = _worker_state.loop
+        if loop is None or loop.is_closed() or _worker_state.pid != os.getpid():
+            return
+        _worker_state.loop = None
+    
+    async def close_connectors():
+        entries = list(_worker_state.connectors.values())
+        _worker_state.connectors.clear()
+        for entry in entries:
+            await _close_connector(entry.connector)
+    
+    try:
+        asyncio.run_coroutine_threadsafe(close_connectors(), loop).result(_SHUTDOWN_TIMEOUT_SECONDS)
+    except Exception as e:
+        logger.warning("Failed to close cached connectors", error=str(e))
+    loop.call_soon_threadsafe(loop.stop)
+
+
+@worker_process_init.connect
+def _start_worker_loop(**kwargs: Any) -> None:
+    """Start the event loop as each worker process starts, before its first task."""
+    _worker_loop()
+
+
+@worker_process_shutdown.connect
+def _shutdown_worker_loop(**kwargs: Any) -> None:
+    """Close pooled connections as each worker process exits."""
+    _stop_worker_loop()
+
+
+def _connector_key(connection_config: Dict[str, Any]) -> bytes:
+    """Fingerprint the connection fields of a config, ignoring scan options."""
+    return hashlib.blake2b(
+        orjson.dumps([connection_config.get(field) for field in _CONNECTION_FIELDS], default=str),
+        digest_size=16
+    ).digest()
+
+
+@asynccontextmanager
+async def _use_connector(connection_config: Dict[str, Any]) -> AsyncIterator[DatabaseConnector]:
+    """Use the cached connector for a connection config, creating it if needed.
+    
+    Must run on the worker loop. Tasks running concurrently on the loop share
+    the connector, so each one counts as a user while inside the block.
+    Connectors older than _CONNECTOR_TTL_SECONDS are dropped from the cache
+    first, but a dropped connector is only disconnected once its last user
+    is done, so no task has the pool closed under it.
+    """
+    connectors: Dict[bytes, _CachedConnector] = _worker_state.connectors
+    now = time.monotonic()
+    
+    for key, entry in list(connectors.items()):
+        if now - entry.created_at >= _CONNECTOR_TTL_SECONDS:
+            del connectors[key]
+            await _retire_connector(entry)
+    
+    key = _connector_key(connection_config)
+    entry = connectors.get(key)
+    if entry is None:
+        entry = _CachedConnector(ConnectorFactory.create_connector(connection_config["type"], connection_config), now)
+        connectors[key] = entry
+    
+    entry.users += 1
+    try:
+        yield entry.connector
+    finally:
+        entry.users -= 1
+        if entry.retired and not entry.users:
+            await _close_connector(entry.connector)
+
+
+async def _discard_connector(connection_config: Dict[str, Any], connector: DatabaseConnector) -> None:
+    """Drop a failed connector from the cache, disconnecting it once no task uses it.
+    
+    A newer connector cached for the same config since is left alone.
+    """
+    key = _connector_key(connection_config)
+    entry = _worker_state.connectors.get(key)
+    if entry is not None and entry.connector is connector:
+        del _worker_state.connectors[key]
+        await _retire_connector(entry)
+
+
+async def _retire_connector(entry: _CachedConnector) -> None:
+    """Mark a connector dropped from the cache, disconnecting it now if unused."""
+    entry.retired = True
+    if not entry.users:
+        await _close_connector(entry.connector)
+
+
+async def _close_connector(connector: DatabaseConnector) -> None:
+    """Disconnect a connector that is being dropped from the cache."""
+    try:
+        await connector.disconnect()
+    except Exception as e:
+        logger.warning("Failed to close cached connector", error=str(e))
+
+
+def _table_to_dict(table: TableInfo) -> Dict[str, Any]:
+    """Serialize a scanned table with its columns, constraints and indexes."""
+    table_data = dict(zip(_TABLE_FIELDS, _get_table_fields(table)))
+    # data_type stays a DataType; the result serializer encodes it as its value
+    table_data["columns"] = [dict(zip(_COLUMN_FIELDS, _get_column_fields(column))) for column in table.columns]
+    table_data["constraints"] = [
+        dict(zip(_CONSTRAINT_FIELDS, _get_constraint_fields(constraint))) for constraint in table.constraints
+    ]
+    table_data["indexes"] = [dict(zip(_INDEX_FIELDS, _get_index_fields(index))) for index in table.indexes]
+    table_data["sample_data"] = table.sample_data
+    table_data["primary_key_columns"] = table.get_primary_key_columns()
+    table_data["foreign_key_relationships"] = table.get_foreign_key_relationships()
+    return table_data
+
+
+def _serialize_tables(tables: List[TableInfo]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Serialize a batch of scanned tables and collect their relationships.
+    
+    Pure Python with no I/O, so it can run in an executor thread.
+    """
+    tables_data = []
+    relationships = []
+    for table in tables:
+        tables_data.append(_table_to_dict(table))
+        relationships.extend(table.get_relationships())
+    return tables_data, relationships
+
 
 @celery_app.task(bind=True)
 def scan_database_schema(self, scan_result_id: str, connection_config: Dict[str, Any]) -> Dict[str, Any]:
@@ -27,146 +274,100 @@ def scan_database_schema(self, scan_result_id: str, connection_config: Dict[str,
     logger.info("Starting database schema scan", scan_result_id=scan_result_id)
     
     try:
-        # Update task status
-        self.update_state(
-            state="PROGRESS",
-            meta={"current": 0, "total": 100, "status": "Connecting to database..."}
-        )
-        
-        # Create database connector
-        connector = ConnectorFactory.create_connector(
-            connection_config["type"], 
-            connection_config
-        )
+        # Update task status; the reporter also works from other threads,
+        # which do not see this task's request context
+        progress = ProgressReporter(self)
+        progress.update(0, "Connecting to database...")
         
         # Run schema scan in async context
         async def run_scan():
-            self.update_state(
-                state="PROGRESS",
-                meta={"current": 20, "total": 100, "status": "Scanning schema..."}
-            )
-            
-            # Perform the actual schema scan
-            scan_result = await connector.scan_schema(
-                tables=connection_config.get("tables"),
-                include_sample_data=connection_config.get("include_samples", True),
-                sample_size=connection_config.get("sample_size", 100)
-            )
+            loop = asyncio.get_running_loop()
             
-            self.update_state(
-                state="PROGRESS",
-                meta={"current": 80, "total": 100, "status": "Analyzing schema..."}
-            )
+            async def report(current: int, status: str) -> None:
+                # update_state blocks on the result backend, so keep it off
+                # the loop that other tasks' coroutines share
+                await loop.run_in_executor(None, progress.update, current, status)
             
-            # Analyze the schema for insights
-            analyzer = SchemaAnalyzer(scan_result)
+            await report(20, "Scanning schema...")
             
-            # Get analysis results
-            fact_tables = analyzer.detect_fact_tables()
-            dimension_tables = analyzer.detect_dimension_tables()
-            bridge_tables = analyzer.detect_bridge_tables()
-            staging_models = analyzer.suggest_staging_models()
-            mart_models = analyzer.suggest_mart_models()
+            start_time = time.time()
+            analyzer = SchemaAnalyzer()
+            database_info = None
+            serialized_batches = []
+            errors = []
+            total_tables = 0
+            total_views = 0
             
-            self.update_state(
-                state="PROGRESS",
-                meta={"current": 100, "total": 100, "status": "Completing scan..."}
-            )
+            # Get (or reuse) the database connector; a concurrent scan of the
+            # same database shares it, and neither closes it under the other
+            async with _use_connector(connection_config) as connector:
+                # Serialize and analyze each batch as it arrives, so scanned
+                # tables are not all held in memory until the scan finishes.
+                # Serialization runs in an executor thread, overlapping with the
+                # scan of the next batch and keeping the loop free.
+                async for batch in connector.scan_schema_batched(
+                    tables=connection_config.get("tables"),
+                    include_sample_data=connection_config.get("include_samples", True),
+                    sample_size=connection_config.get("sample_size", 100),
+                    # The connector cache closes the pool once its TTL runs out
+                    keep_open=True
+                ):
+                    database_info = batch.database_info
+                    serialized_batches.append(loop.run_in_executor(None, _serialize_tables, batch.tables))
+                    for table in batch.tables:
+                        if table.table_type == "table":
+                            total_tables += 1
+                        elif table.table_type in ["view", "materialized_view"]:
+                            total_views += 1
+                    analyzer.feed(batch.tables)
+                    errors.extend(batch.errors)
+                    
+                    if batch.tables_total:
+                        await report(
+                            20 + 60 * batch.tables_scanned // batch.tables_total,
+                            f"Scanned {batch.tables_scanned} of {batch.tables_total} tables..."
+                        )
             
-            # Convert scan result to serializable format
             tables_data = []
-            for table in scan_result.tables:
-                table_data = {
-                    "name": table.name,
-                    "schema": table.schema,
-                    "table_type": table.table_type,
-                    "row_count": table.row_count,
-                    "size_bytes": table.size_bytes,
-                    "comment": table.comment,
-                    "columns": [
-                        {
-                            "name": col.name,
-                            "data_type": col.data_type.value,
-                            "raw_type": col.raw_type,
-                            "nullable": col.nullable,
-                            "default_value": col.default_value,
-                            "max_length": col.max_length,
-                            "precision": col.precision,
-                            "scale": col.scale,
-                            "is_primary_key": col.is_primary_key,
-                            "is_foreign_key": col.is_foreign_key,
-                            "foreign_key_table": col.foreign_key_table,
-                            "foreign_key_column": col.foreign_key_column,
-                            "is_unique": col.is_unique,
-                            "is_indexed": col.is_indexed,
-                            "comment": col.comment,
-                            "null_count": col.null_count,
-                            "unique_count": col.unique_count,
-                            "min_value": col.min_value,
-                            "max_value": col.max_value,
-                            "avg_value": col.avg_value,
-                            "sample_values": col.sample_values
-                        }
-                        for col in table.columns
-                    ],
-                    "constraints": [
-                        {
-                            "name": const.name,
-                            "type": const.type,
-                            "columns": const.columns,
-                            "referenced_table": const.referenced_table,
-                            "referenced_columns": const.referenced_columns,
-                            "definition": const.definition
-                        }
-                        for const in table.constraints
-                    ],
-                    "indexes": [
-                        {
-                            "name": idx.name,
-                            "columns": idx.columns,
-                            "is_unique": idx.is_unique,
-                            "is_primary": idx.is_primary,
-                            "type": idx.type,
-                            "definition": idx.definition
-                        }
-                        for idx in table.indexes
-                    ],
-                    "sample_data": table.sample_data,
-                    "primary_key_columns": table.get_primary_key_columns(),
-                    "foreign_key_relationships": table.get_foreign_key_relationships()
-                }
-                tables_data.append(table_data)
+            relationships = []
+            for batch_tables, batch_relationships in await asyncio.gather(*serialized_batches):
+                tables_data.extend(batch_tables)
+                relationships.extend(batch_relationships)
+            
+            # Update database info with actual counts
+            database_info.total_tables = total_tables
+            database_info.total_views = total_views
+            scan_duration = time.time() - start_time
+            
+            await report(80, "Analyzing schema...")
+            
+            # Get analysis results
+            analysis = analyzer.finalize()
+            
+            await report(100, "Completing scan...")
             
             return {
                 "scan_result_id": scan_result_id,
                 "status": "completed",
-                "database_info": {
-                    "database_type": scan_result.database_info.database_type,
-                    "version": scan_result.database_info.version,
-                    "host": scan_result.database_info.host,
-                    "port": scan_result.database_info.port,
-                    "database_name": scan_result.database_info.database_name,
-                    "schema_name": scan_result.database_info.schema_name,
-                    "total_tables": scan_result.database_info.total_tables,
-                    "total_views": scan_result.database_info.total_views,
-                    "total_size_bytes": scan_result.database_info.total_size_bytes
-                },
+                "database_info": dict(zip(
+                    _DATABASE_INFO_FIELDS, _get_database_info_fields(database_info)
+                )),
                 "tables": tables_data,
-                "relationships": scan_result.get_relationships(),
+                "relationships": relationships,
                 "analysis": {
-                    "fact_tables": fact_tables,
-                    "dimension_tables": dimension_tables,
-                    "bridge_tables": bridge_tables,
-                    "suggested_staging_models": staging_models,
-                    "suggested_mart_models": mart_models
+                    "fact_tables": analysis.fact_tables,
+                    "dimension_tables": analysis.dimension_tables,
+                    "bridge_tables": analysis.bridge_tables,
+                    "suggested_staging_models": analysis.staging_models,
+                    "suggested_mart_models": analysis.mart_models
                 },
-                "scan_duration_seconds": scan_result.scan_duration_seconds,
-                "scan_timestamp": scan_result.scan_timestamp,
-                "errors": scan_result.errors
+                "scan_duration_seconds": scan_duration,
+                "scan_timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "errors": errors if errors else None
             }
         
         # Run the async scan
-        result = asyncio.run(run_scan())
+        result = _run_async(run_scan())
         
         logger.info("Database schema scan completed", 
                    scan_result_id=scan_result_id,
@@ -200,29 +401,33 @@ def test_database_connection(self, connection_config: Dict[str, Any]) -> Dict[st
     logger.info("Testing database connection", database_type=connection_config.get("type"))
     
     try:
-        # Create database connector
-        connector = ConnectorFactory.create_connector(
-            connection_config["type"], 
-            connection_config
-        )
-        
         # Run connection test in async context
         async def run_test():
-            import time
-            start_time = time.time()
-            
-            result = await connector.test_connection()
-            
-            end_time = time.time()
-            response_time = int((end_time - start_time) * 1000)  # Convert to milliseconds
-            
-            if result["status"] == "success":
-                result["response_time_ms"] = response_time
-            
-            return result
+            # Get (or reuse) the database connector
+            async with _use_connector(connection_config) as connector:
+                start_time = time.time()
+                
+                try:
+                    # Keep the pool open afterwards, so testing the same database
+                    # again only costs a round trip
+                    await connector.connect()
+                    result = await connector.test_connection()
+                except Exception:
+                    await _discard_connector(connection_config, connector)
+                    raise
+                
+                end_time = time.time()
+                response_time = int((end_time - start_time) * 1000)  # Convert to milliseconds
+                
+                if result["status"] == "success":
+                    result["response_time_ms"] = response_time
+                else:
+                    await _discard_connector(connection_config, connector)
+                
+                return result
         
         # Run the async test
-        result = asyncio.run(run_test())
+        result = _run_async(run_test())
         
         if result["status"] == "success":
             logger.info("Database connection test successful")
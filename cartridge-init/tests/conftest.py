@@ -34,6 +34,12 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def current_event_loop(event_loop):
+    """Make the session loop current again; asyncio.run() in sync tests unsets it."""
+    asyncio.set_event_loop(event_loop)
+
+
 @pytest.fixture(scope="session")
 def engine():
     """Create test database engine."""
@@ -84,17 +90,23 @@ async def async_db_session(async_engine, setup_database) -> AsyncGenerator[Async
             await session.rollback()
 
 
+@pytest.fixture(scope="session")
+def app_client() -> Generator[TestClient, None, None]:
+    """Create one test client, and run app startup once, for the whole session."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
 @pytest.fixture
-def client(db_session) -> Generator[TestClient, None, None]:
-    """Create a test client with database session override."""
+def client(app_client, db_session) -> Generator[TestClient, None, None]:
+    """Shared test client with this test's database session override."""
     
     def get_test_db():
         yield db_session
     
     app.dependency_overrides[get_db] = get_test_db
     
-    with TestClient(app) as test_client:
-        yield test_client
+    yield app_client
     
     app.dependency_overrides.clear()
 
@@ -70,6 +70,24 @@ class TestAIProviderFactory:
         provider = AIProviderFactory.create_provider("unknown-model", config)
         
         assert isinstance(provider, OpenAIProvider)
+    
+    def test_supported_models_cached_until_registration(self, monkeypatch):
+        """Test the supported model list is reused until a provider is registered."""
+        from cartridge.ai.factory import MockAIProvider
+        
+        monkeypatch.setattr(AIProviderFactory, "_providers", dict(AIProviderFactory._providers))
+        AIProviderFactory.get_supported_models.cache_clear()
+        
+        models = AIProviderFactory.get_supported_models()
+        assert AIProviderFactory.get_supported_models() is models
+        
+        AIProviderFactory.register_provider(["New-Model"], MockAIProvider)
+        
+        assert "new-model" in AIProviderFactory.get_supported_models()
+        assert "new-model" not in models
+        
+        monkeypatch.undo()
+        AIProviderFactory.get_supported_models.cache_clear()
 
 
 class TestMockAIProvider:
@@ -29,6 +29,7 @@ class TestAppConfig:
         assert config.host == "0.0.0.0"
         assert config.port == 8000
         assert config.workers == 1
+        assert config.simulate_task_delays is True
     
     def test_environment_validation(self):
         """Test environment validation."""
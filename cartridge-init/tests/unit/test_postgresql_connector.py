@@ -0,0 +1,573 @@
+"""Tests for PostgreSQL database connector."""
+
+import pytest
+import asyncio
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from cartridge.scanner.postgresql import PostgreSQLConnector, _SchemaMetadata, _TABLE_RELKINDS
+from cartridge.scanner.base import DataType, ColumnInfo
+
+
+class TestPostgreSQLConnector:
+    """Test PostgreSQL database connector."""
+
+    @pytest.fixture
+    def postgres_config(self):
+        """PostgreSQL connection configuration for testing."""
+        return {
+            "host": "localhost",
+            "port": 5432,
+            "database": "test_db",
+            "username": "test_user",
+            "password": "test_password",
+            "schema": "public"
+        }
+
+    @pytest.fixture
+    def connection(self):
+        """Mocked pooled connection; one-off prepared statements run on it too."""
+        connection = AsyncMock()
+        connection.prepare.return_value = connection
+        return connection
+
+    @pytest.fixture
+    def connector(self, postgres_config, connection):
+        """Create PostgreSQL connector backed by a mocked pool."""
+        connector = PostgreSQLConnector(postgres_config)
+        connector.pool = MagicMock()
+        connector.pool.acquire.return_value.__aenter__.return_value = connection
+        connector.pool.fetch = connection.fetch
+        connector.pool.fetchrow = connection.fetchrow
+        connector.pool.fetchval = connection.fetchval
+        return connector
+
+    @pytest.fixture
+    def columns(self):
+        """Columns of a small orders table."""
+        return [
+            ColumnInfo(name="id", data_type=DataType.INTEGER, raw_type="integer", nullable=False),
+            ColumnInfo(name="status", data_type=DataType.VARCHAR, raw_type="character varying", nullable=True),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_connect_tunes_session(self, postgres_config, monkeypatch):
+        """Test scanner sessions are read-only, time-limited and skip JIT."""
+        create_pool = AsyncMock()
+        monkeypatch.setattr("cartridge.scanner.postgresql.asyncpg.create_pool", create_pool)
+
+        await PostgreSQLConnector(postgres_config).connect()
+
+        settings = create_pool.call_args.kwargs["server_settings"]
+        assert settings["application_name"] == "cartridge_scanner"
+        assert settings["default_transaction_read_only"] == "on"
+        assert settings["jit"] == "off"
+        assert settings["statement_timeout"] == "60s"
+
+    @pytest.mark.asyncio
+    async def test_test_connection_reuses_open_pool(self, connector, connection):
+        """Test an open pool is probed directly and left open."""
+        pool = connector.pool
+        pool.close = AsyncMock()
+        connection.fetchval.return_value = "PostgreSQL 16.2"
+
+        result = await connector.test_connection()
+
+        assert result["status"] == "success"
+        assert connection.fetchval.call_args.kwargs == {"timeout": 5.0}
+        pool.close.assert_not_awaited()
+        assert connector.pool is pool
+
+    @pytest.mark.asyncio
+    async def test_test_connection_closes_its_own_pool(self, postgres_config, monkeypatch):
+        """Test a pool opened just for the test is closed again."""
+        pool = MagicMock()
+        pool.fetchval = AsyncMock(return_value="PostgreSQL 16.2")
+        pool.close = AsyncMock()
+        create_pool = AsyncMock(return_value=pool)
+        monkeypatch.setattr("cartridge.scanner.postgresql.asyncpg.create_pool", create_pool)
+        connector = PostgreSQLConnector(postgres_config)
+
+        result = await connector.test_connection()
+        await connector.connect()
+        await connector.connect()
+
+        assert result["database_version"] == "PostgreSQL 16.2"
+        pool.close.assert_awaited_once()
+        assert create_pool.await_count == 2
+
+    @pytest.mark.parametrize("raw_type,expected", [
+        ("int4", DataType.INTEGER),
+        ("int8", DataType.BIGINT),
+        ("numeric", DataType.NUMERIC),
+        ("float8", DataType.DOUBLE),
+        ("bpchar", DataType.CHAR),
+        ("timestamptz", DataType.TIMESTAMPTZ),
+        ("jsonb", DataType.JSONB),
+        ("_numeric", DataType.ARRAY),
+        ("geometry", DataType.UNKNOWN),
+    ])
+    def test_normalize_data_type(self, connector, raw_type, expected):
+        """Test PostgreSQL type names map onto standard data types."""
+        assert connector.normalize_data_type(raw_type) == expected
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("relkind,estimate,relpages", [
+        ("r", 100.0, 1),
+        ("r", -1.0, 1),
+        ("m", 0.0, 0),
+        ("p", 100.0, 0),
+    ])
+    async def test_add_table_statistics_single_scan(self, connector, connection, columns, relkind, estimate, relpages):
+        """Test statistics for all columns come from one aggregate query."""
+        connection.fetchrow.side_effect = [
+            {
+                "total": 100,
+                "nn_0": 100, "uq_0": 100, "mn_0": 1, "mx_0": 100, "av_0": 50.5,
+                "nn_1": 90, "uq_1": 3,
+            },
+            ([1, 2], ["new", "shipped"]),
+        ]
+        connection.fetch.return_value = []
+
+        await connector._add_table_statistics(columns, "orders", "public", relkind, estimate, relpages)
+
+        assert connection.fetchrow.await_count == 2
+        assert "FROM pg_stats" in connection.fetch.call_args.args[0]
+        query, sample_query = [call.args[0] for call in connection.prepare.call_args_list]
+        assert query.count('FROM "public"."orders"') == 1
+        assert 'AVG("id")::float8 AS av_0' in query
+        assert 'MIN("status")' not in query
+        assert 'array_agg(DISTINCT "id" ORDER BY "id") FILTER (WHERE "id" IS NOT NULL) AS sv_0' in sample_query
+        assert 'FROM (SELECT * FROM "public"."orders" LIMIT 10000) s' in sample_query
+
+        id_column, status_column = columns
+        assert id_column.null_count == 0
+        assert id_column.unique_count == 100
+        assert (id_column.min_value, id_column.max_value, id_column.avg_value) == (1, 100, 50.5)
+        assert id_column.sample_values == (1, 2)
+        assert status_column.null_count == 10
+        assert status_column.unique_count == 3
+        assert status_column.min_value is None
+        assert status_column.sample_values == ("new", "shipped")
+
+    @pytest.mark.asyncio
+    async def test_add_table_statistics_quotes_identifiers(self, connector, connection):
+        """Test identifiers with quotes and spaces are escaped, not spliced raw."""
+        connection.fetchrow.side_effect = [{"total": 1, "nn_0": 1, "uq_0": 1}, (["x"],)]
+        columns = [ColumnInfo(name='Col "A"', data_type=DataType.TEXT, raw_type="text", nullable=True)]
+
+        await connector._add_table_statistics(columns, 'Mixed"; DROP TABLE t; --', "public", "r", 1.0, 1)
+
+        stats_query, sample_query = [call.args[0] for call in connection.prepare.call_args_list]
+        assert 'FROM "public"."Mixed""; DROP TABLE t; --"' in stats_query
+        assert 'COUNT("Col ""A""") AS nn_0' in stats_query
+        assert 'FILTER (WHERE "Col ""A""" IS NOT NULL)' in sample_query
+
+    @pytest.mark.asyncio
+    async def test_add_table_statistics_falls_back_per_column(self, connector, connection, columns):
+        """Test a failing combined query is retried one column at a time."""
+        connection.fetchrow.side_effect = [
+            Exception("could not identify an equality operator"),
+            {"total": 10, "nn_0": 10, "uq_0": 10, "mn_0": 1, "mx_0": 10, "av_0": 5.5},
+            Exception("could not identify an equality operator"),
+            ([1],),
+        ]
+        connection.fetch.return_value = []
+
+        await connector._add_table_statistics(columns, "orders", "public", "r", 10.0, 1)
+
+        assert connection.fetchrow.await_count == 4
+        assert columns[0].unique_count == 10
+        assert columns[0].sample_values == (1,)
+        assert columns[1].null_count is None
+        assert columns[1].sample_values is None
+        connection.fetch.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_add_table_statistics_uses_pg_stats_estimates(self, connector, connection, columns):
+        """Test analyzed columns take their unique count from pg_stats instead of COUNT(DISTINCT)."""
+        connection.fetch.return_value = [("id", -1.0), ("status", 3.0)]
+        connection.fetchrow.side_effect = [
+            {"total": 100, "nn_0": 100, "mn_0": 1, "mx_0": 100, "av_0": 50.5, "nn_1": 90},
+            ([1, 2], ["new", "shipped"]),
+        ]
+
+        await connector._add_table_statistics(columns, "orders", "public", "r", 100.0, 1)
+
+        stats_query = connection.prepare.call_args_list[0].args[0]
+        assert "COUNT(DISTINCT" not in stats_query
+        assert connection.fetch.call_args.args[1:] == ("public", "orders")
+        assert [column.unique_count for column in columns] == [100, 3]
+
+    @pytest.mark.asyncio
+    async def test_add_sample_values_samples_large_tables(self, connector, connection):
+        """Test large tables are block-sampled and array columns are sampled on their own."""
+        columns = [
+            ColumnInfo(name="id", data_type=DataType.INTEGER, raw_type="integer", nullable=False),
+            ColumnInfo(name="tags", data_type=DataType.ARRAY, raw_type="text[]", nullable=True),
+        ]
+        connection.fetchrow.return_value = (list(range(20)),)
+        connection.fetch.return_value = [(["a"],), (["a", "b"],)]
+
+        await connector._add_sample_values(connection, columns, '"public"."orders"', 1_000_000)
+
+        batch_query, array_query = [call.args[0] for call in connection.prepare.call_args_list]
+        assert '"public"."orders" TABLESAMPLE SYSTEM (2.000000) LIMIT 10000' in batch_query
+        assert '"tags"' not in batch_query
+        assert 'SELECT DISTINCT "tags"' in array_query
+        assert columns[0].sample_values == tuple(range(10))
+        assert columns[1].sample_values == (["a"], ["a", "b"])
+
+    @pytest.mark.asyncio
+    async def test_add_sample_values_falls_back_per_column(self, connector, connection, columns):
+        """Test a failing batched sample query is retried one column at a time."""
+        connection.fetchrow.side_effect = Exception("could not identify an equality operator")
+        connection.fetch.side_effect = [[(1,)], Exception("boom")]
+
+        await connector._add_sample_values(connection, columns, '"public"."orders"', 10.0)
+
+        assert connection.fetch.await_count == 2
+        assert columns[0].sample_values == (1,)
+        assert columns[1].sample_values is None
+
+    @pytest.mark.parametrize("data_type,expected", [
+        (DataType.INTEGER, '"v"'),
+        (DataType.CHAR, '"v"'),
+        (DataType.TEXT, 'LEFT(CAST("v" AS text), 256)'),
+        (DataType.JSONB, 'LEFT(CAST("v" AS text), 256)'),
+        (DataType.BINARY, "format('<binary data: %s bytes, md5 %s>', octet_length(\"v\"), md5(\"v\"))"),
+    ])
+    def test_sample_value_expression(self, connector, data_type, expected):
+        """Test wide sample values are truncated or digested server-side."""
+        column = ColumnInfo(name="v", data_type=data_type, raw_type=data_type.value, nullable=True)
+
+        assert connector._sample_value_expression(column) == expected
+
+    @pytest.mark.asyncio
+    async def test_add_table_statistics_skips_large_tables(self, connector, connection, columns):
+        """Test tables above the row estimate threshold are not scanned."""
+        await connector._add_table_statistics(columns, "events", "public", "r", 1e9, 200000)
+
+        connection.fetchrow.assert_not_awaited()
+        connection.fetch.assert_not_awaited()
+        assert all(column.null_count is None for column in columns)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("relkind,estimate,relpages", [
+        ("v", 0.0, 0),
+        ("f", -1.0, -1),
+        ("f", 100.0, 0),
+        ("r", -1.0, 50000),
+        ("r", -1.0, -1),
+        ("p", -1.0, -1),
+        ("p", 0.0, 0),
+    ])
+    async def test_add_table_statistics_skips_unsized_relations(
+        self, connector, connection, columns, relkind, estimate, relpages
+    ):
+        """Test views, foreign tables and tables without a known small size are not scanned."""
+        await connector._add_table_statistics(columns, "events", "public", relkind, estimate, relpages)
+
+        connection.fetchrow.assert_not_awaited()
+        connection.fetch.assert_not_awaited()
+        assert all(column.null_count is None for column in columns)
+
+    @pytest.mark.asyncio
+    async def test_get_all_columns_groups_by_table(self, connector, connection):
+        """Test one schema-wide column query is split up per table."""
+        def row(table_name, column_name, is_primary_key=False, is_indexed=False):
+            # Records are unpacked positionally, in SELECT list order
+            return (
+                # Build the type name at runtime, as a fresh string per record
+                table_name, column_name, "".join(["inte", "ger"]), "int4", True, None, None, 32, 0, None,
+                is_primary_key, False, is_indexed, None, None,
+            )
+
+        connection.fetch.return_value = [
+            row("ord", "o"),
+            row("ord", "ord_x", is_indexed=True),
+            row("orders", "order_id", is_primary_key=True),
+        ]
+
+        columns = await connector._get_all_columns("public")
+
+        connection.fetch.assert_awaited_once()
+        assert connection.fetch.call_args.args[1:] == ("public", _TABLE_RELKINDS)
+        assert [(column.name, column.is_indexed) for column in columns["ord"]] == [("o", False), ("ord_x", True)]
+        assert [(column.name, column.is_primary_key) for column in columns["orders"]] == [("order_id", True)]
+        # Repeated type names share one interned string
+        assert columns["ord"][0].raw_type is columns["orders"][0].raw_type
+
+    @pytest.mark.asyncio
+    async def test_get_tables_reads_pg_catalog(self, connector, connection):
+        """Test table listing is streamed straight from pg_class."""
+        connection.transaction = MagicMock()
+        connection.cursor = MagicMock()
+        connection.cursor.return_value.__aiter__.return_value = [("customers",), ("orders",)]
+
+        tables = await connector.get_tables()
+
+        assert tables == ["customers", "orders"]
+        query, schema, relkinds = connection.cursor.call_args.args
+        assert "FROM pg_class" in query
+        assert "information_schema" not in query
+        assert schema == "public"
+        assert relkinds == _TABLE_RELKINDS
+
+    @pytest.mark.asyncio
+    async def test_get_all_constraints_from_pg_constraint(self, connector, connection):
+        """Test constraint rows are mapped onto ConstraintInfo per table."""
+        connection.fetch.return_value = [
+            ("orders", "orders_qty_check", "CHECK", ["qty"], None, None, "((qty > 0))"),
+            ("orders", "orders_customer_id_fkey", "FOREIGN KEY", ["customer_id"], "customers", ["id"], None),
+        ]
+
+        constraints = await connector._get_all_constraints("public")
+        check, foreign_key = constraints["orders"]
+
+        assert "information_schema" not in connection.fetch.call_args.args[0]
+        assert (check.type, check.columns, check.definition) == ("CHECK", ["qty"], "((qty > 0))")
+        assert check.referenced_columns is None
+        assert (foreign_key.referenced_table, foreign_key.referenced_columns) == ("customers", ["id"])
+
+    @pytest.mark.asyncio
+    async def test_get_all_indexes_reads_access_method(self, connector, connection):
+        """Test index type and flags come from the catalog, not the definition text."""
+        connection.fetch.return_value = [
+            ("orders", "orders_pkey", "CREATE UNIQUE INDEX orders_pkey ON public.orders USING btree (order_id)",
+             "btree", True, True, ["order_id"]),
+            ("orders", "orders_gin", "CREATE INDEX orders_gin ON public.orders USING hash (gin)",
+             "hash", False, False, ["gin"]),
+        ]
+
+        indexes = await connector._get_all_indexes("public")
+        primary, hashed = indexes["orders"]
+
+        assert "pg_am" in connection.fetch.call_args.args[0]
+        assert (primary.type, primary.is_unique, primary.is_primary) == ("btree", True, True)
+        assert (hashed.type, hashed.is_unique, hashed.is_primary, hashed.columns) == ("hash", False, False, ["gin"])
+
+    @pytest.mark.asyncio
+    async def test_get_table_info_loads_schema_once(self, connector):
+        """Test concurrent table lookups share a single schema metadata load."""
+        loads = []
+
+        async def load_schema_metadata(schema):
+            loads.append(schema)
+            await asyncio.sleep(0)
+            return _SchemaMetadata(
+                tables={
+                    name: {"table_type": "table", "relkind": "r", "comment": None, "reltuples": 10.0, "relpages": 1, "size": 8192}
+                    for name in ("customers", "orders")
+                },
+                columns={},
+                constraints={},
+                indexes={},
+            )
+
+        connector._load_schema_metadata = load_schema_metadata
+
+        customers, orders = await asyncio.gather(
+            connector.get_table_info("customers"),
+            connector.get_table_info("orders"),
+        )
+
+        assert loads == ["public"]
+        assert (customers.name, orders.name) == ("customers", "orders")
+        assert (orders.row_count, orders.size_bytes) == (10, 8192)
+
+        with pytest.raises(ValueError, match="public.missing not found"):
+            await connector.get_table_info("missing")
+        assert loads == ["public"]
+
+    @pytest.mark.asyncio
+    async def test_get_table_info_view_skips_table_stats(self, connector):
+        """Test views do not fetch row counts or sizes."""
+        connector._load_schema_metadata = AsyncMock(return_value=_SchemaMetadata(
+            tables={"v_orders": {"table_type": "view", "relkind": "v", "comment": "Order view", "reltuples": 0.0, "relpages": 0, "size": None}},
+            columns={},
+            constraints={},
+            indexes={},
+        ))
+        connector._fetch_row_count = AsyncMock()
+
+        table_info = await connector.get_table_info("v_orders")
+
+        assert table_info.table_type == "view"
+        assert table_info.comment == "Order view"
+        assert table_info.row_count is None and table_info.size_bytes is None
+        connector._fetch_row_count.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_schema_metadata_load_failure_is_retried(self, connector):
+        """Test a failed schema load is not cached."""
+        connector._load_schema_metadata = AsyncMock(side_effect=[
+            RuntimeError("connection reset"),
+            _SchemaMetadata(tables={}, columns={}, constraints={}, indexes={}),
+        ])
+
+        with pytest.raises(RuntimeError):
+            await connector.get_table_info("orders")
+        with pytest.raises(ValueError):
+            await connector.get_table_info("orders")
+
+        assert connector._load_schema_metadata.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_fetch_row_count_uses_reltuples(self, connector, connection):
+        """Test analyzed tables report the planner estimate without scanning."""
+        assert await connector._fetch_row_count("orders", "public", "r", 1234567.0, 9000) == 1234567
+        connection.prepare.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("relkind,reltuples,relpages,exact_counts,expected", [
+        ("r", 0.0, 0, True, 3),
+        ("r", -1.0, 10, True, 3),
+        ("m", -1.0, 10, True, 3),
+        ("r", -1.0, 50000, True, None),
+        ("r", -1.0, -1, True, None),
+        ("r", 0.0, 0, False, None),
+        ("p", -1.0, -1, True, None),
+        ("p", -1.0, 0, True, None),
+        ("f", -1.0, -1, True, None),
+        ("f", 0.0, 0, True, None),
+    ])
+    async def test_fetch_row_count_fallback(
+        self, connector, connection, relkind, reltuples, relpages, exact_counts, expected
+    ):
+        """Test COUNT(*) only runs for tiny unanalyzed plain tables when exact counts are enabled."""
+        connector.config["exact_counts"] = exact_counts
+        connection.fetchval.return_value = 3
+
+        assert await connector._fetch_row_count("orders", "public", relkind, reltuples, relpages) == expected
+        assert connection.prepare.await_count == (1 if expected is not None else 0)
+
+    @pytest.mark.asyncio
+    async def test_scan_schema_bounds_table_concurrency(self, connector):
+        """Test scan_schema keeps table order while limiting parallel tables."""
+        connector.max_concurrency = 2
+        connector.connect = AsyncMock()
+        connector.disconnect = AsyncMock()
+        connector.get_database_info = AsyncMock(return_value=MagicMock(schema_name="public"))
+        in_flight = 0
+        peak = 0
+
+        async def get_table_info(table_name, schema=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            if table_name == "broken":
+                raise ValueError("boom")
+            return SimpleNamespace(name=table_name, table_type="table")
+
+        connector.get_table_info = get_table_info
+
+        result = await connector.scan_schema(tables=["a", "broken", "c", "d"], include_sample_data=False)
+
+        assert peak == 2
+        assert [table.name for table in result.tables] == ["a", "c", "d"]
+        assert result.errors == ["Table scan error for broken: boom"]
+
+    @pytest.mark.asyncio
+    async def test_scan_schema_batched_yields_table_batches(self, connector):
+        """Test tables are yielded batch by batch and the connection closed afterwards."""
+        connector.connect = AsyncMock()
+        connector.disconnect = AsyncMock()
+        connector.get_database_info = AsyncMock(return_value=MagicMock(schema_name="public"))
+
+        async def get_table_info(table_name, schema=None):
+            if table_name == "broken":
+                raise ValueError("boom")
+            return SimpleNamespace(name=table_name, table_type="table")
+
+        connector.get_table_info = get_table_info
+
+        batches = [
+            batch async for batch in connector.scan_schema_batched(
+                tables=["a", "broken", "c", "d", "e"], include_sample_data=False, batch_size=2
+            )
+        ]
+
+        assert [[table.name for table in batch.tables] for batch in batches] == [["a"], ["c", "d"], ["e"]]
+        assert [batch.errors for batch in batches] == [["Table scan error for broken: boom"], [], []]
+        assert [(batch.tables_scanned, batch.tables_total) for batch in batches] == [(2, 5), (4, 5), (5, 5)]
+        connector.disconnect.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_scan_schema_batched_keep_open_leaves_pool_open(self, connector):
+        """Test a caller-managed connection stays open, with earlier metadata dropped when a scan starts."""
+        connector.connect = AsyncMock()
+        connector.disconnect = AsyncMock()
+        connector.get_database_info = AsyncMock(return_value=MagicMock(schema_name="public"))
+        connector.get_table_info = AsyncMock(side_effect=lambda table_name, schema=None: SimpleNamespace(name=table_name))
+        connector._schema_metadata["public"] = asyncio.Future()
+
+        batches = [
+            batch async for batch in connector.scan_schema_batched(
+                tables=["a"], include_sample_data=False, keep_open=True
+            )
+        ]
+
+        assert [[table.name for table in batch.tables] for batch in batches] == [["a"]]
+        connector.connect.assert_awaited_once()
+        connector.disconnect.assert_not_awaited()
+        assert connector._schema_metadata == {}
+
+    @pytest.mark.asyncio
+    async def test_get_sample_data_streams_through_cursor(self, connector, connection):
+        """Test sample rows are streamed from an uncached statement and converted."""
+        connection.transaction = MagicMock()
+        connection.cursor = MagicMock()
+        connection.cursor.return_value.__aiter__.return_value = [
+            {"id": 1, "created_at": datetime(2024, 1, 2, 3, 4, 5), "blob": b"\x00\x01", "note": None},
+            {"id": 2, "created_at": date(2024, 1, 3), "blob": bytearray(3), "note": "ok"},
+        ]
+
+        sample_data = await connector.get_sample_data("orders")
+
+        connection.prepare.assert_awaited_once_with('SELECT * FROM "public"."orders" LIMIT $1')
+        connection.fetch.assert_not_awaited()
+        connection.cursor.assert_called_once_with(100, prefetch=64)
+        connection.transaction.assert_called_once_with(readonly=True)
+        assert sample_data == [
+            {"id": 1, "created_at": "2024-01-02T03:04:05", "blob": "<binary data: 2 bytes>", "note": None},
+            {"id": 2, "created_at": "2024-01-03", "blob": "<binary data: 3 bytes>", "note": "ok"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_get_sample_data_json(self, connector, connection):
+        """Test sample rows are serialized straight to JSON bytes."""
+        connection.transaction = MagicMock()
+        connection.cursor = MagicMock()
+        connection.cursor.return_value.__aiter__.return_value = [
+            {"id": 1, "created_at": datetime(2024, 1, 2, 3, 4, 5), "blob": b"\x00\x01", "amount": Decimal("1.50")},
+            {"id": 2, "created_at": None, "blob": None, "amount": None},
+        ]
+
+        payload = await connector.get_sample_data_json("orders", limit=2)
+
+        assert json.loads(payload) == [
+            {"id": 1, "created_at": "2024-01-02T03:04:05", "blob": "<binary data: 2 bytes>", "amount": "1.50"},
+            {"id": 2, "created_at": None, "blob": None, "amount": None},
+        ]
+        connection.cursor.assert_called_once_with(2, prefetch=64)
+
+    @pytest.mark.asyncio
+    async def test_iter_sample_data_stops_early(self, connector, connection):
+        """Test iterating sample data yields rows one at a time without materializing them."""
+        connection.transaction = MagicMock()
+        connection.cursor = MagicMock()
+        connection.cursor.return_value.__aiter__.return_value = [{"id": 1}, {"id": 2}, {"id": 3}]
+
+        rows = connector.iter_sample_data("orders", limit=3)
+        first = await rows.__anext__()
+        await rows.aclose()
+
+        assert first == {"id": 1}
+        connection.cursor.assert_called_once_with(3, prefetch=64)
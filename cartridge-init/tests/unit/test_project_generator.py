@@ -0,0 +1,414 @@
+"""Unit tests for the dbt project generator."""
+
+import json
+import os
+import shutil
+import tarfile
+
+import pytest
+import yaml
+
+from cartridge.ai.base import (
+    GeneratedModel, GeneratedTest, ModelGenerationResult, ModelType
+)
+from cartridge.dbt.file_generator import DBTFileGenerator, MANIFEST_FILENAME
+from cartridge.dbt.project_generator import DBTProjectGenerator, _GITIGNORE_BYTES, _ProjectPaths
+
+
+@pytest.fixture
+def sample_models():
+    """Sample generated models covering every model type."""
+    return [
+        GeneratedModel(
+            name="stg_customers",
+            model_type=ModelType.STAGING,
+            sql="select * from {{ source('ecommerce', 'customers') }}",
+            description="Staged customers",
+            columns=[{"name": "id", "description": "Primary key", "tests": ["unique"]}],
+            tests=[GeneratedTest(test_type="not_null", column="id")],
+            dependencies=[],
+            materialization="view",
+            meta={"source_table": "ecommerce.customers"}
+        ),
+        GeneratedModel(
+            name="stg_orders",
+            model_type=ModelType.STAGING,
+            sql="select * from {{ source('ecommerce', 'orders') }}",
+            description="Staged orders",
+            columns=[],
+            tests=[],
+            dependencies=[],
+            materialization="view",
+            meta={"source_table": "ecommerce.orders"}
+        ),
+        GeneratedModel(
+            name="int_customer_orders",
+            model_type=ModelType.INTERMEDIATE,
+            sql="select * from {{ ref('stg_orders') }}",
+            description="Orders joined to customers",
+            columns=[],
+            tests=[],
+            dependencies=["stg_customers", "stg_orders"]
+        ),
+        GeneratedModel(
+            name="fct_orders",
+            model_type=ModelType.MARTS,
+            sql="select * from {{ ref('int_customer_orders') }}",
+            description="Order facts",
+            columns=[],
+            tests=[],
+            dependencies=["int_customer_orders"]
+        ),
+        GeneratedModel(
+            name="snap_customers",
+            model_type=ModelType.SNAPSHOT,
+            sql="select * from {{ ref('stg_customers') }}",
+            description="Customer snapshot",
+            columns=[],
+            tests=[],
+            dependencies=["stg_customers"]
+        ),
+    ]
+
+
+@pytest.fixture
+def generation_result(sample_models):
+    """Sample model generation result."""
+    return ModelGenerationResult(
+        models=sample_models,
+        project_structure={},
+        generation_metadata={"ai_provider": "mock", "model_used": "mock"}
+    )
+
+
+@pytest.fixture
+def generator():
+    """Project generator under test."""
+    return DBTProjectGenerator(project_name="test_project")
+
+
+class TestDBTProjectGenerator:
+    """Test DBTProjectGenerator output."""
+
+    def test_generate_project_creates_core_files(self, generator, generation_result, tmp_path):
+        """Test that the core project files are written."""
+        output_dir = str(tmp_path / "test_project")
+
+        generator.generate_project(generation_result, output_dir=output_dir)
+
+        for filename in ["dbt_project.yml", "profiles.yml", "packages.yml", ".gitignore", "README.md"]:
+            assert os.path.isfile(os.path.join(output_dir, filename))
+
+    def test_generate_gitignore(self, generator, tmp_path):
+        """Test .gitignore content and that regeneration truncates the file."""
+        gitignore_path = tmp_path / ".gitignore"
+        gitignore_path.write_bytes(b"x" * (len(_GITIGNORE_BYTES) + 100))
+
+        generator._generate_gitignore(_ProjectPaths.for_root(str(tmp_path)))
+
+        content = gitignore_path.read_bytes()
+        assert content == _GITIGNORE_BYTES
+        assert content.startswith(b"# dbt")
+        assert content.endswith(b".cartridge_manifest.json")
+
+    def test_generate_project_reports_created_files(self, generator, generation_result, tmp_path):
+        """Test that files generated concurrently are all reported in project info."""
+        output_dir = str(tmp_path / "test_project")
+
+        project_info = generator.generate_project(generation_result, output_dir=output_dir)
+
+        assert project_info["models_generated"] == 5
+        assert project_info["files_created"]["models"] == 5
+        assert project_info["files_created"]["schemas"] == 4
+        assert project_info["files_created"]["docs"] == 1
+        assert os.path.isfile(os.path.join(output_dir, "models", "staging", "sources.yml"))
+        assert os.path.isfile(os.path.join(output_dir, "models", "marts", "core", "fct_orders.sql"))
+
+    def test_generate_project_propagates_step_failure(self, generator, generation_result, tmp_path, monkeypatch):
+        """Test that a failing generation step is re-raised to the caller."""
+        def fail(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(generator, "_generate_readme", fail)
+
+        with pytest.raises(OSError, match="disk full"):
+            generator.generate_project(generation_result, output_dir=str(tmp_path / "test_project"))
+
+    def test_get_project_structure(self, generator, generation_result, tmp_path):
+        """Test that the project structure mirrors the generated directory tree."""
+        output_dir = str(tmp_path / "test_project")
+
+        project_info = generator.generate_project(generation_result, output_dir=output_dir)
+        structure = project_info["project_structure"]
+
+        assert (tmp_path / "test_project" / MANIFEST_FILENAME).is_file()
+        assert MANIFEST_FILENAME not in structure
+        assert structure["dbt_project.yml"] == "file"
+        assert structure["models"]["staging"]["stg_customers.sql"] == "file"
+        assert structure["models"]["marts"]["core"]["fct_orders.sql"] == "file"
+        assert structure["seeds"] == {}
+
+    def test_create_project_structure(self, generator, tmp_path):
+        """Test that all dbt directories, including parents of leaves, are created."""
+        output_dir = tmp_path / "test_project"
+
+        generator._create_project_structure(str(output_dir))
+
+        for directory in ["models", "models/staging", "models/intermediate", "models/marts",
+                          "models/marts/core", "macros", "tests", "analysis", "snapshots",
+                          "seeds", "docs", "logs", "target", "dbt_packages"]:
+            assert (output_dir / directory).is_dir()
+
+    def test_model_files_placed_by_model_type(self, generator, generation_result, tmp_path):
+        """Test that model and schema files land in the directory for their model type."""
+        output_dir = tmp_path / "test_project"
+
+        generator.generate_project(generation_result, output_dir=str(output_dir))
+
+        assert (output_dir / "models" / "staging" / "stg_customers.sql").is_file()
+        assert (output_dir / "models" / "intermediate" / "int_customer_orders.sql").is_file()
+        assert (output_dir / "models" / "marts" / "core" / "fct_orders.sql").is_file()
+        assert (output_dir / "models" / "snap_customers.sql").is_file()
+        for schema_dir in ["models/staging", "models/intermediate", "models/marts/core", "models"]:
+            assert (output_dir / schema_dir / "schema.yml").is_file()
+
+    def test_model_documentation_section(self, generator, sample_models):
+        """Test that the README section groups models by type in first-seen order."""
+        section = generator._generate_model_documentation_section(sample_models)
+
+        assert section.startswith("\n### Staging Models\n\n- **stg_customers**: Staged customers\n")
+        assert "- **stg_orders**: Staged orders\n\n### Intermediate Models" in section
+        assert section.count("###") == 4
+
+    def test_model_documentation_section_without_models(self, generator):
+        """Test the README section when no models were generated."""
+        assert generator._generate_model_documentation_section([]) == "No models generated."
+
+    def test_regeneration_skips_unchanged_files(self, generator, generation_result, tmp_path, monkeypatch):
+        """Test that regenerating a project only rewrites files whose content changed."""
+        output_dir = tmp_path / "test_project"
+        generator.generate_project(generation_result, output_dir=str(output_dir))
+        assert (output_dir / MANIFEST_FILENAME).is_file()
+
+        edited = output_dir / "dbt_project.yml"
+        edited.write_text("edited by hand")
+        generation_result.models[0].sql = "select 1 as id"
+
+        written = []
+        write_buffers = generator.file_generator._write_buffers
+
+        def record_write(file_path, buffers):
+            written.append(os.path.relpath(file_path, output_dir))
+            return write_buffers(file_path, buffers)
+
+        monkeypatch.setattr(generator.file_generator, "_write_buffers", record_write)
+
+        generator.generate_project(generation_result, output_dir=str(output_dir))
+
+        assert sorted(written) == ["dbt_project.yml", "models/staging/stg_customers.sql"]
+        assert (output_dir / "models" / "staging" / "stg_customers.sql").read_text().endswith("select 1 as id\n")
+        assert edited.read_text() != "edited by hand"
+
+    def test_generate_packages_yml(self, generator, tmp_path):
+        """Test that packages.yml parses to the expected package list."""
+        generator._generate_packages_yml(_ProjectPaths.for_root(str(tmp_path)))
+
+        packages = yaml.safe_load((tmp_path / "packages.yml").read_text())
+        assert packages == {
+            "packages": [
+                {"package": "dbt-labs/dbt_utils", "version": [">=1.0.0", "<2.0.0"]},
+                {"package": "calogica/dbt_expectations", "version": [">=0.8.0", "<1.0.0"]},
+                {"package": "dbt-labs/codegen", "version": [">=0.9.0", "<1.0.0"]},
+            ]
+        }
+
+    @pytest.mark.parametrize("source_table", [
+        "ecommerce.customers",
+        "on.customers",
+        "ecommerce.123",
+        "my-schema.customers",
+        "ecommerce.customers: x",
+    ])
+    def test_generate_sources_yml_matches_yaml_dump(self, generator, sample_models, tmp_path, source_table):
+        """Test that sources.yml matches yaml.dump output, including names that need quoting."""
+        sample_models[0].meta = {"source_table": source_table}
+        sample_models[1].meta = None
+        result = ModelGenerationResult(models=sample_models, project_structure={}, generation_metadata={})
+        (tmp_path / "models" / "staging").mkdir(parents=True)
+
+        generator._generate_sources_yml(_ProjectPaths.for_root(str(tmp_path)), result)
+
+        schema, table = source_table.split(".", 1)
+        expected = {
+            "version": 2,
+            "sources": [
+                {
+                    "name": schema,
+                    "description": f"Raw data from {schema} schema",
+                    "tables": [{"name": table, "description": f"Raw {table} data"}]
+                }
+            ]
+        }
+        content = (tmp_path / "models" / "staging" / "sources.yml").read_text()
+        assert content == yaml.dump(expected, default_flow_style=False, sort_keys=False)
+
+    def test_generate_sources_yml_dedupes_and_sorts_tables(self, generator, sample_models, tmp_path):
+        """Test that source tables are deduplicated, sorted and malformed entries skipped."""
+        sample_models[0].meta = {"source_table": "ecommerce.orders"}
+        sample_models[1].meta = {"source_table": "ecommerce.customers"}
+        sample_models[2].meta = {"source_table": "ecommerce.orders"}
+        sample_models[3].meta = {"source_table": "no_schema"}
+        sample_models[4].meta = {"other": "value"}
+        result = ModelGenerationResult(models=sample_models, project_structure={}, generation_metadata={})
+        (tmp_path / "models" / "staging").mkdir(parents=True)
+
+        generator._generate_sources_yml(_ProjectPaths.for_root(str(tmp_path)), result)
+
+        sources = yaml.safe_load((tmp_path / "models" / "staging" / "sources.yml").read_text())
+        assert [source["name"] for source in sources["sources"]] == ["ecommerce"]
+        assert [table["name"] for table in sources["sources"][0]["tables"]] == ["customers", "orders"]
+
+    def test_generate_readme(self, generator, generation_result, tmp_path):
+        """Test that the README template is rendered with project details."""
+        generator._generate_readme(_ProjectPaths.for_root(str(tmp_path)), generation_result)
+
+        readme = (tmp_path / "README.md").read_text(encoding="utf-8")
+        assert readme.startswith("# test_project\n")
+        assert "- **Models Generated**: 5\n" in readme
+        assert "- **Generated By**: mock\n" in readme
+        assert "pip install dbt-postgresql" in readme
+        assert "- **fct_orders**: Order facts\n" in readme
+        assert readme.endswith("*Generated by Cartridge - AI-powered dbt model generator*\n")
+
+
+class TestProjectArchive:
+    """Test project archive creation."""
+
+    @pytest.fixture
+    def project_path(self, generator, generation_result, tmp_path):
+        """Generated project on disk."""
+        output_dir = str(tmp_path / "test_project")
+        generator.generate_project(generation_result, output_dir=output_dir)
+        return output_dir
+
+    def _archive_names(self, archive_path):
+        with tarfile.open(archive_path, "r:gz") as tar:
+            return set(tar.getnames())
+
+    def test_create_archive_without_pigz(self, generator, project_path, monkeypatch):
+        """Test the tarfile fallback when pigz is not installed."""
+        monkeypatch.setattr("cartridge.dbt.project_generator.shutil.which", lambda name: None)
+
+        archive_path = generator.create_project_archive(project_path)
+
+        assert archive_path == f"{project_path}.tar.gz"
+        names = self._archive_names(archive_path)
+        assert "test_project/dbt_project.yml" in names
+        assert "test_project/models/staging/stg_customers.sql" in names
+        assert f"test_project/{MANIFEST_FILENAME}" not in names
+
+    def test_create_archive_includes_files_added_after_generation(self, generator, project_path, monkeypatch):
+        """Test that the archive reflects the project directory, not just the generated files."""
+        extra_file = os.path.join(project_path, "models", "extra.sql")
+        with open(extra_file, "w") as f:
+            f.write("select 1\n")
+        monkeypatch.setattr("cartridge.dbt.project_generator.shutil.which", lambda name: None)
+
+        archive_path = generator.create_project_archive(project_path)
+
+        assert "test_project/models/extra.sql" in self._archive_names(archive_path)
+
+    def test_create_archive_reports_pigz_failure(self, generator, project_path, tmp_path):
+        """Test that a failing pigz is reported with what it wrote to stderr."""
+        fake_pigz = tmp_path / "pigz"
+        fake_pigz.write_text("#!/bin/sh\ncat > /dev/null\necho 'pigz: write error' >&2\nexit 3\n")
+        fake_pigz.chmod(0o755)
+
+        with pytest.raises(RuntimeError, match="pigz exited with status 3: pigz: write error"):
+            generator._create_archive_with_pigz(str(fake_pigz), project_path, str(tmp_path / "project.tar.gz"))
+
+    @pytest.mark.skipif(shutil.which("pigz") is None, reason="pigz not installed")
+    def test_create_archive_with_pigz(self, generator, project_path):
+        """Test that the pigz path produces a readable gzip archive."""
+        archive_path = generator.create_project_archive(project_path)
+
+        names = self._archive_names(archive_path)
+        assert "test_project/dbt_project.yml" in names
+        assert "test_project/models/marts/core/fct_orders.sql" in names
+
+
+class TestDBTFileGenerator:
+    """Test DBTFileGenerator file writes."""
+
+    def test_write_file_encodes_and_truncates(self, tmp_path):
+        """Test that write_file encodes text as UTF-8 and replaces existing content."""
+        file_path = tmp_path / "README.md"
+        file_path.write_text("stale content that is longer than the new one")
+
+        DBTFileGenerator().write_file(str(file_path), "├── models/\n")
+
+        assert file_path.read_text(encoding="utf-8") == "├── models/\n"
+
+    def test_manifest_not_saved_on_failure(self, tmp_path):
+        """Test that a failed generation does not record a manifest."""
+        file_generator = DBTFileGenerator()
+
+        with pytest.raises(RuntimeError):
+            with file_generator.manifest(str(tmp_path)) as manifest:
+                file_generator.write_file(str(tmp_path / "model.sql"), "select 1\n", manifest)
+                raise RuntimeError("generation failed")
+
+        assert not (tmp_path / MANIFEST_FILENAME).exists()
+        assert (tmp_path / "model.sql").read_text() == "select 1\n"
+
+    def test_overlapping_manifests_are_independent(self, tmp_path):
+        """Test that two projects generated at once by one file generator keep separate manifests."""
+        file_generator = DBTFileGenerator()
+        first_root, second_root = tmp_path / "first", tmp_path / "second"
+        first_root.mkdir()
+        second_root.mkdir()
+
+        with file_generator.manifest(str(first_root)) as first:
+            with file_generator.manifest(str(second_root)) as second:
+                file_generator.write_file(str(second_root / "second.sql"), "select 2\n", second)
+            file_generator.write_file(str(first_root / "first.sql"), "select 1\n", first)
+
+        assert list(json.loads((first_root / MANIFEST_FILENAME).read_text())) == ["first.sql"]
+        assert list(json.loads((second_root / MANIFEST_FILENAME).read_text())) == ["second.sql"]
+
+    def test_write_chunks_more_than_iov_max(self, tmp_path, monkeypatch):
+        """Test that fragments beyond the writev buffer limit are written in batches."""
+        monkeypatch.setattr("cartridge.dbt.file_generator._IOV_MAX", 3)
+        file_path = tmp_path / "sources.yml"
+
+        DBTFileGenerator().write_chunks(str(file_path), [f"line {i}\n" for i in range(10)])
+
+        assert file_path.read_text() == "".join(f"line {i}\n" for i in range(10))
+
+    def test_write_chunks_short_write(self, tmp_path, monkeypatch):
+        """Test that a short writev is completed with plain writes."""
+        writev = os.writev
+        monkeypatch.setattr(
+            "cartridge.dbt.file_generator.os.writev",
+            lambda fd, buffers: writev(fd, [memoryview(buffers[0])[:2]])
+        )
+        file_path = tmp_path / "model.sql"
+
+        DBTFileGenerator().write_chunks(str(file_path), ["-- header", "\n", "select 1\n"])
+
+        assert file_path.read_text() == "-- header\nselect 1\n"
+
+    @pytest.mark.parametrize("sql, expected_ending", [
+        ("select 1", "\nselect 1\n"),
+        ("select 1\n", "\nselect 1\n"),
+        ("", "-- Generated by Cartridge\n\n"),
+    ])
+    def test_generate_model_file_newline(self, sample_models, tmp_path, sql, expected_ending):
+        """Test that model files always end with exactly one trailing newline."""
+        model = sample_models[3]
+        model.sql = sql
+
+        file_path = DBTFileGenerator().generate_model_file(model, str(tmp_path))
+
+        with open(file_path) as f:
+            assert f.read().endswith(expected_ending)
@@ -1,195 +1,268 @@
 """Unit tests for projects API endpoints."""
 
+from dataclasses import dataclass, field
+from types import MappingProxyType, SimpleNamespace
+
+import orjson
 import pytest
-import tempfile
-import os
-from unittest.mock import AsyncMock, MagicMock, patch, mock_open
+from unittest.mock import AsyncMock, MagicMock
 from fastapi.testclient import TestClient
 
-from cartridge.ai.base import ModelGenerationResult, GeneratedModel, ModelType
-
-
-class TestProjectsAPI:
-    """Test projects API endpoints."""
-
-    def test_generate_models_sync_success(self, client):
-        """Test successful synchronous model generation."""
-        generation_request = {
-            "schema_data": {
-                "tables": [
+from cartridge.ai.base import AIProvider, ModelGenerationResult, GeneratedModel, ModelType
+from cartridge.api.routes import projects as projects_module
+from cartridge.api.routes.projects import ProjectGenerationResult, TaskResult
+
+
+# Request bodies are encoded once, rather than by the test client on every post
+_SYNC_GENERATION_REQUEST = orjson.dumps({
+    "schema_data": {
+        "tables": [
+            {
+                "name": "customers",
+                "schema": "public",
+                "table_type": "table",
+                "row_count": 1000,
+                "columns": [
                     {
-                        "name": "customers",
-                        "schema": "public",
-                        "table_type": "table",
-                        "row_count": 1000,
-                        "columns": [
-                            {
-                                "name": "id",
-                                "type": "integer",
-                                "nullable": False,
-                                "primary_key": True,
-                                "foreign_key": False
-                            },
-                            {
-                                "name": "name",
-                                "type": "varchar",
-                                "nullable": False,
-                                "primary_key": False,
-                                "foreign_key": False
-                            }
-                        ]
-                    }
-                ]
-            },
-            "model_types": ["staging", "marts"],
-            "ai_model": "mock",
-            "include_tests": True,
-            "include_docs": True,
-            "async_mode": False
-        }
-
-        # Mock AI provider and generation result
-        mock_model = MagicMock()
-        mock_model.name = "stg_customers"
-        mock_model.model_type = ModelType.STAGING
-        mock_model.sql = "SELECT * FROM {{ source('raw', 'customers') }}"
-        mock_model.description = "Staging table for customers"
-        mock_model.tests = []
-        mock_model.dependencies = []
-
-        mock_generation_result = MagicMock()
-        mock_generation_result.models = [mock_model]
-        mock_generation_result.generation_metadata = {"ai_provider": "mock"}
-
-        with patch('cartridge.api.routes.projects.AIProviderFactory.get_supported_models') as mock_supported, \
-             patch('cartridge.api.routes.projects.AIProviderFactory.create_provider') as mock_factory, \
-             patch('cartridge.api.routes.projects.SchemaAnalyzer') as mock_analyzer:
-            
-            mock_supported.return_value = ["mock", "gpt-4", "claude-3-sonnet"]
-            
-            mock_provider = AsyncMock()
-            mock_provider.generate_models.return_value = mock_generation_result
-            mock_factory.return_value = mock_provider
-            
-            mock_analyzer_instance = MagicMock()
-            mock_analyzer_instance.detect_fact_tables.return_value = ["customers"]
-            mock_analyzer.return_value = mock_analyzer_instance
-
-            response = client.post("/api/v1/projects/generate", json=generation_request)
-
-            assert response.status_code == 200
-            data = response.json()
-            assert "project_id" in data
-            assert data["ai_model_used"] == "mock"
-            assert len(data["models"]) == 1
-            assert data["models"][0]["name"] == "stg_customers"
-            assert data["models"][0]["type"] == "staging"
-            assert "project_structure" in data
-
-    def test_generate_models_async_mode(self, client):
-        """Test asynchronous model generation mode."""
-        generation_request = {
-            "schema_data": {
-                "tables": [
+                        "name": "id",
+                        "type": "integer",
+                        "nullable": False,
+                        "primary_key": True,
+                        "foreign_key": False
+                    },
                     {
-                        "name": "customers",
-                        "schema": "public",
-                        "table_type": "table",
-                        "columns": [
-                            {
-                                "name": "id",
-                                "type": "integer",
-                                "nullable": False,
-                                "primary_key": True,
-                                "foreign_key": False
-                            }
-                        ]
+                        "name": "name",
+                        "type": "varchar",
+                        "nullable": False,
+                        "primary_key": False,
+                        "foreign_key": False
                     }
                 ]
-            },
-            "model_types": ["staging"],
-            "ai_model": "gpt-4",
-            "async_mode": True
+            }
+        ]
+    },
+    "model_types": ["staging", "marts"],
+    "ai_model": "mock",
+    "include_tests": True,
+    "include_docs": True,
+    "async_mode": False
+})
+
+# Minimal valid request; error-path tests override single fields of it
+_BASE_GENERATION_REQUEST = {
+    "schema_data": {
+        "tables": [
+            {
+                "name": "customers",
+                "schema": "public",
+                "columns": [{"name": "id", "type": "integer", "nullable": False, "primary_key": True, "foreign_key": False}]
+            }
+        ]
+    },
+    "ai_model": "gpt-4",
+    "async_mode": False
+}
+
+# Frozen so a test that mutates the shared schema fails instead of leaking state
+_REALISTIC_SCHEMA = MappingProxyType({
+    "tables": [
+        {
+            "name": "customers",
+            "schema": "public",
+            "table_type": "table",
+            "row_count": 10000,
+            "columns": [
+                {
+                    "name": "customer_id",
+                    "type": "integer",
+                    "nullable": False,
+                    "primary_key": True,
+                    "foreign_key": False
+                },
+                {
+                    "name": "email",
+                    "type": "varchar",
+                    "nullable": False,
+                    "primary_key": False,
+                    "foreign_key": False
+                },
+                {
+                    "name": "created_at",
+                    "type": "timestamp",
+                    "nullable": False,
+                    "primary_key": False,
+                    "foreign_key": False
+                }
+            ]
+        },
+        {
+            "name": "orders",
+            "schema": "public",
+            "table_type": "table",
+            "row_count": 50000,
+            "columns": [
+                {
+                    "name": "order_id",
+                    "type": "integer",
+                    "nullable": False,
+                    "primary_key": True,
+                    "foreign_key": False
+                },
+                {
+                    "name": "customer_id",
+                    "type": "integer",
+                    "nullable": False,
+                    "primary_key": False,
+                    "foreign_key": True
+                },
+                {
+                    "name": "total_amount",
+                    "type": "decimal",
+                    "nullable": False,
+                    "primary_key": False,
+                    "foreign_key": False
+                }
+            ]
         }
+    ]
+})
 
-        with patch('cartridge.api.routes.projects.generate_dbt_models') as mock_task:
-            mock_task.delay.return_value.id = "generation-task-123"
+_REALISTIC_GENERATION_REQUEST = orjson.dumps({
+    "schema_data": _REALISTIC_SCHEMA,
+    "model_types": ["staging", "intermediate", "marts"],
+    "ai_model": "mock",
+    "include_tests": True,
+    "include_docs": True,
+    "async_mode": False
+}, default=dict)
 
-            response = client.post("/api/v1/projects/generate", json=generation_request)
 
-            assert response.status_code == 200
-            data = response.json()
-            assert data["task_id"] == "generation-task-123"
-            assert data["status"] == "PENDING"
-            assert data["message"] == "Model generation queued for background processing"
-            assert "project_id" in data["result"]
+def _post_json(client, url, body):
+    """POST an already encoded JSON body."""
+    return client.post(url, content=body, headers={"content-type": "application/json"})
 
-    def test_generate_models_unsupported_ai_model(self, client):
-        """Test model generation with unsupported AI model."""
-        generation_request = {
-            "schema_data": {
-                "tables": [
-                    {
-                        "name": "customers",
-                        "schema": "public",
-                        "columns": [{"name": "id", "type": "integer"}]
-                    }
-                ]
-            },
-            "ai_model": "unsupported-model",
-            "async_mode": False
-        }
 
-        with patch('cartridge.api.routes.projects.AIProviderFactory.get_supported_models') as mock_supported:
-            mock_supported.return_value = ["gpt-4", "claude-3-sonnet"]
+def _json(response):
+    """Decode a response body with orjson."""
+    return orjson.loads(response.content)
 
-            response = client.post("/api/v1/projects/generate", json=generation_request)
 
-            assert response.status_code == 400
-            assert "Unsupported AI model" in response.json()["detail"]
+@dataclass(slots=True)
+class _FakeModel:
+    """Plain stand-in for GeneratedModel; the projects API only reads these attributes."""
+    name: str
+    model_type: ModelType
+    sql: str
+    description: str
+    tests: list = field(default_factory=list)
+    dependencies: list = field(default_factory=list)
 
-    def test_generate_models_no_tables(self, client):
-        """Test model generation with no tables in schema data."""
-        generation_request = {
-            "schema_data": {
-                "tables": []
-            },
-            "ai_model": "gpt-4",
-            "async_mode": False
-        }
 
-        with patch('cartridge.api.routes.projects.AIProviderFactory.get_supported_models') as mock_supported:
-            mock_supported.return_value = ["gpt-4"]
+# AsyncMock is expensive to build, so one provider mock is shared by the module
+# and reset between tests; spec_set rejects attributes AIProvider does not have
+_PROVIDER = AsyncMock(spec_set=AIProvider)
 
-            response = client.post("/api/v1/projects/generate", json=generation_request)
 
-            assert response.status_code == 400
-            assert "No tables found in schema data" in response.json()["detail"]
+@pytest.fixture
+def mock_staging_model():
+    """Generated staging model for stg_customers."""
+    return _FakeModel(
+        name="stg_customers",
+        model_type=ModelType.STAGING,
+        sql="SELECT * FROM {{ source('raw', 'customers') }}",
+        description="Staging table for customers",
+    )
+
+
+@pytest.fixture
+def mock_mart_model():
+    """Generated mart model for dim_customers."""
+    return _FakeModel(
+        name="dim_customers",
+        model_type=ModelType.MARTS,
+        sql="SELECT customer_id, email FROM {{ ref('stg_customers') }}",
+        description="Customer dimension",
+        dependencies=["stg_customers"],
+    )
 
-    def test_generate_models_invalid_model_type(self, client):
-        """Test model generation with invalid model type."""
-        generation_request = {
-            "schema_data": {
-                "tables": [
-                    {
-                        "name": "customers",
-                        "schema": "public",
-                        "columns": [{"name": "id", "type": "integer"}]
-                    }
-                ]
-            },
-            "model_types": ["invalid_type"],
-            "ai_model": "gpt-4",
-            "async_mode": False
-        }
 
-        with patch('cartridge.api.routes.projects.AIProviderFactory.get_supported_models') as mock_supported:
-            mock_supported.return_value = ["gpt-4"]
+@pytest.fixture
+def mock_provider():
+    """AI provider mock; tests set what generate_models() returns or raises."""
+    _PROVIDER.reset_mock(return_value=True, side_effect=True)
+    return _PROVIDER
 
-            response = client.post("/api/v1/projects/generate", json=generation_request)
 
-            assert response.status_code == 400
-            assert "Invalid model type" in response.json()["detail"]
+@pytest.fixture
+def mock_analyzer():
+    """SchemaAnalyzer stand-in; tests may set the instance's detect_fact_tables()."""
+    return MagicMock()
+
+
+@pytest.fixture(autouse=True)
+def stub_ai_factory(monkeypatch, mock_provider, mock_analyzer):
+    """Route the projects API to the mock provider and analyzer in every test."""
+    monkeypatch.setattr(
+        projects_module.AIProviderFactory, "create_provider", lambda model, config: mock_provider
+    )
+    monkeypatch.setattr(projects_module, "SchemaAnalyzer", mock_analyzer)
+
+
+def _mock_generation_result(*models):
+    """Build a mock generation result holding the given models."""
+    result = MagicMock()
+    result.models = list(models)
+    result.generation_metadata = {"ai_provider": "mock"}
+    return result
+
+
+class TestProjectsAPI:
+    """Test projects API endpoints."""
+
+    def test_generate_models_sync_success(self, client, mock_staging_model, mock_provider, mock_analyzer):
+        """Test successful synchronous model generation."""
+        mock_provider.generate_models.return_value = _mock_generation_result(mock_staging_model)
+        mock_analyzer.return_value.detect_fact_tables.return_value = ["customers"]
+
+        response = _post_json(client, "/api/v1/projects/generate", _SYNC_GENERATION_REQUEST)
+
+        assert response.status_code == 200
+        result = ProjectGenerationResult.model_validate_json(response.content)
+        assert result.ai_model_used == "mock"
+        assert len(result.models) == 1
+        assert result.models[0].name == "stg_customers"
+        assert result.models[0].type == "staging"
+
+    def test_generate_models_async_mode(self, client, mocker):
+        """Test asynchronous model generation mode."""
+        generation_request = _BASE_GENERATION_REQUEST | {"model_types": ["staging"], "async_mode": True}
+
+        mock_task = mocker.patch.object(projects_module, "generate_dbt_models")
+        mock_task.delay.return_value.id = "generation-task-123"
+
+        response = client.post("/api/v1/projects/generate", json=generation_request)
+
+        assert response.status_code == 200
+        result = TaskResult.model_validate_json(response.content)
+        assert result.task_id == "generation-task-123"
+        assert result.status == "PENDING"
+        assert result.message == "Model generation queued for background processing"
+        assert "project_id" in result.result
+
+    @pytest.mark.parametrize("overrides,expected_status,expected_detail", [
+        pytest.param({"ai_model": "unsupported-model"}, 400, "Unsupported AI model", id="unsupported_ai_model"),
+        pytest.param({"schema_data": {"tables": []}}, 400, "No tables found in schema data", id="no_tables"),
+        pytest.param({"model_types": ["invalid_type"]}, 400, "Invalid model type", id="invalid_model_type"),
+        pytest.param({}, 500, "Model generation failed", id="ai_provider_exception"),
+    ])
+    def test_generate_models_rejected(self, client, mock_provider, overrides, expected_status, expected_detail):
+        """Test model generation errors; validation must fail before the AI provider is called."""
+        mock_provider.generate_models.side_effect = Exception("AI service unavailable")
+
+        response = client.post("/api/v1/projects/generate", json=_BASE_GENERATION_REQUEST | overrides)
+
+        assert response.status_code == expected_status
+        assert expected_detail in _json(response)["detail"]
 
     def test_test_run_models_success(self, client):
         """Test successful model test run."""
@@ -202,7 +275,7 @@ class TestProjectsAPI:
         response = client.post("/api/v1/projects/test-run", json=test_request)
 
         assert response.status_code == 200
-        data = response.json()
+        data = _json(response)
         assert data["project_id"] == "test-project-123"
         assert data["status"] == "success"
         assert "results" in data
@@ -226,88 +299,51 @@ class TestProjectsAPI:
         response = client.get(f"/api/v1/projects/{project_id}")
 
         assert response.status_code == 200
-        data = response.json()
+        data = _json(response)
         assert data["project_id"] == project_id
         assert "status" in data
         assert "created_at" in data
         assert "model_count" in data
         assert "generation_settings" in data
 
-    def test_get_task_status_success(self, client):
+    def test_get_task_status_success(self, client, mocker):
         """Test getting task status for projects."""
         task_id = "generation-task-123"
 
-        with patch('cartridge.api.routes.projects.celery_app.AsyncResult') as mock_result:
-            mock_task_result = MagicMock()
-            mock_task_result.state = "SUCCESS"
-            mock_task_result.result = {
+        mock_task_result = SimpleNamespace(
+            state="SUCCESS",
+            info=None,
+            result={
                 "project_id": "proj_abc123",
                 "status": "completed",
                 "models_generated": 3
             }
-            mock_result.return_value = mock_task_result
+        )
+        mocker.patch.object(projects_module.celery_app, "AsyncResult", return_value=mock_task_result)
 
-            response = client.get(f"/api/v1/projects/tasks/{task_id}")
-
-            assert response.status_code == 200
-            data = response.json()
-            assert data["task_id"] == task_id
-            assert data["status"] == "SUCCESS"
-            assert data["result"]["models_generated"] == 3
-
-    def test_generate_models_ai_provider_exception(self, client):
-        """Test model generation when AI provider raises exception."""
-        generation_request = {
-            "schema_data": {
-                "tables": [
-                    {
-                        "name": "customers",
-                        "schema": "public",
-                        "columns": [{"name": "id", "type": "integer", "nullable": False, "primary_key": True, "foreign_key": False}]
-                    }
-                ]
-            },
-            "ai_model": "gpt-4",
-            "async_mode": False
-        }
+        response = client.get(f"/api/v1/projects/tasks/{task_id}")
 
-        with patch('cartridge.api.routes.projects.AIProviderFactory.get_supported_models') as mock_supported, \
-             patch('cartridge.api.routes.projects.AIProviderFactory.create_provider') as mock_factory:
-            
-            mock_supported.return_value = ["gpt-4"]
-            mock_provider = AsyncMock()
-            mock_provider.generate_models.side_effect = Exception("AI service unavailable")
-            mock_factory.return_value = mock_provider
-
-            response = client.post("/api/v1/projects/generate", json=generation_request)
-
-            assert response.status_code == 500
-            assert "Model generation failed" in response.json()["detail"]
+        assert response.status_code == 200
+        result = TaskResult.model_validate_json(response.content)
+        assert result.task_id == task_id
+        assert result.status == "SUCCESS"
+        assert result.result["models_generated"] == 3
 
 
 class TestProjectsAPIValidation:
     """Test projects API request validation."""
 
-    def test_generation_request_validation(self, client):
-        """Test model generation request validation."""
-        # Test missing required fields
-        invalid_request = {
-            # Missing schema_data
-            "ai_model": "gpt-4"
-        }
-
-        response = client.post("/api/v1/projects/generate", json=invalid_request)
-        assert response.status_code == 422
-
-    def test_test_run_request_validation(self, client):
-        """Test test run request validation."""
-        # Test missing project_id
-        invalid_request = {
-            "models_to_test": [],
-            "dry_run": True
-        }
-
-        response = client.post("/api/v1/projects/test-run", json=invalid_request)
+    @pytest.mark.parametrize("path,payload", [
+        pytest.param("/api/v1/projects/generate", {"ai_model": "gpt-4"}, id="generate_missing_schema_data"),
+        pytest.param("/api/v1/projects/test-run", {"models_to_test": [], "dry_run": True}, id="test_run_missing_project_id"),
+        pytest.param(
+            "/api/v1/projects/generate", {"schema_data": "invalid_structure", "ai_model": "gpt-4"},
+            id="generate_schema_data_not_dict"
+        ),
+    ])
+    def test_invalid_request_body(self, client, path, payload):
+        """Test request bodies that fail validation are rejected with 422."""
+        response = client.post(path, json=payload)
         assert response.status_code == 422
 
     def test_invalid_project_id_format(self, client):
@@ -317,45 +353,28 @@ class TestProjectsAPIValidation:
         response = client.get(f"/api/v1/projects/{invalid_project_id}")
         assert response.status_code == 404  # Not found due to empty path
 
-    def test_schema_data_structure_validation(self, client):
-        """Test schema data structure validation."""
-        # Test invalid schema data structure
-        invalid_request = {
-            "schema_data": "invalid_structure",  # Should be dict
-            "ai_model": "gpt-4"
-        }
-
-        response = client.post("/api/v1/projects/generate", json=invalid_request)
-        assert response.status_code == 422
-
 
 class TestProjectDownload:
     """Test project download functionality."""
 
-    def test_download_creates_valid_tar_file(self, client):
-        """Test that download creates a valid tar file."""
-        project_id = "test-project-123"
-
-        response = client.get(f"/api/v1/projects/{project_id}/download")
+    @pytest.fixture(scope="class")
+    def download_response(self, app_client):
+        """Download of test-project-123, requested once and shared by the class."""
+        return app_client.get("/api/v1/projects/test-project-123/download")
 
-        assert response.status_code == 200
-        assert response.headers["content-type"] == "application/gzip"
-        
-        # Verify the response contains binary data (tar.gz file)
-        content = response.content
-        assert len(content) > 0
+    def test_download_creates_valid_tar_file(self, download_response):
+        """Test that download creates a valid tar file."""
+        assert download_response.status_code == 200
+        assert download_response.headers["content-type"] == "application/gzip"
         
         # Check tar.gz magic bytes
-        assert content[:2] == b'\x1f\x8b'  # gzip magic bytes
+        assert download_response.content[:2] == b'\x1f\x8b'  # gzip magic bytes
 
-    def test_download_includes_dbt_files(self, client):
+    def test_download_includes_dbt_files(self, download_response):
         """Test that download includes expected dbt files."""
-        project_id = "test-project-123"
-        
         # This would require extracting and examining the tar file
         # For now, we test that the download succeeds
-        response = client.get(f"/api/v1/projects/{project_id}/download")
-        assert response.status_code == 200
+        assert download_response.status_code == 200
 
     def test_download_nonexistent_project(self, client):
         """Test downloading a non-existent project."""
@@ -372,125 +391,22 @@ class TestProjectDownload:
 class TestProjectsIntegration:
     """Integration tests for projects API with other components."""
 
+    @pytest.mark.skip(reason="integration workflow not yet implemented")
     def test_full_generation_workflow(self, client):
         """Test complete model generation workflow."""
         # This would test the integration between schema analysis,
         # AI generation, and project creation
-        pass
 
-    def test_generation_with_real_schema_data(self, client):
+    def test_generation_with_real_schema_data(
+        self, client, mock_staging_model, mock_mart_model, mock_provider, mock_analyzer
+    ):
         """Test generation with realistic schema data."""
-        realistic_schema = {
-            "tables": [
-                {
-                    "name": "customers",
-                    "schema": "public",
-                    "table_type": "table",
-                    "row_count": 10000,
-                    "columns": [
-                        {
-                            "name": "customer_id",
-                            "type": "integer",
-                            "nullable": False,
-                            "primary_key": True,
-                            "foreign_key": False
-                        },
-                        {
-                            "name": "email",
-                            "type": "varchar",
-                            "nullable": False,
-                            "primary_key": False,
-                            "foreign_key": False
-                        },
-                        {
-                            "name": "created_at",
-                            "type": "timestamp",
-                            "nullable": False,
-                            "primary_key": False,
-                            "foreign_key": False
-                        }
-                    ]
-                },
-                {
-                    "name": "orders",
-                    "schema": "public",
-                    "table_type": "table",
-                    "row_count": 50000,
-                    "columns": [
-                        {
-                            "name": "order_id",
-                            "type": "integer",
-                            "nullable": False,
-                            "primary_key": True,
-                            "foreign_key": False
-                        },
-                        {
-                            "name": "customer_id",
-                            "type": "integer",
-                            "nullable": False,
-                            "primary_key": False,
-                            "foreign_key": True
-                        },
-                        {
-                            "name": "total_amount",
-                            "type": "decimal",
-                            "nullable": False,
-                            "primary_key": False,
-                            "foreign_key": False
-                        }
-                    ]
-                }
-            ]
-        }
+        # Mock the AI provider to return realistic models
+        mock_provider.generate_models.return_value = _mock_generation_result(mock_staging_model, mock_mart_model)
+        mock_analyzer.return_value.detect_fact_tables.return_value = ["orders"]
 
-        generation_request = {
-            "schema_data": realistic_schema,
-            "model_types": ["staging", "intermediate", "marts"],
-            "ai_model": "mock",
-            "include_tests": True,
-            "include_docs": True,
-            "async_mode": False
-        }
+        response = _post_json(client, "/api/v1/projects/generate", _REALISTIC_GENERATION_REQUEST)
 
-        # Mock the AI provider to return realistic models
-        mock_staging_model = MagicMock()
-        mock_staging_model.name = "stg_customers"
-        mock_staging_model.model_type = ModelType.STAGING
-        mock_staging_model.sql = "SELECT * FROM {{ source('raw', 'customers') }}"
-        mock_staging_model.description = "Staging customers table"
-        mock_staging_model.tests = []
-        mock_staging_model.dependencies = []
-
-        mock_mart_model = MagicMock()
-        mock_mart_model.name = "dim_customers"
-        mock_mart_model.model_type = ModelType.MARTS
-        mock_mart_model.sql = "SELECT customer_id, email FROM {{ ref('stg_customers') }}"
-        mock_mart_model.description = "Customer dimension"
-        mock_mart_model.tests = []
-        mock_mart_model.dependencies = ["stg_customers"]
-
-        mock_generation_result = MagicMock()
-        mock_generation_result.models = [mock_staging_model, mock_mart_model]
-        mock_generation_result.generation_metadata = {"ai_provider": "mock"}
-
-        with patch('cartridge.api.routes.projects.AIProviderFactory.get_supported_models') as mock_supported, \
-             patch('cartridge.api.routes.projects.AIProviderFactory.create_provider') as mock_factory, \
-             patch('cartridge.api.routes.projects.SchemaAnalyzer') as mock_analyzer:
-            
-            mock_supported.return_value = ["mock"]
-            
-            mock_provider = AsyncMock()
-            mock_provider.generate_models.return_value = mock_generation_result
-            mock_factory.return_value = mock_provider
-            
-            mock_analyzer_instance = MagicMock()
-            mock_analyzer_instance.detect_fact_tables.return_value = ["orders"]
-            mock_analyzer.return_value = mock_analyzer_instance
-
-            response = client.post("/api/v1/projects/generate", json=generation_request)
-
-            assert response.status_code == 200
-            data = response.json()
-            assert len(data["models"]) == 2
-            assert any(model["name"] == "stg_customers" for model in data["models"])
-            assert any(model["name"] == "dim_customers" for model in data["models"])
\ No newline at end of file
+        assert response.status_code == 200
+        result = ProjectGenerationResult.model_validate_json(response.content)
+        assert {model.name for model in result.models} == {"stg_customers", "dim_customers"}
\ No newline at end of file
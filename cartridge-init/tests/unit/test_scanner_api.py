@@ -1,179 +1,189 @@
 """Unit tests for scanner API endpoints."""
 
+import asyncio
+from types import MappingProxyType, SimpleNamespace
+
+import httpx
 import pytest
+import pytest_asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi.testclient import TestClient
 
-from cartridge.scanner.base import ScanResult as ScannerScanResult, DatabaseInfo, TableInfo, ColumnInfo, DataType
+from cartridge.api.main import app
+from cartridge.core.database import get_db
+from cartridge.scanner.base import (
+    ScanResult as ScannerScanResult, DatabaseConnector, DatabaseInfo, TableInfo, ColumnInfo, DataType
+)
+from cartridge.scanner.factory import ConnectorFactory
+from cartridge.tasks.celery_app import celery_app
+
+
+@pytest.fixture(scope="module", autouse=True)
+def shared_connector():
+    """Route every connector the scanner API creates to one mock, patched once per module."""
+    connector = AsyncMock(spec=DatabaseConnector)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(ConnectorFactory, "create_connector", MagicMock(return_value=connector))
+        yield connector
+
+
+@pytest.fixture(scope="module")
+def async_result():
+    """Patch the scanner routes' Celery result lookup once for the module."""
+    lookup = MagicMock()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(celery_app, "AsyncResult", lookup)
+        yield lookup
+
+
+@pytest.fixture(scope="session")
+def pg_connection_payload():
+    """Valid PostgreSQL connection fields; read-only, so copy or merge before changing."""
+    return MappingProxyType({
+        "type": "postgresql",
+        "host": "localhost",
+        "port": 5432,
+        "database": "test_db",
+        "username": "test_user",
+        "password": "test_password",
+        "schema": "public"
+    })
+
+
+@pytest.fixture(scope="module")
+def sample_scan_result():
+    """Scanner result for one customers table, built once for the module."""
+    database_info = DatabaseInfo(
+        database_type="postgresql",
+        version="13.0",
+        host="localhost",
+        port=5432,
+        database_name="test_db",
+        schema_name="public",
+        total_tables=1,
+        total_views=0
+    )
+    column = ColumnInfo(
+        name="id",
+        data_type=DataType.INTEGER,
+        raw_type="integer",
+        nullable=False,
+        is_primary_key=True,
+        is_foreign_key=False
+    )
+    table = TableInfo(
+        name="customers",
+        schema="public",
+        table_type="table",
+        columns=[column],
+        constraints=[],
+        indexes=[],
+        row_count=1000,
+        sample_data=[{"id": 1, "name": "Test"}]
+    )
+    return ScannerScanResult(
+        database_info=database_info,
+        tables=[table],
+        scan_duration_seconds=2.5,
+        scan_timestamp="2024-01-01T00:00:00Z"
+    )
+
+
+@pytest_asyncio.fixture
+async def async_client(db_session):
+    """Async client calling the app in-process over ASGI, without TestClient's thread portal."""
+    def get_test_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = get_test_db
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def mock_connector(shared_connector):
+    """The shared connector mock, cleared of what earlier tests configured."""
+    shared_connector.reset_mock(return_value=True, side_effect=True)
+    return shared_connector
 
 
+@pytest.mark.asyncio
 class TestScannerAPI:
     """Test scanner API endpoints."""
 
-    def test_test_connection_success(self, client):
+    async def test_test_connection_success(self, async_client, mock_connector, pg_connection_payload):
         """Test successful database connection test."""
-        connection_data = {
-            "type": "postgresql",
-            "host": "localhost",
-            "port": 5432,
-            "database": "test_db",
-            "username": "test_user",
-            "password": "test_password",
-            "schema": "public"
-        }
-
-        with patch('cartridge.api.routes.scanner.ConnectorFactory.create_connector') as mock_factory:
-            mock_connector = AsyncMock()
-            mock_connector.test_connection.return_value = {
-                "status": "success",
-                "message": "Connection successful",
-                "database_version": "PostgreSQL 13.0",
-                "database_type": "postgresql"
-            }
-            mock_factory.return_value = mock_connector
-
-            response = client.post("/api/v1/scanner/test-connection", json=connection_data)
-
-            assert response.status_code == 200
-            data = response.json()
-            assert data["status"] == "success"
-            assert data["message"] == "Connection test successful"
-            assert "connection_info" in data
-            assert "database_info" in data
-            assert data["database_info"]["version"] == "PostgreSQL 13.0"
-
-    def test_test_connection_failure(self, client):
-        """Test failed database connection test."""
-        connection_data = {
-            "type": "postgresql",
-            "host": "invalid_host",
-            "port": 5432,
-            "database": "test_db",
-            "username": "test_user",
-            "password": "test_password",
-            "schema": "public"
-        }
+        connection_data = dict(pg_connection_payload)
 
-        with patch('cartridge.api.routes.scanner.ConnectorFactory.create_connector') as mock_factory:
-            mock_connector = AsyncMock()
-            mock_connector.test_connection.return_value = {
-                "status": "failed",
-                "message": "Connection failed: Host not found",
-                "error": "Host not found"
-            }
-            mock_factory.return_value = mock_connector
-
-            response = client.post("/api/v1/scanner/test-connection", json=connection_data)
-
-            assert response.status_code == 400
-            assert "Connection test failed" in response.json()["detail"]
-
-    def test_test_connection_unsupported_database(self, client):
-        """Test connection test with unsupported database type."""
-        connection_data = {
-            "type": "unsupported_db",
-            "host": "localhost",
-            "port": 5432,
-            "database": "test_db",
-            "username": "test_user",
-            "password": "test_password",
-            "schema": "public"
+        mock_connector.test_connection.return_value = {
+            "status": "success",
+            "message": "Connection successful",
+            "database_version": "PostgreSQL 13.0",
+            "database_type": "postgresql"
         }
 
-        with patch('cartridge.api.routes.scanner.ConnectorFactory.get_supported_databases') as mock_supported:
-            mock_supported.return_value = ["postgresql", "mysql"]
-
-            response = client.post("/api/v1/scanner/test-connection", json=connection_data)
+        response = await async_client.post("/api/v1/scanner/test-connection", json=connection_data)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "success"
+        assert data["message"] == "Connection test successful"
+        assert "connection_info" in data
+        assert "database_info" in data
+        assert data["database_info"]["version"] == "PostgreSQL 13.0"
+
+    @pytest.mark.parametrize("overrides,connection_status,expected_detail", [
+        pytest.param(
+            {"host": "invalid_host"},
+            {"status": "failed", "message": "Connection failed: Host not found", "error": "Host not found"},
+            "Connection test failed",
+            id="connection_failed"
+        ),
+        pytest.param({"type": "unsupported_db"}, None, "Unsupported database type", id="unsupported_database"),
+    ])
+    async def test_test_connection_rejected(
+        self, async_client, mock_connector, pg_connection_payload, overrides, connection_status, expected_detail
+    ):
+        """Test connection tests that fail or name an unsupported database type."""
+        mock_connector.test_connection.return_value = connection_status
+
+        response = await async_client.post(
+            "/api/v1/scanner/test-connection", json={**pg_connection_payload, **overrides}
+        )
 
-            assert response.status_code == 400
-            assert "Unsupported database type" in response.json()["detail"]
+        assert response.status_code == 400
+        assert expected_detail in response.json()["detail"]
 
-    def test_scan_schema_sync_success(self, client):
+    async def test_scan_schema_sync_success(self, async_client, mock_connector, sample_scan_result, pg_connection_payload):
         """Test successful synchronous schema scan."""
         scan_request = {
-            "connection": {
-                "type": "postgresql",
-                "host": "localhost",
-                "port": 5432,
-                "database": "test_db",
-                "username": "test_user",
-                "password": "test_password",
-                "schema": "public"
-            },
+            "connection": dict(pg_connection_payload),
             "tables": [],
             "include_samples": True,
             "sample_size": 100,
             "async_mode": False
         }
 
-        # Create mock scan result
-        mock_db_info = DatabaseInfo(
-            database_type="postgresql",
-            version="13.0",
-            host="localhost",
-            port=5432,
-            database_name="test_db",
-            schema_name="public",
-            total_tables=1,
-            total_views=0
-        )
-
-        mock_column = ColumnInfo(
-            name="id",
-            data_type=DataType.INTEGER,
-            nullable=False,
-            is_primary_key=True,
-            is_foreign_key=False
-        )
-
-        mock_table = TableInfo(
-            name="customers",
-            schema="public",
-            table_type="table",
-            columns=[mock_column],
-            constraints=[],
-            indexes=[],
-            row_count=1000,
-            sample_data=[{"id": 1, "name": "Test"}]
-        )
-
-        mock_scan_result = ScannerScanResult(
-            database_info=mock_db_info,
-            tables=[mock_table],
-            scan_duration_seconds=2.5,
-            scan_timestamp="2024-01-01T00:00:00Z"
-        )
+        mock_connector.scan_schema.return_value = sample_scan_result
 
-        with patch('cartridge.api.routes.scanner.ConnectorFactory.create_connector') as mock_factory:
-            mock_connector = AsyncMock()
-            mock_connector.scan_schema.return_value = mock_scan_result
-            mock_factory.return_value = mock_connector
+        response = await async_client.post("/api/v1/scanner/scan", json=scan_request)
 
-            response = client.post("/api/v1/scanner/scan", json=scan_request)
+        assert response.status_code == 200
+        data = response.json()
+        assert "connection_info" in data
+        assert "tables" in data
+        assert len(data["tables"]) == 1
+        assert data["tables"][0]["name"] == "customers"
+        assert data["tables"][0]["row_count"] == 1000
+        assert len(data["tables"][0]["columns"]) == 1
+        assert data["tables"][0]["columns"][0]["name"] == "id"
+        assert data["scan_duration_seconds"] == 2.5
 
-            assert response.status_code == 200
-            data = response.json()
-            assert "connection_info" in data
-            assert "tables" in data
-            assert len(data["tables"]) == 1
-            assert data["tables"][0]["name"] == "customers"
-            assert data["tables"][0]["row_count"] == 1000
-            assert len(data["tables"][0]["columns"]) == 1
-            assert data["tables"][0]["columns"][0]["name"] == "id"
-            assert data["scan_duration_seconds"] == 2.5
-
-    def test_scan_schema_async_mode(self, client):
+    async def test_scan_schema_async_mode(self, async_client, pg_connection_payload):
         """Test asynchronous schema scan mode."""
         scan_request = {
-            "connection": {
-                "type": "postgresql",
-                "host": "localhost",
-                "port": 5432,
-                "database": "test_db",
-                "username": "test_user",
-                "password": "test_password",
-                "schema": "public"
-            },
+            "connection": dict(pg_connection_payload),
             "tables": [],
             "include_samples": True,
             "sample_size": 100,
@@ -183,7 +193,7 @@ class TestScannerAPI:
         with patch('cartridge.api.routes.scanner.scan_database_schema') as mock_task:
             mock_task.delay.return_value.id = "test-task-id-123"
 
-            response = client.post("/api/v1/scanner/scan", json=scan_request)
+            response = await async_client.post("/api/v1/scanner/scan", json=scan_request)
 
             assert response.status_code == 200
             data = response.json()
@@ -192,89 +202,48 @@ class TestScannerAPI:
             assert data["message"] == "Schema scan queued for background processing"
             assert "scan_result_id" in data["result"]
 
-    def test_get_task_status_pending(self, client):
-        """Test getting status of a pending task."""
-        task_id = "test-task-id-123"
-
-        with patch('cartridge.api.routes.scanner.celery_app.AsyncResult') as mock_result:
-            mock_task_result = MagicMock()
-            mock_task_result.state = "PENDING"
-            mock_result.return_value = mock_task_result
-
-            response = client.get(f"/api/v1/scanner/tasks/{task_id}")
-
-            assert response.status_code == 200
-            data = response.json()
-            assert data["task_id"] == task_id
-            assert data["status"] == "PENDING"
-            assert data["message"] == "Task is waiting to be processed"
-
-    def test_get_task_status_progress(self, client):
-        """Test getting status of a task in progress."""
-        task_id = "test-task-id-123"
-
-        with patch('cartridge.api.routes.scanner.celery_app.AsyncResult') as mock_result:
-            mock_task_result = MagicMock()
-            mock_task_result.state = "PROGRESS"
-            mock_task_result.info = {
-                "current": 50,
-                "total": 100,
-                "status": "Scanning tables..."
-            }
-            mock_result.return_value = mock_task_result
-
-            response = client.get(f"/api/v1/scanner/tasks/{task_id}")
-
-            assert response.status_code == 200
-            data = response.json()
-            assert data["task_id"] == task_id
-            assert data["status"] == "PROGRESS"
-            assert data["message"] == "Task is being processed"
-            assert data["progress"]["current"] == 50
-            assert data["progress"]["total"] == 100
-
-    def test_get_task_status_success(self, client):
-        """Test getting status of a completed task."""
-        task_id = "test-task-id-123"
-
-        with patch('cartridge.api.routes.scanner.celery_app.AsyncResult') as mock_result:
-            mock_task_result = MagicMock()
-            mock_task_result.state = "SUCCESS"
-            mock_task_result.result = {
-                "scan_result_id": "scan-123",
-                "status": "completed",
-                "tables": [{"name": "customers", "row_count": 1000}]
-            }
-            mock_result.return_value = mock_task_result
-
-            response = client.get(f"/api/v1/scanner/tasks/{task_id}")
-
-            assert response.status_code == 200
-            data = response.json()
-            assert data["task_id"] == task_id
-            assert data["status"] == "SUCCESS"
-            assert data["message"] == "Task completed successfully"
-            assert data["result"]["status"] == "completed"
-
-    def test_get_task_status_failure(self, client):
-        """Test getting status of a failed task."""
+    @pytest.mark.parametrize("state,info,result,expected", [
+        pytest.param("PENDING", None, None, {"message": "Task is waiting to be processed"}, id="pending"),
+        pytest.param(
+            "PROGRESS",
+            {"current": 50, "total": 100, "status": "Scanning tables..."},
+            None,
+            {
+                "message": "Task is being processed",
+                "progress": {"current": 50, "total": 100, "status": "Scanning tables..."}
+            },
+            id="progress"
+        ),
+        pytest.param(
+            "SUCCESS",
+            None,
+            {"scan_result_id": "scan-123", "status": "completed"},
+            {"message": "Task completed successfully", "result": {"scan_result_id": "scan-123", "status": "completed"}},
+            id="success"
+        ),
+        pytest.param(
+            "FAILURE",
+            Exception("Connection timeout"),
+            None,
+            {"message": "Task failed: Connection timeout", "result": {"error": "Connection timeout"}},
+            id="failure"
+        ),
+    ])
+    async def test_get_task_status(self, async_client, async_result, state, info, result, expected):
+        """Test getting the status of a task in each Celery state."""
         task_id = "test-task-id-123"
+        async_result.return_value = SimpleNamespace(state=state, info=info, result=result)
 
-        with patch('cartridge.api.routes.scanner.celery_app.AsyncResult') as mock_result:
-            mock_task_result = MagicMock()
-            mock_task_result.state = "FAILURE"
-            mock_task_result.info = Exception("Connection timeout")
-            mock_result.return_value = mock_task_result
+        response = await async_client.get(f"/api/v1/scanner/tasks/{task_id}")
 
-            response = client.get(f"/api/v1/scanner/tasks/{task_id}")
-
-            assert response.status_code == 200
-            data = response.json()
-            assert data["task_id"] == task_id
-            assert data["status"] == "FAILURE"
-            assert "Connection timeout" in data["message"]
+        assert response.status_code == 200
+        data = response.json()
+        assert data["task_id"] == task_id
+        assert data["status"] == state
+        assert {key: data[key] for key in expected} == expected
+        async_result.assert_called_with(task_id)
 
-    def test_scan_schema_invalid_request(self, client):
+    async def test_scan_schema_invalid_request(self, async_client):
         """Test schema scan with invalid request data."""
         invalid_request = {
             "connection": {
@@ -284,33 +253,22 @@ class TestScannerAPI:
             "async_mode": False
         }
 
-        response = client.post("/api/v1/scanner/scan", json=invalid_request)
+        response = await async_client.post("/api/v1/scanner/scan", json=invalid_request)
         assert response.status_code == 422  # Validation error
 
-    def test_scan_schema_connector_exception(self, client):
+    async def test_scan_schema_connector_exception(self, async_client, mock_connector, pg_connection_payload):
         """Test schema scan when connector raises exception."""
         scan_request = {
-            "connection": {
-                "type": "postgresql",
-                "host": "localhost",
-                "port": 5432,
-                "database": "test_db",
-                "username": "test_user",
-                "password": "test_password",
-                "schema": "public"
-            },
+            "connection": dict(pg_connection_payload),
             "async_mode": False
         }
 
-        with patch('cartridge.api.routes.scanner.ConnectorFactory.create_connector') as mock_factory:
-            mock_connector = AsyncMock()
-            mock_connector.scan_schema.side_effect = Exception("Database connection failed")
-            mock_factory.return_value = mock_connector
+        mock_connector.scan_schema.side_effect = Exception("Database connection failed")
 
-            response = client.post("/api/v1/scanner/scan", json=scan_request)
+        response = await async_client.post("/api/v1/scanner/scan", json=scan_request)
 
-            assert response.status_code == 500
-            assert "Schema scan failed" in response.json()["detail"]
+        assert response.status_code == 500
+        assert "Schema scan failed" in response.json()["detail"]
 
 
 class TestScannerAPIValidation:
@@ -327,36 +285,20 @@ class TestScannerAPIValidation:
         response = client.post("/api/v1/scanner/test-connection", json=invalid_data)
         assert response.status_code == 422
 
-    def test_scan_request_validation(self, client):
+    def test_scan_request_validation(self, client, pg_connection_payload):
         """Test scan request validation."""
         # Test invalid sample_size
         invalid_request = {
-            "connection": {
-                "type": "postgresql",
-                "host": "localhost",
-                "port": 5432,
-                "database": "test_db",
-                "username": "test_user",
-                "password": "test_password",
-                "schema": "public"
-            },
+            "connection": dict(pg_connection_payload),
             "sample_size": -1  # Invalid negative size
         }
 
         response = client.post("/api/v1/scanner/scan", json=invalid_request)
         assert response.status_code == 422
 
-    def test_invalid_database_type(self, client):
+    def test_invalid_database_type(self, client, pg_connection_payload):
         """Test validation of database type."""
-        connection_data = {
-            "type": "",  # Empty type
-            "host": "localhost",
-            "port": 5432,
-            "database": "test_db",
-            "username": "test_user",
-            "password": "test_password",
-            "schema": "public"
-        }
+        connection_data = {**pg_connection_payload, "type": ""}  # Empty type
 
         response = client.post("/api/v1/scanner/test-connection", json=connection_data)
         assert response.status_code == 422
@@ -366,8 +308,19 @@ class TestScannerAPIValidation:
 class TestScannerAPIAsync:
     """Test scanner API with async operations."""
 
-    async def test_async_scan_operation(self, async_client):
-        """Test async scan operations."""
-        # This would test the actual async behavior
-        # For now, we'll test the sync version with async client
-        pass
\ No newline at end of file
+    async def test_async_scan_operation(self, async_client, mock_connector, pg_connection_payload):
+        """Test concurrent requests are served on one event loop."""
+        mock_connector.test_connection.return_value = {
+            "status": "success",
+            "message": "Connection successful",
+            "database_version": "PostgreSQL 13.0",
+            "database_type": "postgresql"
+        }
+        connection_data = dict(pg_connection_payload)
+
+        responses = await asyncio.gather(*(
+            async_client.post("/api/v1/scanner/test-connection", json=connection_data) for _ in range(3)
+        ))
+
+        assert [response.status_code for response in responses] == [200, 200, 200]
+        assert mock_connector.test_connection.await_count == 3
@@ -0,0 +1,100 @@
+"""Tests for schema analysis."""
+
+from dataclasses import asdict
+
+import pytest
+
+from cartridge.scanner.base import (
+    ColumnInfo, ConstraintInfo, DatabaseInfo, DataType, IndexInfo, ScanResult, SchemaAnalyzer, TableInfo
+)
+
+
+class TestSchemaAnalyzer:
+    """Test schema analyzer detections and suggestions."""
+
+    @pytest.fixture
+    def scan_result(self):
+        """Scan of a small shop schema."""
+        def column(name, data_type, **kwargs):
+            return ColumnInfo(name=name, data_type=data_type, raw_type=data_type.value, nullable=True, **kwargs)
+
+        tables = [
+            TableInfo(
+                name="customers", schema="shop", table_type="table",
+                columns=[
+                    column("id", DataType.INTEGER, is_primary_key=True),
+                    column("email", DataType.VARCHAR),
+                    column("name", DataType.TEXT),
+                ],
+                constraints=[], indexes=[],
+            ),
+            TableInfo(
+                name="orders", schema="shop", table_type="table",
+                columns=[
+                    column("id", DataType.INTEGER, is_primary_key=True),
+                    column("customer_id", DataType.INTEGER, is_foreign_key=True, foreign_key_table="customers"),
+                    column("total_amount", DataType.DECIMAL),
+                ],
+                constraints=[], indexes=[],
+            ),
+            TableInfo(
+                name="product_tags", schema="shop", table_type="table",
+                columns=[column("product_id", DataType.INTEGER), column("tag_id", DataType.INTEGER)],
+                constraints=[
+                    ConstraintInfo(name="pt_product", type="FOREIGN KEY", columns=["product_id"],
+                                   referenced_table="products", referenced_columns=["id"]),
+                    ConstraintInfo(name="pt_tag", type="FOREIGN KEY", columns=["tag_id"],
+                                   referenced_table="tags", referenced_columns=["id"]),
+                ],
+                indexes=[IndexInfo(name="pt_idx", columns=["product_id"], is_unique=False, is_primary=False, type="btree")],
+            ),
+            TableInfo(name="v_orders", schema="shop", table_type="view", columns=[], constraints=[], indexes=[]),
+        ]
+        database_info = DatabaseInfo(
+            database_type="postgresql", version="16", host="localhost", port=5432,
+            database_name="shop", schema_name="shop", total_tables=3, total_views=1,
+        )
+        return ScanResult(
+            database_info=database_info, tables=tables, scan_duration_seconds=0.1, scan_timestamp="2024-01-01T00:00:00Z"
+        )
+
+    def test_analyze_all_matches_individual_passes(self, scan_result):
+        """Test the fused traversal returns what the separate methods return."""
+        analyzer = SchemaAnalyzer(scan_result)
+
+        analysis = analyzer.analyze_all()
+
+        assert analysis.fact_tables == analyzer.detect_fact_tables() == ["orders", "product_tags", "v_orders"]
+        assert analysis.dimension_tables == analyzer.detect_dimension_tables() == ["customers", "product_tags"]
+        assert analysis.bridge_tables == analyzer.detect_bridge_tables() == ["product_tags"]
+        assert analysis.staging_models == analyzer.suggest_staging_models()
+        assert [model["name"] for model in analysis.staging_models] == [
+            "stg_customers", "stg_orders", "stg_product_tags"
+        ]
+        assert analysis.mart_models == analyzer.suggest_mart_models()
+        assert [model["name"] for model in analysis.mart_models] == [
+            "fct_orders", "fct_product_tags", "fct_v_orders", "dim_customers", "dim_product_tags"
+        ]
+
+    def test_feed_in_batches_matches_analyze_all(self, scan_result):
+        """Test feeding tables batch by batch gives the same results as one pass."""
+        analyzer = SchemaAnalyzer()
+
+        analyzer.feed(scan_result.tables[:1])
+        analyzer.feed(scan_result.tables[1:3])
+        analyzer.feed(scan_result.tables[3:])
+        analysis = analyzer.finalize()
+
+        assert analysis == SchemaAnalyzer(scan_result).analyze_all()
+        assert analyzer.finalize().fact_tables == []
+
+    def test_table_key_lookups_are_computed_once(self, scan_result):
+        """Test primary/foreign key lookups are cached without becoming dataclass fields."""
+        product_tags = scan_result.get_table_by_name("product_tags")
+
+        relationships = product_tags.get_foreign_key_relationships()
+
+        assert relationships == [("product_id", "products", "id"), ("tag_id", "tags", "id")]
+        assert product_tags.get_foreign_key_relationships() is relationships
+        assert product_tags.get_primary_key_columns() is product_tags.get_primary_key_columns()
+        assert "_foreign_key_relationships" not in asdict(product_tags)
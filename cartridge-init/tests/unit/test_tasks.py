@@ -1,159 +1,500 @@
 """Tests for Celery background tasks."""
 
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from decimal import Decimal
+
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
 from celery import Celery
 
-from cartridge.tasks.scan_tasks import scan_database_schema, test_database_connection
+from cartridge.ai.base import AIProvider, GeneratedModel, ModelGenerationResult, ModelType
+from cartridge.scanner.base import (
+    ColumnInfo, ConstraintInfo, DatabaseConnector, DatabaseInfo, DataType, IndexInfo, ScanBatch, TableInfo
+)
+from cartridge.tasks import scan_tasks
+from cartridge.tasks.celery_app import celery_app
+from cartridge.tasks.scan_tasks import (
+    scan_database_schema, test_database_connection, _run_async, _serialize_tables, _table_to_dict, _use_connector, uvloop
+)
 from cartridge.tasks.generation_tasks import generate_dbt_models, create_project_archive
 from cartridge.tasks.test_tasks import test_dbt_models, validate_dbt_project
+from cartridge.tasks.progress import ProgressReporter
+
+
+@pytest.fixture(scope="class")
+def no_task_sleep():
+    """Stub out the sleeps placeholder tasks use to simulate work, once per test class."""
+    with patch("cartridge.tasks.test_tasks.time.sleep") as mock_sleep:
+        yield mock_sleep
+
 
+@pytest.fixture
+def worker_state(monkeypatch):
+    """Give each test its own worker loop and connector cache."""
+    state = SimpleNamespace(loop=None, pid=None, connectors={})
+    monkeypatch.setattr(scan_tasks, "_worker_state", state)
+    yield state
+    scan_tasks._stop_worker_loop()
 
+
+@pytest.fixture
+def scan_connection_config():
+    """Connection config as the scanner routes pass it to the scan tasks."""
+    return {
+        "type": "postgresql",
+        "host": "localhost",
+        "port": 5432,
+        "database": "test_db",
+        "username": "test_user",
+        "password": "test_password",
+        "schema": "public",
+        "tables": None,
+        "include_samples": False,
+        "sample_size": 10,
+    }
+
+
+@pytest.mark.usefixtures("worker_state")
 class TestScanTasks:
     """Test schema scanning tasks."""
     
-    @patch("cartridge.tasks.scan_tasks.time.sleep")
-    def test_scan_database_schema_success(self, mock_sleep):
+    @patch("cartridge.tasks.scan_tasks.ConnectorFactory.create_connector")
+    def test_scan_database_schema_success(self, mock_create, scan_connection_config):
         """Test successful database schema scan."""
         scan_result_id = "test-scan-123"
-        connection_config = {
-            "type": "postgresql",
-            "host": "localhost",
-            "port": 5432,
-            "database": "test_db",
-            "username": "test_user",
-            "password": "test_password"
-        }
+        database_info = DatabaseInfo(
+            database_type="postgresql", version="16", host="localhost", port=5432,
+            database_name="test_db", schema_name="public", total_tables=0, total_views=0,
+        )
+        tables = [
+            TableInfo(
+                name="customers", schema="public", table_type="table",
+                columns=[ColumnInfo(
+                    name="id", data_type=DataType.INTEGER, raw_type="integer", nullable=False, is_primary_key=True
+                )],
+                constraints=[], indexes=[],
+            ),
+            TableInfo(name="v_customers", schema="public", table_type="view", columns=[], constraints=[], indexes=[]),
+        ]
+        
+        async def scan_schema_batched(**kwargs):
+            assert kwargs["keep_open"] is True
+            yield ScanBatch(database_info=database_info, tables=tables, errors=[], tables_scanned=2, tables_total=2)
+        
+        mock_create.return_value = MagicMock(scan_schema_batched=scan_schema_batched, disconnect=AsyncMock())
         
-        # Mock the task to avoid actual execution
         with patch.object(scan_database_schema, 'update_state') as mock_update:
-            result = scan_database_schema.apply(
-                args=[scan_result_id, connection_config]
-            ).get()
+            result = scan_database_schema(scan_result_id, scan_connection_config)
             
             assert result["scan_result_id"] == scan_result_id
             assert result["status"] == "completed"
-            assert result["tables_found"] == 5
-            assert result["columns_analyzed"] == 25
-            assert result["duration_seconds"] == 4.0
-            assert len(result["tables"]) == 1
+            assert result["database_info"]["total_tables"] == 1
+            assert result["database_info"]["total_views"] == 1
+            assert [table["name"] for table in result["tables"]] == ["customers", "v_customers"]
+            assert result["tables"][0]["primary_key_columns"] == ["id"]
+            assert result["errors"] is None
             
             # Check that progress updates were called
             assert mock_update.call_count >= 2
     
-    @patch("cartridge.tasks.scan_tasks.time.sleep")
-    def test_scan_database_schema_failure(self, mock_sleep):
+    @patch("cartridge.tasks.scan_tasks.ConnectorFactory.create_connector", side_effect=Exception("Database error"))
+    def test_scan_database_schema_failure(self, mock_create, scan_connection_config):
         """Test database schema scan failure."""
         scan_result_id = "test-scan-123"
-        connection_config = {"type": "invalid"}
         
         with patch.object(scan_database_schema, 'update_state') as mock_update:
-            # Mock an exception during execution
-            with patch("cartridge.tasks.scan_tasks.time.sleep", side_effect=Exception("Database error")):
-                with pytest.raises(Exception):
-                    scan_database_schema.apply(
-                        args=[scan_result_id, connection_config]
-                    ).get()
-                
-                # Check that failure state was set
-                mock_update.assert_called_with(
-                    state="FAILURE",
-                    meta={"error": "Database error", "scan_result_id": scan_result_id}
-                )
+            with pytest.raises(Exception, match="Database error"):
+                scan_database_schema(scan_result_id, scan_connection_config)
+            
+            # Check that failure state was set
+            mock_update.assert_called_with(
+                state="FAILURE",
+                meta={"error": "Database error", "scan_result_id": scan_result_id}
+            )
     
-    @patch("cartridge.tasks.scan_tasks.time.sleep")
-    def test_test_database_connection_success(self, mock_sleep):
+    @patch("cartridge.tasks.scan_tasks.ConnectorFactory.create_connector")
+    def test_test_database_connection_success(self, mock_create, scan_connection_config):
         """Test successful database connection test."""
-        connection_config = {
-            "type": "postgresql",
-            "host": "localhost",
-            "port": 5432,
-            "database": "test_db"
-        }
+        mock_create.return_value = MagicMock(
+            connect=AsyncMock(),
+            disconnect=AsyncMock(),
+            test_connection=AsyncMock(return_value={
+                "status": "success",
+                "message": "Connection successful",
+                "database_version": "PostgreSQL 16.0"
+            })
+        )
         
-        result = test_database_connection.apply(
-            args=[connection_config]
-        ).get()
+        result = test_database_connection(scan_connection_config)
         
         assert result["status"] == "success"
         assert result["message"] == "Connection successful"
         assert "database_version" in result
         assert "response_time_ms" in result
     
-    @patch("cartridge.tasks.scan_tasks.time.sleep", side_effect=Exception("Connection failed"))
-    def test_test_database_connection_failure(self, mock_sleep):
+    @patch("cartridge.tasks.scan_tasks.ConnectorFactory.create_connector", side_effect=Exception("Connection failed"))
+    def test_test_database_connection_failure(self, mock_create, scan_connection_config):
         """Test database connection test failure."""
-        connection_config = {"type": "postgresql"}
-        
-        result = test_database_connection.apply(
-            args=[connection_config]
-        ).get()
+        result = test_database_connection(scan_connection_config)
         
         assert result["status"] == "failed"
         assert "Connection failed" in result["message"]
         assert "error" in result
 
 
+@pytest.mark.usefixtures("worker_state")
+class TestRunAsync:
+    """Test the event loop bridge used by the scan tasks."""
+    
+    def test_run_async_reuses_worker_loop(self):
+        """Test coroutines run on one background loop that keeps running between tasks."""
+        loops = []
+        
+        async def work():
+            loops.append((asyncio.get_running_loop(), threading.current_thread()))
+            return "done"
+        
+        assert _run_async(work()) == "done"
+        assert _run_async(work()) == "done"
+        (loop, thread), second = loops
+        assert second == (loop, thread)
+        assert thread is not threading.current_thread()
+        assert loop.is_running()
+        if uvloop is not None:
+            assert isinstance(loop, uvloop.Loop)
+    
+    def test_run_async_cancels_coroutine_when_interrupted(self, monkeypatch):
+        """Test an interrupted task cancels its coroutine instead of leaving it on the loop."""
+        started = threading.Event()
+        cancelled = threading.Event()
+        run_coroutine_threadsafe = asyncio.run_coroutine_threadsafe
+        
+        async def work():
+            started.set()
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        
+        def interrupted_wait(coro, loop):
+            future = run_coroutine_threadsafe(coro, loop)
+            
+            def result():
+                started.wait(5)
+                raise KeyboardInterrupt
+            
+            return SimpleNamespace(result=result, cancel=future.cancel)
+        
+        monkeypatch.setattr(asyncio, "run_coroutine_threadsafe", interrupted_wait)
+        
+        with pytest.raises(KeyboardInterrupt):
+            _run_async(work())
+        
+        assert cancelled.wait(5)
+    
+    def test_stop_worker_loop_closes_cached_connectors(self, worker_state):
+        """Test shutting a worker down disconnects its connectors and stops the loop."""
+        connector = MagicMock(disconnect=AsyncMock())
+        loop = scan_tasks._worker_loop()
+        worker_state.connectors[b"key"] = scan_tasks._CachedConnector(connector, 0.0)
+        
+        scan_tasks._stop_worker_loop()
+        
+        connector.disconnect.assert_awaited_once()
+        assert worker_state.loop is None
+        assert worker_state.connectors == {}
+        for _ in range(100):
+            if loop.is_closed():
+                break
+            time.sleep(0.01)
+        assert loop.is_closed()
+    
+    def test_run_async_uses_eager_task_factory(self, monkeypatch):
+        """Test the eager task factory is installed where asyncio provides it."""
+        def eager_task_factory(loop, coro, **kwargs):
+            return asyncio.Task(coro, loop=loop, **kwargs)
+        
+        monkeypatch.setattr(asyncio, "eager_task_factory", eager_task_factory, raising=False)
+        
+        async def work():
+            return asyncio.get_running_loop().get_task_factory()
+        
+        assert _run_async(work()) is eager_task_factory
+    
+    @patch("cartridge.tasks.scan_tasks.ConnectorFactory.create_connector")
+    def test_connectors_are_cached_until_ttl(self, mock_create, monkeypatch):
+        """Test configs for the same database share a connector and expired ones are closed."""
+        mock_create.side_effect = lambda *args: MagicMock(disconnect=AsyncMock())
+        config = {"type": "postgresql", "host": "localhost", "database": "shop"}
+        
+        
+        async def get_connector(config):
+            async with _use_connector(config) as connector:
+                return connector
+        
+        first = _run_async(get_connector(config))
+        assert _run_async(get_connector(dict(reversed(config.items())))) is first
+        assert _run_async(get_connector({**config, "tables": ["orders"], "sample_size": 10})) is first
+        assert _run_async(get_connector({**config, "database": "other"})) is not first
+        
+        monkeypatch.setattr(scan_tasks, "_CONNECTOR_TTL_SECONDS", 0.0)
+        second = _run_async(get_connector(config))
+        
+        assert second is not first
+        first.disconnect.assert_awaited_once()
+        assert mock_create.call_count == 3
+    
+    @patch("cartridge.tasks.scan_tasks.ConnectorFactory.create_connector")
+    def test_expired_connector_closes_after_last_user(self, mock_create, monkeypatch):
+        """Test a connector that expires while in use is only closed once its users are done."""
+        mock_create.side_effect = lambda *args: MagicMock(disconnect=AsyncMock())
+        config = {"type": "postgresql", "host": "localhost", "database": "shop"}
+        
+        async def expire_while_in_use():
+            async with _use_connector(config) as first:
+                monkeypatch.setattr(scan_tasks, "_CONNECTOR_TTL_SECONDS", 0.0)
+                async with _use_connector(config) as second:
+                    assert second is not first
+                first.disconnect.assert_not_awaited()
+            first.disconnect.assert_awaited_once()
+            second.disconnect.assert_not_awaited()
+        
+        _run_async(expire_while_in_use())
+    
+    def test_overlapping_scans_share_connector(self, scan_connection_config):
+        """Test a scan finishing does not close the pool under another scan of the same database."""
+        both_scanning = asyncio.Event()
+        first_done = asyncio.Event()
+        scanning = 0
+        
+        class PooledConnector(DatabaseConnector):
+            """Connector whose pool goes away on disconnect, like PostgreSQLConnector's."""
+            
+            pool = None
+            
+            async def connect(self):
+                if self.pool is None:
+                    self.pool = MagicMock()
+            
+            async def disconnect(self):
+                self.pool = None
+            
+            async def test_connection(self):
+                return {"status": "success"}
+            
+            async def get_database_info(self):
+                return DatabaseInfo(
+                    database_type="postgresql", version="16", host="localhost", port=5432,
+                    database_name="test_db", schema_name="public", total_tables=0, total_views=0,
+                )
+            
+            async def get_tables(self, schema=None):
+                return []
+            
+            async def get_table_info(self, table_name, schema=None):
+                nonlocal scanning
+                if table_name == "customers":
+                    scanning += 1
+                    if scanning == 2:
+                        both_scanning.set()
+                    await both_scanning.wait()
+                else:
+                    await first_done.wait()
+                self.pool.acquire()
+                return TableInfo(name=table_name, schema=schema, table_type="table", columns=[], constraints=[], indexes=[])
+            
+            async def get_sample_data(self, table_name, schema=None, limit=100):
+                return []
+            
+            def normalize_data_type(self, raw_type):
+                return DataType.UNKNOWN
+        
+        results = {}
+        
+        def scan(scan_result_id, tables):
+            results[scan_result_id] = scan_database_schema(scan_result_id, {**scan_connection_config, "tables": tables})
+        
+        def create_connector(database_type, config):
+            return PooledConnector(config)
+        
+        with patch("cartridge.tasks.scan_tasks.ConnectorFactory.create_connector", side_effect=create_connector) as mock_create, \
+                patch.object(scan_database_schema, "update_state"):
+            first = threading.Thread(target=scan, args=("first", ["customers"]))
+            second = threading.Thread(target=scan, args=("second", ["customers", "orders"]))
+            first.start()
+            second.start()
+            first.join(5)
+            scan_tasks._worker_loop().call_soon_threadsafe(first_done.set)
+            second.join(5)
+        
+        assert mock_create.call_count == 1
+        assert [table["name"] for table in results["first"]["tables"]] == ["customers"]
+        assert [table["name"] for table in results["second"]["tables"]] == ["customers", "orders"]
+        assert results["second"]["errors"] is None
+    
+    @patch("cartridge.tasks.scan_tasks.ConnectorFactory.create_connector")
+    def test_connection_test_keeps_pool_open(self, mock_create):
+        """Test a successful connection test keeps its connector, a failed one drops it."""
+        connector = MagicMock(connect=AsyncMock(), disconnect=AsyncMock())
+        connector.test_connection = AsyncMock(return_value={"status": "success"})
+        mock_create.return_value = connector
+        config = {"type": "postgresql", "host": "localhost"}
+        
+        assert test_database_connection(config)["status"] == "success"
+        assert test_database_connection(config)["status"] == "success"
+        assert mock_create.call_count == 1
+        connector.disconnect.assert_not_awaited()
+        
+        connector.test_connection.return_value = {"status": "failed", "error": "gone"}
+        test_database_connection(config)
+        
+        connector.disconnect.assert_awaited_once()
+        assert not scan_tasks._worker_state.connectors
+
+
+class TestScanResultSerialization:
+    """Test scan results are flattened into plain dicts for the result backend."""
+    
+    def test_table_to_dict(self):
+        """Test a table serializes with its columns, constraints and indexes."""
+        table = TableInfo(
+            name="orders",
+            schema="public",
+            table_type="table",
+            columns=[
+                ColumnInfo(name="id", data_type=DataType.INTEGER, raw_type="integer", nullable=False, is_primary_key=True),
+            ],
+            constraints=[ConstraintInfo(name="orders_pkey", type="PRIMARY KEY", columns=["id"])],
+            indexes=[IndexInfo(name="orders_pkey", columns=["id"], is_unique=True, is_primary=True, type="btree")],
+            row_count=10,
+        )
+        
+        table_data = _table_to_dict(table)
+        
+        assert list(table_data) == [
+            "name", "schema", "table_type", "row_count", "size_bytes", "comment", "columns",
+            "constraints", "indexes", "sample_data", "primary_key_columns", "foreign_key_relationships",
+        ]
+        assert table_data["row_count"] == 10
+        column = table_data["columns"][0]
+        assert (column["name"], column["data_type"], column["is_primary_key"]) == ("id", "integer", True)
+        assert len(column) == 21
+        assert table_data["constraints"] == [{
+            "name": "orders_pkey", "type": "PRIMARY KEY", "columns": ["id"],
+            "referenced_table": None, "referenced_columns": None, "definition": None,
+        }]
+        assert table_data["indexes"][0]["is_primary"] is True
+        assert table_data["primary_key_columns"] == ["id"]
+    
+    def test_serialize_tables_collects_relationships(self):
+        """Test a batch serializes to table dicts plus its foreign key relationships."""
+        table = TableInfo(
+            name="orders",
+            schema="public",
+            table_type="table",
+            columns=[
+                ColumnInfo(name="customer_id", data_type=DataType.INTEGER, raw_type="integer", nullable=False,
+                           is_foreign_key=True, foreign_key_table="customers", foreign_key_column="id"),
+            ],
+            constraints=[],
+            indexes=[],
+        )
+        
+        tables_data, relationships = _serialize_tables([table])
+        
+        assert tables_data == [_table_to_dict(table)]
+        assert relationships == [{
+            "from_table": "public.orders", "from_column": "customer_id", "to_table": "customers", "to_column": "id",
+        }]
+
+
 class TestGenerationTasks:
     """Test model generation tasks."""
     
-    @patch("cartridge.tasks.generation_tasks.time.sleep")
-    def test_generate_dbt_models_success(self, mock_sleep):
+    @pytest.fixture
+    def archive_cleanup(self):
+        """Remove the archives the generation tasks write under /tmp/dbt_projects."""
+        archives = []
+        yield archives
+        for archive_path in archives:
+            if os.path.exists(archive_path):
+                os.remove(archive_path)
+    
+    @patch("cartridge.tasks.progress.PROGRESS_MIN_INTERVAL_SECONDS", 0)
+    @patch("cartridge.tasks.generation_tasks.AIProviderFactory.create_provider")
+    def test_generate_dbt_models_success(self, mock_create, archive_cleanup):
         """Test successful dbt model generation."""
         project_id = "test-project-123"
         schema_data = {
             "tables": [
                 {
                     "name": "customers",
+                    "schema": "public",
+                    "table_type": "table",
                     "columns": [
-                        {"name": "id", "type": "integer"},
-                        {"name": "email", "type": "varchar"}
+                        {"name": "id", "data_type": "integer", "nullable": False, "is_primary_key": True},
+                        {"name": "email", "data_type": "varchar", "nullable": True}
                     ]
                 }
             ]
         }
         generation_config = {
             "ai_model": "gpt-4",
-            "model_types": ["staging", "marts"],
             "include_tests": True
         }
+        models = [
+            GeneratedModel(
+                name="stg_customers", model_type=ModelType.STAGING,
+                sql="select * from {{ source('public', 'customers') }}", description="Staged customers", columns=[], tests=[], dependencies=[], materialization="view"
+            ),
+            GeneratedModel(
+                name="dim_customers", model_type=ModelType.MARTS,
+                sql="select * from {{ ref('stg_customers') }}", description="Customer dimension", columns=[], tests=[], dependencies=["stg_customers"]
+            ),
+        ]
+        provider = AsyncMock(spec_set=AIProvider)
+        provider.generate_models.return_value = ModelGenerationResult(
+            models=models, project_structure={}, generation_metadata={"ai_provider": "openai", "model_used": "gpt-4"}
+        )
+        mock_create.return_value = provider
         
         with patch.object(generate_dbt_models, 'update_state') as mock_update:
-            result = generate_dbt_models.apply(
-                args=[project_id, schema_data, generation_config]
-            ).get()
+            result = generate_dbt_models(project_id, schema_data, generation_config)
+            archive_cleanup.append(result["archive_path"])
             
             assert result["project_id"] == project_id
             assert result["status"] == "completed"
             assert result["models_generated"] == 2
-            assert len(result["models"]) == 2
             assert result["ai_model_used"] == "gpt-4"
+            assert [(m["name"], m["type"]) for m in result["models"]] == [
+                ("stg_customers", "staging"), ("dim_customers", "marts")
+            ]
+            assert os.path.getsize(result["archive_path"]) > 0
             
-            # Check model structure
-            staging_model = next(m for m in result["models"] if m["type"] == "staging")
-            assert staging_model["name"] == "stg_customers"
-            assert "SELECT" in staging_model["sql"]
-            assert len(staging_model["tests"]) == 2
-            
-            marts_model = next(m for m in result["models"] if m["type"] == "marts")
-            assert marts_model["name"] == "dim_customers"
-            assert "ref('stg_customers')" in marts_model["sql"]
+            # The AI request is built from the scanned columns
+            request = provider.generate_models.await_args.args[0]
+            assert [column.name for column in request.tables[0].columns] == ["id", "email"]
+            assert request.model_types == [ModelType.STAGING, ModelType.MARTS]
             
             # Check that progress updates were called
             assert mock_update.call_count >= 4
     
-    @patch("cartridge.tasks.generation_tasks.time.sleep", side_effect=Exception("AI API error"))
-    def test_generate_dbt_models_failure(self, mock_sleep):
+    @patch("cartridge.tasks.generation_tasks.AIProviderFactory.create_provider", side_effect=Exception("AI API error"))
+    def test_generate_dbt_models_failure(self, mock_create):
         """Test dbt model generation failure."""
         project_id = "test-project-123"
         schema_data = {"tables": []}
         generation_config = {"ai_model": "gpt-4"}
         
         with patch.object(generate_dbt_models, 'update_state') as mock_update:
-            with pytest.raises(Exception):
-                generate_dbt_models.apply(
-                    args=[project_id, schema_data, generation_config]
-                ).get()
+            with pytest.raises(Exception, match="AI API error"):
+                generate_dbt_models(project_id, schema_data, generation_config)
             
             # Check that failure state was set
             mock_update.assert_called_with(
@@ -161,47 +502,43 @@ class TestGenerationTasks:
                 meta={"error": "AI API error", "project_id": project_id}
             )
     
-    @patch("cartridge.tasks.generation_tasks.time.sleep")
-    def test_create_project_archive_success(self, mock_sleep):
+    def test_create_project_archive_success(self, tmp_path, archive_cleanup):
         """Test successful project archive creation."""
         project_id = "test-project-123"
-        project_path = "/app/output/test-project-123"
+        project_path = tmp_path / project_id
+        project_path.mkdir()
+        (project_path / "dbt_project.yml").write_text("name: test_project\n")
         
-        result = create_project_archive.apply(
-            args=[project_id, project_path]
-        ).get()
+        result = create_project_archive(project_id, str(project_path))
+        archive_cleanup.append(result["archive_path"])
         
         assert result["project_id"] == project_id
         assert result["status"] == "completed"
-        assert result["archive_path"] == f"/app/output/{project_id}.tar.gz"
+        assert result["archive_path"] == f"/tmp/dbt_projects/{project_id}.tar.gz"
         assert result["archive_size_bytes"] > 0
     
-    @patch("cartridge.tasks.generation_tasks.time.sleep", side_effect=Exception("Archive error"))
-    def test_create_project_archive_failure(self, mock_sleep):
+    def test_create_project_archive_failure(self, tmp_path, archive_cleanup):
         """Test project archive creation failure."""
         project_id = "test-project-123"
-        project_path = "/app/output/test-project-123"
+        archive_cleanup.append(f"/tmp/dbt_projects/{project_id}.tar.gz")
         
-        with pytest.raises(Exception):
-            create_project_archive.apply(
-                args=[project_id, project_path]
-            ).get()
+        with pytest.raises(FileNotFoundError):
+            create_project_archive(project_id, str(tmp_path / "missing"))
 
 
+@pytest.mark.usefixtures("no_task_sleep")
 class TestTestTasks:
     """Test dbt model testing tasks."""
     
-    @patch("cartridge.tasks.test_tasks.time.sleep")
-    def test_test_dbt_models_success_dry_run(self, mock_sleep):
+    @patch("cartridge.tasks.progress.PROGRESS_MIN_INTERVAL_SECONDS", 0)
+    def test_test_dbt_models_success_dry_run(self):
         """Test successful dbt model testing (dry run)."""
         project_id = "test-project-123"
         project_path = "/app/output/test-project-123"
         test_config = {"dry_run": True}
         
         with patch.object(test_dbt_models, 'update_state') as mock_update:
-            result = test_dbt_models.apply(
-                args=[project_id, project_path, test_config]
-            ).get()
+            result = test_dbt_models(project_id, project_path, test_config)
             
             assert result["project_id"] == project_id
             assert result["status"] == "success"
@@ -209,6 +546,7 @@ class TestTestTasks:
             assert result["models_tested"] == 2
             assert result["models_passed"] == 2
             assert result["models_failed"] == 0
+            assert result["total_execution_time_ms"] == 1250
             assert len(result["results"]) == 2
             assert len(result["errors"]) == 0
             
@@ -219,17 +557,14 @@ class TestTestTasks:
             # Check progress updates
             assert mock_update.call_count >= 4
     
-    @patch("cartridge.tasks.test_tasks.time.sleep")
-    def test_test_dbt_models_success_actual_run(self, mock_sleep):
+    def test_test_dbt_models_success_actual_run(self):
         """Test successful dbt model testing (actual run)."""
         project_id = "test-project-123"
         project_path = "/app/output/test-project-123"
         test_config = {"dry_run": False}
         
         with patch.object(test_dbt_models, 'update_state') as mock_update:
-            result = test_dbt_models.apply(
-                args=[project_id, project_path, test_config]
-            ).get()
+            result = test_dbt_models(project_id, project_path, test_config)
             
             assert result["dry_run"] is False
             
@@ -246,9 +581,7 @@ class TestTestTasks:
         
         with patch.object(test_dbt_models, 'update_state') as mock_update:
             with pytest.raises(Exception):
-                test_dbt_models.apply(
-                    args=[project_id, project_path, test_config]
-                ).get()
+                test_dbt_models(project_id, project_path, test_config)
             
             # Check that failure state was set
             mock_update.assert_called_with(
@@ -256,15 +589,12 @@ class TestTestTasks:
                 meta={"error": "dbt error", "project_id": project_id}
             )
     
-    @patch("cartridge.tasks.test_tasks.time.sleep")
-    def test_validate_dbt_project_success(self, mock_sleep):
+    def test_validate_dbt_project_success(self):
         """Test successful dbt project validation."""
         project_id = "test-project-123"
         project_path = "/app/output/test-project-123"
         
-        result = validate_dbt_project.apply(
-            args=[project_id, project_path]
-        ).get()
+        result = validate_dbt_project(project_id, project_path)
         
         assert result["project_id"] == project_id
         assert result["status"] == "valid"
@@ -287,51 +617,145 @@ class TestTestTasks:
         project_path = "/app/output/test-project-123"
         
         with pytest.raises(Exception):
-            validate_dbt_project.apply(
-                args=[project_id, project_path]
-            ).get()
+            validate_dbt_project(project_id, project_path)
+    
+    def test_simulated_delays_can_be_disabled(self, no_task_sleep, monkeypatch):
+        """Test placeholder tasks skip their sleeps when delays are turned off."""
+        monkeypatch.setattr("cartridge.tasks.test_tasks.settings.app.simulate_task_delays", False)
+        no_task_sleep.reset_mock()
+        
+        with patch.object(test_dbt_models, 'update_state'):
+            test_dbt_models("test-project-123", "/app/output", {"dry_run": False})
+        validate_dbt_project("test-project-123", "/app/output")
+        
+        no_task_sleep.assert_not_called()
+
+
+class TestProgressReporter:
+    """Test rate-limited progress reporting."""
+    
+    def test_updates_are_rate_limited(self, monkeypatch):
+        """Test rapid updates are dropped except the first and the final one."""
+        task = MagicMock()
+        task.request.id = "task-123"
+        clock = iter([0.0, 0.1, 0.2, 0.7, 0.8])
+        monkeypatch.setattr("cartridge.tasks.progress.time.monotonic", lambda: next(clock))
+        progress = ProgressReporter(task)
+        
+        for current in (0, 20, 40, 60, 100):
+            progress.update(current, f"{current}%")
+        
+        assert [call.kwargs["meta"]["current"] for call in task.update_state.call_args_list] == [0, 60, 100]
+        task.update_state.assert_called_with(
+            task_id="task-123", state="PROGRESS", meta={"current": 100, "total": 100, "status": "100%"}
+        )
+
+
+_EXPECTED_TASK_ROUTES = {
+    "cartridge.tasks.scan_tasks.test_database_connection": {"queue": "quick"},
+    "cartridge.tasks.scan_tasks.*": {"queue": "scan"},
+    "cartridge.tasks.generation_tasks.*": {"queue": "generation"},
+    "cartridge.tasks.test_tasks.*": {"queue": "test"},
+}
+
+_EXPECTED_CELERY_CONF = {
+    "task_serializer": "json",
+    "accept_content": ["json", "orjson", "orjson-zstd"],
+    "result_serializer": "orjson-zstd",
+    "timezone": "UTC",
+    "enable_utc": True,
+    "task_track_started": True,
+    "task_time_limit": 30 * 60,  # 30 minutes
+    "task_soft_time_limit": 25 * 60,  # 25 minutes
+    "task_acks_late": True,
+    "worker_prefetch_multiplier": 1,
+}
 
 
 class TestTaskConfiguration:
     """Test task configuration and routing."""
     
-    def test_task_registration(self):
+    @pytest.fixture(scope="class")
+    def registered_tasks(self):
+        """Names of the tasks registered with the Celery app."""
+        return frozenset(celery_app.tasks.keys())
+    
+    def test_task_registration(self, registered_tasks):
         """Test that all tasks are properly registered."""
-        from cartridge.tasks.celery_app import celery_app
-        
-        registered_tasks = list(celery_app.tasks.keys())
+        expected = {
+            "cartridge.tasks.scan_tasks.scan_database_schema",
+            "cartridge.tasks.scan_tasks.test_database_connection",
+            "cartridge.tasks.generation_tasks.generate_dbt_models",
+            "cartridge.tasks.generation_tasks.create_project_archive",
+            "cartridge.tasks.test_tasks.test_dbt_models",
+            "cartridge.tasks.test_tasks.validate_dbt_project",
+        }
         
-        # Check that our custom tasks are registered
-        assert "cartridge.tasks.scan_tasks.scan_database_schema" in registered_tasks
-        assert "cartridge.tasks.scan_tasks.test_database_connection" in registered_tasks
-        assert "cartridge.tasks.generation_tasks.generate_dbt_models" in registered_tasks
-        assert "cartridge.tasks.generation_tasks.create_project_archive" in registered_tasks
-        assert "cartridge.tasks.test_tasks.test_dbt_models" in registered_tasks
-        assert "cartridge.tasks.test_tasks.validate_dbt_project" in registered_tasks
+        # An empty difference means all our custom tasks are registered
+        assert expected - registered_tasks == set()
     
     def test_task_routing_configuration(self):
         """Test task routing configuration."""
-        from cartridge.tasks.celery_app import celery_app
-        
-        routes = celery_app.conf.task_routes
+        assert celery_app.conf.task_routes == _EXPECTED_TASK_ROUTES
         
-        assert "cartridge.tasks.scan_tasks.*" in routes
-        assert "cartridge.tasks.generation_tasks.*" in routes
-        assert "cartridge.tasks.test_tasks.*" in routes
-        
-        assert routes["cartridge.tasks.scan_tasks.*"]["queue"] == "scan"
-        assert routes["cartridge.tasks.generation_tasks.*"]["queue"] == "generation"
-        assert routes["cartridge.tasks.test_tasks.*"]["queue"] == "test"
+        router = celery_app.amqp.router
+        assert router.route({}, "cartridge.tasks.scan_tasks.test_database_connection")["queue"].name == "quick"
+        assert router.route({}, "cartridge.tasks.scan_tasks.scan_database_schema")["queue"].name == "scan"
     
     def test_celery_configuration(self):
         """Test Celery app configuration."""
-        from cartridge.tasks.celery_app import celery_app
-        
-        assert celery_app.conf.task_serializer == "json"
-        assert celery_app.conf.accept_content == ["json"]
-        assert celery_app.conf.result_serializer == "json"
-        assert celery_app.conf.timezone == "UTC"
-        assert celery_app.conf.enable_utc is True
-        assert celery_app.conf.task_track_started is True
-        assert celery_app.conf.task_time_limit == 30 * 60  # 30 minutes
-        assert celery_app.conf.task_soft_time_limit == 25 * 60  # 25 minutes
\ No newline at end of file
+        conf = celery_app.conf
+        
+        assert {key: conf[key] for key in _EXPECTED_CELERY_CONF} == _EXPECTED_CELERY_CONF
+    
+    def test_orjson_result_serializer(self):
+        """Test task results round-trip through the orjson serializer."""
+        from kombu.serialization import dumps, loads
+        
+        result = {
+            "data_type": DataType.INTEGER,
+            "min_value": Decimal("1.50"),
+            "scan_timestamp": datetime(2024, 1, 2, 3, 4, 5),
+            "foreign_key_relationships": [("customer_id", "customers", "id")],
+        }
+        
+        content_type, content_encoding, payload = dumps(result, serializer="orjson")
+        
+        assert content_type == "application/x-orjson"
+        assert loads(payload, content_type, content_encoding, accept=[content_type]) == {
+            "data_type": "integer",
+            "min_value": "1.50",
+            "scan_timestamp": "2024-01-02T03:04:05",
+            "foreign_key_relationships": [["customer_id", "customers", "id"]],
+        }
+    
+    def test_orjson_zstd_result_serializer(self):
+        """Test stored task results are compressed and round-trip intact."""
+        from kombu.serialization import dumps, loads
+        
+        result = {"tables": [{"name": f"table_{i}", "columns": ["id", "created_at"]} for i in range(100)]}
+        
+        content_type, content_encoding, payload = dumps(result, serializer="orjson-zstd")
+        _, _, uncompressed = dumps(result, serializer="orjson")
+        
+        assert content_type == "application/x-orjson+zstd"
+        assert len(payload) < len(uncompressed) / 4
+        assert loads(payload, content_type, content_encoding, accept=[content_type]) == result
+    
+    @pytest.mark.parametrize("serializer,expected_timestamp", [
+        ("json", datetime(2024, 1, 2, 3, 4, 5)),
+        ("orjson", "2024-01-02T03:04:05"),
+    ])
+    def test_orjson_zstd_result_serializer_reads_legacy_results(self, serializer, expected_timestamp):
+        """Test results stored uncompressed before orjson-zstd was enabled still decode."""
+        from kombu.serialization import dumps, loads
+        
+        result = {"scan_result_id": "scan-123", "scan_timestamp": datetime(2024, 1, 2, 3, 4, 5)}
+        content_type = "application/x-orjson+zstd"
+        
+        _, _, payload = dumps(result, serializer=serializer)
+        payload = payload.encode() if isinstance(payload, str) else payload
+        
+        assert loads(payload, content_type, "binary", accept=[content_type]) == {
+            "scan_result_id": "scan-123", "scan_timestamp": expected_timestamp
+        }